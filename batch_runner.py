@@ -0,0 +1,174 @@
+"""Run a batch of independent questions through the agent client concurrently.
+
+    python batch_runner.py questions.jsonl [--concurrency 8] [--connections 2]
+        [--timeout 300] [--output results.jsonl] [--server mcp_server.py | http://host:8000/mcp]
+
+Each input line is a JSON object holding the question under "query", "question",
+"prompt" or "body", and optionally an "id" or "request_id". Every question runs as
+its own conversation; at most --concurrency run at once, spread over --connections
+MCP sessions. --server is a running server's URL (MCP_SERVER_URL when set) or a
+script started over stdio once per session; several such servers share one
+response cache and FRED quota (SHARED_STATE_ENABLED). One JSON result per
+question (answer or error, latency, iterations, tokens, tool calls) is written
+to --output as it finishes, and a summary with overall throughput is printed at
+the end.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+
+from config import Config
+from mcp_client import AgenticMCPClient
+from prompts import enhance_temporal_query
+
+QUESTION_KEYS = ("query", "question", "prompt", "body")
+ID_KEYS = ("id", "request_id")
+
+
+def load_questions(path: Path) -> list[dict]:
+    """Read (id, question) pairs from a JSONL file, skipping blank lines and lines without a question."""
+    questions = []
+    for line_number, line in enumerate(path.read_text().splitlines(), 1):
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        question = next((record[key] for key in QUESTION_KEYS if record.get(key)), None)
+        if question is None:
+            print(f"Skipping line {line_number}: no question field")
+            continue
+        question_id = next((record[key] for key in ID_KEYS if record.get(key)), str(line_number))
+        questions.append({"id": question_id, "question": question})
+    return questions
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+class BatchRunner:
+    """Runs questions over a pool of MCP sessions with bounded concurrency."""
+
+    def __init__(self, connections: list[AgenticMCPClient], concurrency: int, timeout: float | None):
+        self.connections = connections
+        self.active = [0] * len(connections)
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.timeout = timeout
+
+    async def run_one(self, item: dict) -> dict:
+        async with self.semaphore:
+            # Least busy session first
+            index = min(range(len(self.connections)), key=lambda i: self.active[i])
+            self.active[index] += 1
+            conversation = self.connections[index].new_conversation()
+            result = {"id": item["id"], "question": item["question"], "connection": index}
+            started = time.perf_counter()
+            try:
+                history = [{"role": "user", "content": enhance_temporal_query(item["question"])}]
+                result["answer"] = await asyncio.wait_for(conversation.run_agentic_loop(history), self.timeout)
+            except asyncio.TimeoutError:
+                result["error"] = f"timed out after {self.timeout}s"
+            except Exception as e:
+                result["error"] = f"{type(e).__name__}: {e}"
+            finally:
+                self.active[index] -= 1
+
+        stats = conversation.iteration_stats
+        result.update({
+            "latency_seconds": round(time.perf_counter() - started, 3),
+            "iterations": len(stats),
+            "llm_seconds": round(sum(s.get("llm_seconds", 0) for s in stats), 3),
+            "prompt_tokens": sum(s.get("prompt_tokens", 0) for s in stats),
+            "completion_tokens": sum(s.get("completion_tokens", 0) for s in stats),
+            "tool_calls": sum(s.get("tool_calls", 0) for s in stats),
+            "tokens_estimated": any(s.get("estimated") for s in stats),
+            "memo": conversation.tool_memo.stats(),
+        })
+        return result
+
+    async def run(self, questions: list[dict], output: Path | None) -> list[dict]:
+        results = []
+        out = open(output, "w") if output else None
+        try:
+            for finished in asyncio.as_completed([self.run_one(item) for item in questions]):
+                result = await finished
+                results.append(result)
+                if out:
+                    out.write(json.dumps(result) + "\n")
+                    out.flush()
+                status = "error: " + result["error"] if "error" in result else "ok"
+                print(f"[{len(results)}/{len(questions)}] {result['id']}: {result['latency_seconds']:.1f}s, "
+                      f"{result['iterations']} iterations, "
+                      f"{result['prompt_tokens'] + result['completion_tokens']} tokens, {status}")
+        finally:
+            if out:
+                out.close()
+        return results
+
+
+def summarize(results: list[dict], elapsed: float) -> dict:
+    latencies = [r["latency_seconds"] for r in results]
+    completed = [r for r in results if "error" not in r]
+    prompt_tokens = sum(r["prompt_tokens"] for r in results)
+    completion_tokens = sum(r["completion_tokens"] for r in results)
+    return {
+        "queries": len(results),
+        "errors": len(results) - len(completed),
+        "wall_seconds": round(elapsed, 2),
+        "queries_per_minute": round(len(results) / elapsed * 60, 2) if elapsed else 0.0,
+        "latency_p50_seconds": round(percentile(latencies, 0.50), 2),
+        "latency_p95_seconds": round(percentile(latencies, 0.95), 2),
+        "mean_iterations": round(sum(r["iterations"] for r in results) / len(results), 2) if results else 0.0,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "tokens_per_second": round((prompt_tokens + completion_tokens) / elapsed, 1) if elapsed else 0.0,
+        "tool_calls": sum(r["tool_calls"] for r in results),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("questions", type=Path, help="JSONL file of questions")
+    parser.add_argument("--concurrency", type=int, default=8, help="conversations in flight at once")
+    parser.add_argument("--connections", type=int, default=1, help="MCP server sessions to spread them over")
+    parser.add_argument("--timeout", type=float, default=300.0, help="seconds allowed per question (0 for none)")
+    parser.add_argument("--output", type=Path, help="write one JSON result per question here")
+    parser.add_argument("--server", default=Config.MCP_SERVER_URL or "mcp_server.py",
+                        help="URL of a running MCP server, or a server script to start over stdio")
+    args = parser.parse_args()
+
+    questions = load_questions(args.questions)
+    if args.connections > 1 and not args.server.startswith(("http://", "https://")):
+        # One stdio server per session; without shared state each would spend the full FRED quota
+        os.environ["SHARED_STATE_ENABLED"] = "true"
+    connections = []
+    try:
+        for _ in range(max(args.connections, 1)):
+            client = AgenticMCPClient(verbose=False)
+            connections.append(client)
+            await client.connect(args.server)
+            await client.list_available_tools()
+        print(f"Running {len(questions)} questions, {args.concurrency} at a time over "
+              f"{len(connections)} MCP session(s)")
+
+        runner = BatchRunner(connections, max(args.concurrency, 1), args.timeout or None)
+        started = time.perf_counter()
+        results = await runner.run(questions, args.output)
+        summary = summarize(results, time.perf_counter() - started)
+    finally:
+        # Stdio sessions hold nested cancel scopes, which must be exited in reverse order
+        for client in reversed(connections):
+            await client.close()
+
+    print("\n=== SUMMARY ===")
+    for key, value in summary.items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,107 @@
+"""Compare peak memory and time of decoding a large series/observations payload.
+
+    python -m benchmarks.bench_observation_decode [--observations 100000] [--repeat 3]
+
+"full-json" is the original path: response.json() builds the whole dict tree and
+the valid observations are filtered out of it afterwards. "json+columns" does the
+same and then builds a SeriesData, i.e. the same end result as "streaming", which
+feeds the body through ObservationStreamDecoder straight into a SeriesData.
+Timings are taken without tracemalloc; peak memory comes from a separate traced run.
+"""
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+import httpx
+
+from services.observation_stream import decode_observations
+from services.series_data import SeriesData
+
+CHUNK_SIZE = 64 * 1024
+
+
+def build_payload(count: int) -> bytes:
+    start = date(1962, 1, 2)
+    observations = [
+        {
+            "realtime_start": "2026-01-01",
+            "realtime_end": "2026-01-01",
+            "date": (start + timedelta(days=i)).isoformat(),
+            "value": "." if i % 7 == 5 else f"{4 + (i % 300) / 100:.2f}",
+        }
+        for i in range(count)
+    ]
+    return json.dumps({
+        "realtime_start": "2026-01-01", "realtime_end": "2026-01-01",
+        "observation_start": "1600-01-01", "observation_end": "9999-12-31",
+        "units": "lin", "output_type": 1, "file_type": "json",
+        "order_by": "observation_date", "sort_order": "asc",
+        "count": count, "offset": 0, "limit": 100000,
+        "observations": observations,
+    }).encode()
+
+
+def make_client(payload: bytes) -> httpx.AsyncClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        async def body():
+            for i in range(0, len(payload), CHUNK_SIZE):
+                yield payload[i:i + CHUNK_SIZE]
+        return httpx.Response(200, content=body())
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+async def full_json(client: httpx.AsyncClient) -> int:
+    response = await client.get("https://fred.test/series/observations")
+    data = response.json()
+    valid_obs = [obs for obs in data["observations"] if obs["value"] != "."]
+    return len(valid_obs)
+
+
+async def json_columns(client: httpx.AsyncClient) -> int:
+    response = await client.get("https://fred.test/series/observations")
+    data = response.json()
+    series = SeriesData.from_observations("BENCH", ((obs["date"], obs["value"]) for obs in data["observations"]))
+    return len(series.dropna())
+
+
+async def streaming(client: httpx.AsyncClient) -> int:
+    async with client.stream("GET", "https://fred.test/series/observations") as response:
+        series = SeriesData("BENCH")
+        await decode_observations(response, series.append)
+    return len(series.dropna())
+
+
+async def measure(name: str, decode, payload: bytes, repeat: int) -> None:
+    timings = []
+    for _ in range(repeat):
+        async with make_client(payload) as client:
+            started = time.perf_counter()
+            count = await decode(client)
+            timings.append(time.perf_counter() - started)
+
+    async with make_client(payload) as client:
+        tracemalloc.start()
+        await decode(client)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    print(f"{name:<13} valid={count:<8} best={min(timings) * 1000:8.1f} ms  peak={peak / 2**20:7.1f} MiB")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--observations", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    payload = build_payload(args.observations)
+    print(f"payload: {args.observations} observations, {len(payload) / 2**20:.1f} MiB")
+    await measure("full-json", full_json, payload, args.repeat)
+    await measure("json+columns", json_columns, payload, args.repeat)
+    await measure("streaming", streaming, payload, args.repeat)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,128 @@
+"""Client startup time: spawning mcp_server.py over stdio vs attaching to a running server.
+
+    python -m benchmarks.bench_startup [--modes stdio,streamable-http,sse] [--runs 5]
+        [--latency-ms 20] [--output results.json]
+
+Each run starts a fresh client process that imports mcp_client, connects (for
+stdio, by starting the server), lists the tools, makes a first
+get_series_observations call and creates the LLM client, as an interactive
+session does before its first query. "ready" is the time from launching the
+client process to the end of that first call; the other columns are the steps
+inside it. For the HTTP modes one server is started up front, as a long-running
+deployment would be, and every run attaches to it. All servers use a mock FRED
+API (benchmarks.mock_fred), and one untimed run per mode warms the file caches.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from pathlib import Path
+
+from benchmarks.bench_transports import ROOT, free_port, server_env, wait_for_port
+
+MODES = ("stdio", "streamable-http", "sse")
+URL_PATHS = {"streamable-http": "/mcp", "sse": "/sse"}
+STEPS = ("ready", "imports", "connect", "list_tools", "first_call")
+
+
+async def probe(target: str, launched: float) -> dict:
+    """Time one client startup against `target` (a server URL or script); runs in the client process."""
+    started = time.perf_counter()
+    from mcp_client import AgenticMCPClient
+
+    timings = {"imports": time.perf_counter() - started}
+    client = AgenticMCPClient(verbose=False)
+    try:
+        step = time.perf_counter()
+        await client.connect(target)
+        timings["connect"] = time.perf_counter() - step
+        step = time.perf_counter()
+        await client.list_available_tools()
+        timings["list_tools"] = time.perf_counter() - step
+        step = time.perf_counter()
+        await client.execute_tool_call("get_series_observations", {"series_id": "UNRATE", "limit": 12})
+        timings["first_call"] = time.perf_counter() - step
+        timings["ready"] = time.time() - launched
+    finally:
+        await client.close()
+    return timings
+
+
+def run_probe(target: str, env: dict[str, str]) -> dict:
+    command = [sys.executable, "-m", "benchmarks.bench_startup", "--probe", target, "--launched", repr(time.time())]
+    output = subprocess.run(command, env=env, cwd=str(ROOT), capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def client_env(env: dict[str, str]) -> dict[str, str]:
+    """Placeholder OpenAI settings (the client is built but never called), and this interpreter
+    first on PATH for the `python mcp_server.py` the client spawns."""
+    return {**env, "OPENAI_API_KEY": "benchmark", "OPENAI_API_BASE": "http://127.0.0.1:9",
+            "API_VERSION": "2024-06-01", "MCP_SERVER_URL": "",
+            "PATH": os.pathsep.join([os.path.dirname(sys.executable), env.get("PATH", "")])}
+
+
+def run_mode(mode: str, runs: int, mock_port: int, cache_dir: str) -> dict:
+    env = server_env(mode, mock_port, cache_dir)
+    with ExitStack() as stack:
+        if mode == "stdio":
+            target = "mcp_server.py"
+        else:
+            server = subprocess.Popen([sys.executable, str(ROOT / "mcp_server.py")], env=env, cwd=str(ROOT),
+                                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            stack.callback(server.wait, 10)
+            stack.callback(server.terminate)
+            asyncio.run(wait_for_port(int(env["MCP_PORT"]), server))
+            target = f"http://127.0.0.1:{env['MCP_PORT']}{URL_PATHS[mode]}"
+        env = client_env(env)
+        run_probe(target, env)
+        samples = [run_probe(target, env) for _ in range(runs)]
+    return {"mode": mode, "runs": runs,
+            **{f"{step}_ms": round(statistics.median(s[step] for s in samples) * 1000, 1) for step in STEPS}}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--runs", type=int, default=5, help="timed client starts per mode")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="mock FRED response latency")
+    parser.add_argument("--output", type=Path, help="also write the results as JSON")
+    parser.add_argument("--probe", help=argparse.SUPPRESS)
+    parser.add_argument("--launched", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.probe:
+        print(json.dumps(asyncio.run(probe(args.probe, args.launched))))
+        return
+
+    mock_port = free_port()
+    mock = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.mock_fred", "--port", str(mock_port), "--latency-ms", str(args.latency_ms)],
+        cwd=str(ROOT)
+    )
+    results = []
+    try:
+        asyncio.run(wait_for_port(mock_port, mock))
+        print(f"{'mode':<17}{'ready ms':>10}{'imports':>9}{'connect':>9}{'tools':>8}{'1st call':>10}")
+        for mode in args.modes.split(","):
+            with tempfile.TemporaryDirectory(prefix="fred-bench-") as cache_dir:
+                result = run_mode(mode, args.runs, mock_port, cache_dir)
+            results.append(result)
+            print(f"{mode:<17}{result['ready_ms']:>10.0f}{result['imports_ms']:>9.0f}{result['connect_ms']:>9.0f}"
+                  f"{result['list_tools_ms']:>8.0f}{result['first_call_ms']:>10.0f}")
+    finally:
+        mock.terminate()
+        mock.wait()
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Measure LLM tokens per observation for each way of encoding a tool result.
+
+    python -m benchmarks.bench_token_encoding [--observations 120] [--model gpt-4o]
+
+"lines" is the previous text output ("Date: ..., Value: ..." per observation),
+"json" is the structured table serialized as-is, "csv" is the header-once text
+fallback the server sends, and "compact" is what the client now passes to the
+LLM: a start date, detected frequency and one values array. Tokens are counted
+with tiktoken when installed, otherwise estimated from length.
+"""
+import argparse
+import json
+from array import array
+from datetime import date
+
+from context_window import _get_encoding, count_tokens
+from message_utils import format_structured_result
+from services.series_data import SeriesData, build_table, format_value, table_to_csv
+
+
+def build_series(count: int) -> SeriesData:
+    """A monthly series starting in 2000 with realistic one-decimal values."""
+    ordinals = array("l")
+    values = array("d")
+    for i in range(count):
+        ordinals.append(date(2000 + i // 12, i % 12 + 1, 1).toordinal())
+        values.append(round(4 + (i * 37 % 60) / 10, 1))
+    return SeriesData("UNRATE", ordinals, values)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--observations", type=int, default=120)
+    parser.add_argument("--model", default="gpt-4o")
+    args = parser.parse_args()
+
+    data = build_series(args.observations)
+    table = build_table([data])
+    # Second column with gaps, which forces the CSV layout
+    other = SeriesData("CPIAUCSL", data.ordinals[::2], array("d", (v * 50 for v in data.values[::2])))
+    wide = build_table([data, other])
+
+    encodings = {
+        "lines": "\n".join(f"Date: {d}, Value: {format_value(v)}" for d, v in data.rows()),
+        "json": json.dumps(table),
+        "csv": table_to_csv(table),
+        "compact": format_structured_result(table, max_length=10 ** 9),
+        "csv (2 series)": table_to_csv(wide),
+        "compact (2 series)": format_structured_result(wide, max_length=10 ** 9),
+    }
+
+    counter = "tiktoken" if _get_encoding(args.model) is not None else "a chars/4 estimate"
+    print(f"{args.observations} monthly observations, tokens counted with {counter}")
+    print(f"{'encoding':<20}{'chars':>8}{'tokens':>8}{'tokens/obs':>12}")
+    for name, text in encodings.items():
+        tokens = count_tokens(text, args.model)
+        print(f"{name:<20}{len(text):>8}{tokens:>8}{tokens / args.observations:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
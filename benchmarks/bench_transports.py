@@ -0,0 +1,319 @@
+"""Throughput, latency and memory of the FRED tools against a local mock FRED API.
+
+    python -m benchmarks.bench_transports [--transports service,stdio,sse,streamable-http]
+        [--workloads single,batch,concurrent] [--calls 200] [--sessions 8]
+        [--latency-ms 20] [--error-rate 0.0] [--output results.json]
+
+A mock FRED server (benchmarks.mock_fred) is started on a free port and every
+server under test is pointed at it with FRED_API_BASE, with the rate limiter
+opened up and a fresh cache directory, so runs are repeatable and never touch
+the real API. "service" calls FREDService directly in a separate process; the
+other transports run mcp_server.py and call its tools through an MCP client.
+
+Workloads:
+    single      one session, sequential get_series_observations calls
+    batch       one session, sequential get_multiple_series_observations calls
+    concurrent  --sessions sessions, each making sequential get_series_observations calls
+
+Calls cycle over --series distinct series IDs, so the first pass misses the
+cache and store and later passes hit them, as in normal use. Memory is the peak
+RSS of the server process(es), read from /proc (Linux only).
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import AsyncExitStack, asynccontextmanager
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+TRANSPORTS = ("service", "stdio", "sse", "streamable-http")
+WORKLOADS = ("single", "batch", "concurrent")
+
+Call = Callable[[str, dict], Awaitable[bool]]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_for_port(port: int, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"process exited with {process.returncode} before listening on {port}")
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.1)
+    raise TimeoutError(f"nothing listening on port {port} after {timeout}s")
+
+
+def peak_rss_mib(pid: int | str = "self") -> float | None:
+    """Peak resident set size of a process, or None where /proc is unavailable."""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        return None
+    return None
+
+
+def server_pids() -> list[int]:
+    """PIDs of mcp_server.py processes started by this process."""
+    pids = []
+    for entry in Path("/proc").glob("[0-9]*"):
+        try:
+            ppid = int((entry / "stat").read_text().rsplit(")", 1)[1].split()[1])
+            cmdline = (entry / "cmdline").read_bytes()
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == os.getpid() and b"mcp_server.py" in cmdline:
+            pids.append(int(entry.name))
+    return pids
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return float("nan")
+    rank = max(int(round(fraction * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def workload_calls(workload: str, calls: int, series: int, batch_size: int, start: int = 0) -> list[tuple[str, dict]]:
+    """Tool calls cycling over `series` distinct IDs, beginning at the `start`th."""
+    series_ids = [f"BENCH{i}" for i in range(series)]
+    if workload == "batch":
+        return [
+            ("get_multiple_series_observations", {
+                "series_ids": [series_ids[(start + i * batch_size + j) % series] for j in range(batch_size)],
+                "limit": 100,
+            })
+            for i in range(calls)
+        ]
+    return [
+        ("get_series_observations", {"series_id": series_ids[(start + i) % series], "limit": 100})
+        for i in range(calls)
+    ]
+
+
+async def run_workload(calls_per_session: list[list[tuple[str, dict]]], callers: list[Call],
+                       keep_latencies: bool = False) -> dict:
+    """Run each session's calls sequentially, all sessions concurrently, and time every call."""
+    latencies: list[float] = []
+    errors = 0
+
+    async def session(call: Call, calls: list[tuple[str, dict]]) -> None:
+        nonlocal errors
+        for name, arguments in calls:
+            started = time.perf_counter()
+            try:
+                ok = await call(name, arguments)
+            except Exception:
+                ok = False
+            latencies.append(time.perf_counter() - started)
+            errors += not ok
+
+    started = time.perf_counter()
+    await asyncio.gather(*(session(call, calls) for call, calls in zip(callers, calls_per_session)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    result = {
+        "calls": len(latencies),
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "throughput": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+    }
+    if keep_latencies:
+        result["latencies"] = latencies
+    return result
+
+
+def plan(args: argparse.Namespace, workload: str) -> list[list[tuple[str, dict]]]:
+    if workload == "concurrent":
+        per_session = max(args.calls // args.sessions, 1)
+        return [
+            workload_calls(workload, per_session, args.series, args.batch_size, start=i * per_session)
+            for i in range(args.sessions)
+        ]
+    calls = args.calls if workload == "single" else max(args.calls // args.batch_size, 1)
+    return [workload_calls(workload, calls, args.series, args.batch_size)]
+
+
+@asynccontextmanager
+async def mcp_sessions(transport: str, count: int, env: dict[str, str]) -> AsyncIterator[list[Call]]:
+    """Open `count` MCP client sessions to mcp_server.py over `transport`."""
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.sse import sse_client
+    from mcp.client.stdio import stdio_client
+    from mcp.client.streamable_http import streamablehttp_client
+
+    async with AsyncExitStack() as stack:
+        if transport == "stdio":
+            params = StdioServerParameters(command=sys.executable, args=[str(ROOT / "mcp_server.py")],
+                                           env=env, cwd=str(ROOT))
+            connect = lambda: stdio_client(params, errlog=subprocess.DEVNULL)  # noqa: E731 - one server per session
+        else:
+            server = subprocess.Popen([sys.executable, str(ROOT / "mcp_server.py")], env=env, cwd=str(ROOT),
+                                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            stack.callback(server.wait, 10)
+            stack.callback(server.terminate)
+            port = int(env["MCP_PORT"])
+            await wait_for_port(port, server)
+            if transport == "sse":
+                connect = lambda: sse_client(f"http://127.0.0.1:{port}/sse")  # noqa: E731
+            else:
+                connect = lambda: streamablehttp_client(f"http://127.0.0.1:{port}/mcp")  # noqa: E731
+
+        callers = []
+        for _ in range(count):
+            streams = await stack.enter_async_context(connect())
+            session = await stack.enter_async_context(ClientSession(streams[0], streams[1]))
+            await session.initialize()
+
+            async def call(name: str, arguments: dict, session=session) -> bool:
+                result = await session.call_tool(name, arguments)
+                return not result.isError
+
+            callers.append(call)
+        yield callers
+
+
+async def run_mcp_case(args: argparse.Namespace, transport: str, workload: str, env: dict[str, str]) -> dict:
+    sessions = plan(args, workload)
+    async with mcp_sessions(transport, len(sessions), env) as callers:
+        result = await run_workload(sessions, callers)
+        peaks = [peak_rss_mib(pid) for pid in server_pids()]
+    known = [peak for peak in peaks if peak is not None]
+    result["server_peak_rss_mib"] = round(sum(known), 1) if known else None
+    return result
+
+
+async def run_service_case(args: argparse.Namespace, workload: str) -> dict:
+    """Run a workload against FREDService in this process (started as a worker with the bench environment)."""
+    from services.fred_service import FREDService
+
+    sessions = plan(args, workload)
+    service = FREDService()
+    await FREDService.open_client()
+    try:
+        async def call(name: str, arguments: dict) -> bool:
+            table = await getattr(service, name)(**arguments)
+            return bool(table["dates"])
+
+        result = await run_workload(sessions, [call] * len(sessions))
+    finally:
+        await FREDService.close_client()
+    result["server_peak_rss_mib"] = peak_rss_mib()
+    return result
+
+
+def run_service_worker(args: argparse.Namespace, workload: str, env: dict[str, str]) -> dict:
+    command = [sys.executable, "-m", "benchmarks.bench_transports", "--service-worker", workload,
+               "--calls", str(args.calls), "--sessions", str(args.sessions),
+               "--series", str(args.series), "--batch-size", str(args.batch_size)]
+    output = subprocess.run(command, env=env, cwd=str(ROOT), capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def server_env(transport: str, mock_port: int, cache_dir: str, no_store: bool = False,
+               batch_size: int = 10) -> dict[str, str]:
+    """Environment for a server under test: mock FRED, fresh cache, no rate limiting in the way."""
+    return {
+        **os.environ,
+        "FRED_API_BASE": f"http://127.0.0.1:{mock_port}/fred",
+        "FRED_API_KEY": "benchmark",
+        "FRED_CACHE_DIR": cache_dir,
+        "OBSERVATION_STORE_ENABLED": "false" if no_store else "true",
+        "FRED_RATE_LIMIT_PER_MINUTE": "1000000",
+        "FRED_RATE_LIMIT_BURST": "1000",
+        "FRED_BACKOFF_BASE": "0.05",
+        "FRED_BACKOFF_MAX": "1",
+        "BATCH_MAX_SERIES": str(max(batch_size, 20)),
+        "MCP_TRANSPORT": transport,
+        "MCP_HOST": "127.0.0.1",
+        "MCP_PORT": str(free_port()),
+        "LOG_LEVEL": "WARNING",
+        "WARMUP_SERIES": "",
+        "SEARCH_INDEX_HARVEST": "false",
+        "CATEGORY_CRAWL_ENABLED": "false",
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transports", default=",".join(TRANSPORTS))
+    parser.add_argument("--workloads", default=",".join(WORKLOADS))
+    parser.add_argument("--calls", type=int, default=200, help="tool calls per workload")
+    parser.add_argument("--sessions", type=int, default=8, help="sessions for the concurrent workload")
+    parser.add_argument("--series", type=int, default=50, help="distinct series IDs to cycle over")
+    parser.add_argument("--batch-size", type=int, default=10, help="series per batch call")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="mock FRED response latency")
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of mock responses that fail")
+    parser.add_argument("--observations", type=int, default=600, help="history length of each mock series")
+    parser.add_argument("--no-store", action="store_true", help="disable the local observation store")
+    parser.add_argument("--output", type=Path, help="also write the results as JSON")
+    parser.add_argument("--service-worker", choices=WORKLOADS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.service_worker:
+        print(json.dumps(await run_service_case(args, args.service_worker)))
+        return
+
+    mock_port = free_port()
+    mock = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.mock_fred", "--port", str(mock_port),
+         "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+         "--error-rate", str(args.error_rate), "--observations", str(args.observations)],
+        cwd=str(ROOT)
+    )
+    results = []
+    try:
+        await wait_for_port(mock_port, mock)
+        print(f"mock FRED on port {mock_port}: latency {args.latency_ms}+{args.jitter_ms} ms, "
+              f"error rate {args.error_rate}")
+        print(f"{'transport':<16}{'workload':<12}{'calls':>6}{'errors':>7}{'calls/s':>9}"
+              f"{'p50 ms':>9}{'p99 ms':>9}{'peak MiB':>10}")
+        for transport in args.transports.split(","):
+            for workload in args.workloads.split(","):
+                with tempfile.TemporaryDirectory(prefix="fred-bench-") as cache_dir:
+                    env = server_env(transport, mock_port, cache_dir, args.no_store, args.batch_size)
+                    if transport == "service":
+                        result = run_service_worker(args, workload, env)
+                    else:
+                        result = await run_mcp_case(args, transport, workload, env)
+                result = {"transport": transport, "workload": workload, **result}
+                results.append(result)
+                peak = result["server_peak_rss_mib"]
+                print(f"{transport:<16}{workload:<12}{result['calls']:>6}{result['errors']:>7}"
+                      f"{result['throughput']:>9}{result['p50_ms']:>9}{result['p99_ms']:>9}"
+                      f"{peak if peak is not None else 'n/a':>10}")
+    finally:
+        mock.terminate()
+        mock.wait(10)
+
+    if args.output:
+        args.output.write_text(json.dumps({"settings": {
+            key: value for key, value in vars(args).items() if key not in ("output", "service_worker")
+        }, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
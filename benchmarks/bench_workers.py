@@ -0,0 +1,160 @@
+"""Load test of the multi-worker streamable-http server: throughput by worker count.
+
+    python -m benchmarks.bench_workers [--workers 1,2,4] [--clients 4] [--sessions 8]
+        [--calls 400] [--latency-ms 5] [--rate-limit 1000000]
+
+For each worker count, mcp_server.py is started with MCP_TRANSPORT=streamable-http
+and MCP_WORKERS=N against a local mock FRED API, then --clients client processes
+(so the load generator is not the bottleneck) each run --sessions concurrent MCP
+sessions making get_series_info and get_series_observations calls. Throughput and
+latency are reported with the number of requests that reached the mock FRED API,
+which shows whether the workers' shared cache and rate limiter keep upstream
+traffic at the level of a single process. Scaling needs as many free cores as
+workers plus clients.
+"""
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import AsyncExitStack
+from pathlib import Path
+
+import httpx
+
+from benchmarks.bench_transports import (
+    ROOT, free_port, percentile, run_workload, server_env, wait_for_port,
+)
+
+
+async def client_worker(url: str, sessions: int, calls: int, series: int, offset: int) -> None:
+    """Run `sessions` MCP sessions against `url` and print every call's latency as JSON."""
+    from mcp import ClientSession
+    from mcp.client.streamable_http import streamablehttp_client
+
+    async with AsyncExitStack() as stack:
+        callers = []
+        for _ in range(sessions):
+            read, write, _ = await stack.enter_async_context(streamablehttp_client(url))
+            session = await stack.enter_async_context(ClientSession(read, write))
+            await session.initialize()
+
+            async def call(name: str, arguments: dict, session=session) -> bool:
+                return not (await session.call_tool(name, arguments)).isError
+
+            callers.append(call)
+
+        per_session = max(calls // sessions, 1)
+        plan = [
+            [
+                ("get_series_info" if i % 2 else "get_series_observations",
+                 {"series_id": f"BENCH{(offset + s * per_session + i) % series}"} | ({} if i % 2 else {"limit": 100}))
+                for i in range(per_session)
+            ]
+            for s in range(sessions)
+        ]
+        result = await run_workload(plan, callers, keep_latencies=True)
+    print(json.dumps(result))
+
+
+async def mock_requests(mock_port: int) -> int:
+    async with httpx.AsyncClient() as client:
+        return (await client.get(f"http://127.0.0.1:{mock_port}/mock/stats")).json()["requests"]
+
+
+async def run_case(args: argparse.Namespace, workers: int, mock_port: int) -> dict:
+    with tempfile.TemporaryDirectory(prefix="fred-bench-") as cache_dir:
+        env = server_env("streamable-http", mock_port, cache_dir, args.no_store)
+        env["MCP_WORKERS"] = str(workers)
+        env["FRED_RATE_LIMIT_PER_MINUTE"] = str(args.rate_limit)
+        port = int(env["MCP_PORT"])
+        server = subprocess.Popen([sys.executable, str(ROOT / "mcp_server.py")], env=env, cwd=str(ROOT),
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            await wait_for_port(port, server)
+            upstream_before = await mock_requests(mock_port)
+            started = time.perf_counter()
+            clients = [
+                await asyncio.create_subprocess_exec(
+                    sys.executable, "-m", "benchmarks.bench_workers", "--client-worker",
+                    f"http://127.0.0.1:{port}/mcp", "--sessions", str(args.sessions),
+                    "--calls", str(args.calls // args.clients), "--series", str(args.series),
+                    "--offset", str(i * args.calls // args.clients),
+                    cwd=str(ROOT), stdout=asyncio.subprocess.PIPE
+                )
+                for i in range(args.clients)
+            ]
+            outputs = [await client.communicate() for client in clients]
+            elapsed = time.perf_counter() - started
+            upstream = await mock_requests(mock_port) - upstream_before
+        finally:
+            server.terminate()
+            server.wait(10)
+
+    results = [json.loads(stdout.decode().strip().splitlines()[-1]) for stdout, _ in outputs]
+    latencies = sorted(latency for result in results for latency in result["latencies"])
+    calls = sum(result["calls"] for result in results)
+    return {
+        "workers": workers,
+        "calls": calls,
+        "errors": sum(result["errors"] for result in results),
+        "throughput": round(calls / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+        "upstream_requests": upstream,
+        "upstream_per_minute": round(upstream / elapsed * 60, 1),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", default="1,2,4", help="worker counts to compare")
+    parser.add_argument("--clients", type=int, default=4, help="client processes generating load")
+    parser.add_argument("--sessions", type=int, default=8, help="MCP sessions per client process")
+    parser.add_argument("--calls", type=int, default=400, help="tool calls per worker count")
+    parser.add_argument("--series", type=int, default=50, help="distinct series IDs to cycle over")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="mock FRED response latency")
+    parser.add_argument("--rate-limit", type=float, default=1000000,
+                        help="FRED_RATE_LIMIT_PER_MINUTE shared by all workers")
+    parser.add_argument("--no-store", action="store_true", help="disable the local observation store")
+    parser.add_argument("--output", type=Path, help="also write the results as JSON")
+    parser.add_argument("--client-worker", metavar="URL", help=argparse.SUPPRESS)
+    parser.add_argument("--offset", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.client_worker:
+        await client_worker(args.client_worker, args.sessions, args.calls, args.series, args.offset)
+        return
+
+    mock_port = free_port()
+    mock = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.mock_fred", "--port", str(mock_port),
+         "--latency-ms", str(args.latency_ms), "--jitter-ms", "0"],
+        cwd=str(ROOT)
+    )
+    results = []
+    try:
+        await wait_for_port(mock_port, mock)
+        print(f"{args.clients} client processes x {args.sessions} sessions, mock FRED latency {args.latency_ms} ms")
+        print(f"{'workers':>8}{'calls':>7}{'errors':>7}{'calls/s':>9}{'p50 ms':>9}{'p99 ms':>9}"
+              f"{'upstream':>10}{'upstream/min':>14}")
+        for workers in (int(count) for count in args.workers.split(",")):
+            result = await run_case(args, workers, mock_port)
+            results.append(result)
+            print(f"{workers:>8}{result['calls']:>7}{result['errors']:>7}{result['throughput']:>9}"
+                  f"{result['p50_ms']:>9}{result['p99_ms']:>9}{result['upstream_requests']:>10}"
+                  f"{result['upstream_per_minute']:>14}")
+    finally:
+        mock.terminate()
+        mock.wait(10)
+
+    if args.output:
+        args.output.write_text(json.dumps({"settings": {
+            key: value for key, value in vars(args).items() if key not in ("output", "client_worker", "offset")
+        }, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,205 @@
+"""A local stand-in for the FRED API, for benchmarks and offline runs.
+
+    python -m benchmarks.mock_fred [--port 8081] [--latency-ms 20] [--error-rate 0.01]
+
+Point the server at it with FRED_API_BASE=http://127.0.0.1:8081/fred. Responses
+are synthetic but shaped like FRED's: every series ID has a deterministic monthly
+history, and list endpoints return as many records as asked for. A recorded
+response can be served instead by dropping it in --fixtures as
+<endpoint with '/' replaced by '_'>.json, e.g. series_observations.json.
+Latency (with jitter) and 429/500 errors are injected at the configured rates.
+"""
+import argparse
+import asyncio
+import json
+import random
+from datetime import date
+from pathlib import Path
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+REALTIME = "2026-01-01"
+LAST_UPDATED = "2026-01-01 07:44:02-06"
+
+
+def observation_history(series_id: str, count: int) -> list[tuple[str, str]]:
+    """A reproducible monthly random walk for `series_id`, with an occasional '.' gap."""
+    rng = random.Random(series_id)
+    level = rng.uniform(1, 300)
+    history = []
+    for i in range(count):
+        level = max(level * (1 + rng.gauss(0.002, 0.01)), 0.01)
+        obs_date = date(1960 + i // 12, i % 12 + 1, 1).isoformat()
+        history.append((obs_date, "." if rng.random() < 0.005 else f"{level:.3f}"))
+    return history
+
+
+class MockFRED:
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0,
+                 observations: int = 600, fixtures: Path | None = None, seed: int = 0):
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.observations = observations
+        self.fixtures = fixtures
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.errors = 0
+        self.histories: dict[str, list[tuple[str, str]]] = {}
+
+    def history(self, series_id: str) -> list[tuple[str, str]]:
+        if series_id not in self.histories:
+            self.histories[series_id] = observation_history(series_id, self.observations)
+        return self.histories[series_id]
+
+    def series_record(self, series_id: str) -> dict:
+        history = self.history(series_id)
+        return {
+            "id": series_id, "realtime_start": REALTIME, "realtime_end": REALTIME,
+            "title": f"Synthetic series {series_id}", "observation_start": history[0][0],
+            "observation_end": history[-1][0], "frequency": "Monthly", "frequency_short": "M",
+            "units": "Index", "units_short": "Index", "seasonal_adjustment": "Seasonally Adjusted",
+            "seasonal_adjustment_short": "SA", "last_updated": LAST_UPDATED, "popularity": 50,
+            "notes": "Served by the benchmark mock.",
+        }
+
+    def observations_body(self, params) -> dict:
+        history = self.history(params.get("series_id", "MOCK"))
+        start = params.get("observation_start", "0000-00-00")
+        end = params.get("observation_end", "9999-99-99")
+        selected = [obs for obs in history if start <= obs[0] <= end]
+        if params.get("sort_order") == "desc":
+            selected.reverse()
+        offset = int(params.get("offset", 0))
+        limit = int(params.get("limit", 100000))
+        page = selected[offset:offset + limit]
+        return {
+            "realtime_start": REALTIME, "realtime_end": REALTIME, "units": params.get("units", "lin"),
+            "output_type": 1, "file_type": "json", "order_by": "observation_date",
+            "sort_order": params.get("sort_order", "asc"), "count": len(selected),
+            "offset": offset, "limit": limit,
+            "observations": [
+                {"realtime_start": REALTIME, "realtime_end": REALTIME, "date": obs_date, "value": value}
+                for obs_date, value in page
+            ],
+        }
+
+    @staticmethod
+    def list_body(key: str, params, make, total: int = 5000) -> dict:
+        offset = int(params.get("offset", 0))
+        limit = int(params.get("limit", 1000))
+        items = [make(i) for i in range(offset, min(offset + limit, total))]
+        return {"count": total, "offset": offset, "limit": limit, key: items}
+
+    def body(self, endpoint: str, params) -> dict | None:
+        if endpoint == "series/observations":
+            return self.observations_body(params)
+        if endpoint == "series":
+            return {"seriess": [self.series_record(params.get("series_id", "MOCK"))]}
+        if endpoint == "series/search":
+            text = params.get("search_text", "").upper().replace(" ", "")[:8] or "MOCK"
+            return self.list_body("seriess", params, lambda i: self.series_record(f"{text}{i}"))
+        if endpoint == "series/release":
+            return {"releases": [{"id": 50, "realtime_start": REALTIME, "realtime_end": REALTIME,
+                                  "name": "Release 50", "press_release": True}]}
+        if endpoint == "release/dates":
+            # Weekly from realtime_start, for a year
+            start = date.fromisoformat(params.get("realtime_start", REALTIME))
+            return self.list_body("release_dates", params, lambda i: {
+                "release_id": int(params.get("release_id", 0)),
+                "date": date.fromordinal(start.toordinal() + 7 * i).isoformat(),
+            }, 53)
+        if endpoint == "release/series":
+            release_id = params.get("release_id", "0")
+            return self.list_body("seriess", params, lambda i: self.series_record(f"REL{release_id}S{i}"), 50)
+        if endpoint == "series/updates":
+            return self.list_body("seriess", params, lambda i: self.series_record(f"UPDATED{i}"), 20)
+        if endpoint == "category":
+            category_id = int(params.get("category_id", 0))
+            return {"categories": [{"id": category_id, "name": f"Category {category_id}",
+                                    "parent_id": category_id // 10}]}
+        if endpoint == "category/children":
+            # Root has 8 children, each of those 3 more: a small, finite tree
+            category_id = int(params.get("category_id", 0))
+            children = range(1, 9) if category_id == 0 else range(category_id * 10, category_id * 10 + 3)
+            return {"categories": [
+                {"id": child, "name": f"Category {child}", "parent_id": category_id}
+                for child in (children if category_id < 10 else ())
+            ]}
+        if endpoint == "category/series":
+            category_id = params.get("category_id", "0")
+            return self.list_body("seriess", params, lambda i: self.series_record(f"CAT{category_id}S{i}"), 12)
+        if endpoint == "releases":
+            return self.list_body("releases", params, lambda i: {
+                "id": i + 1, "realtime_start": REALTIME, "realtime_end": REALTIME,
+                "name": f"Release {i + 1}", "press_release": True,
+            })
+        if endpoint == "sources":
+            return self.list_body("sources", params, lambda i: {
+                "id": i + 1, "realtime_start": REALTIME, "realtime_end": REALTIME, "name": f"Source {i + 1}",
+            })
+        if endpoint == "tags":
+            return self.list_body("tags", params, lambda i: {
+                "name": f"tag{i}", "group_id": "gen", "notes": "", "created": "2012-02-27 10:18:19-06",
+                "popularity": 50, "series_count": 100 - i % 100,
+            })
+        return None
+
+    async def handle(self, request: Request) -> Response:
+        self.requests += 1
+        endpoint = request.path_params["endpoint"].strip("/")
+        delay = self.latency + self.rng.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if self.error_rate and self.rng.random() < self.error_rate:
+            self.errors += 1
+            if self.rng.random() < 0.5:
+                return JSONResponse({"error_code": 429, "error_message": "Too Many Requests."},
+                                    status_code=429, headers={"Retry-After": "0"})
+            return JSONResponse({"error_code": 500, "error_message": "Internal Server Error."}, status_code=500)
+
+        if self.fixtures is not None:
+            fixture = self.fixtures / f"{endpoint.replace('/', '_')}.json"
+            if fixture.is_file():
+                return Response(fixture.read_bytes(), media_type="application/json")
+
+        body = self.body(endpoint, request.query_params)
+        if body is None:
+            return JSONResponse({"error_code": 400, "error_message": f"Unknown endpoint '{endpoint}'."},
+                                status_code=400)
+        return Response(json.dumps(body), media_type="application/json")
+
+    async def stats(self, _request: Request) -> Response:
+        return JSONResponse({"requests": self.requests, "errors": self.errors})
+
+    def app(self) -> Starlette:
+        return Starlette(routes=[
+            Route("/fred/{endpoint:path}", self.handle),
+            Route("/mock/stats", self.stats),
+        ])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--observations", type=int, default=600, help="history length of each series")
+    parser.add_argument("--fixtures", type=Path, help="directory of recorded responses")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    mock = MockFRED(args.latency_ms, args.jitter_ms, args.error_rate, args.observations, args.fixtures, args.seed)
+    uvicorn.run(mock.app(), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
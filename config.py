@@ -10,8 +10,133 @@ class Config:
     OPENAI_API_VERSION = os.getenv('API_VERSION')
     OPENAI_ORG = os.getenv('OPENAI_ORGANIZATION')
     OPENAI_MODEL = os.getenv('MODEL')
+    LLM_STREAM = os.getenv('LLM_STREAM', 'true').lower() == 'true'
+    # Ask for token usage at the end of streamed responses (needs a recent API version)
+    LLM_STREAM_USAGE = os.getenv('LLM_STREAM_USAGE', 'true').lower() == 'true'
 
     # Agentic loop settings
     MAX_ITERATIONS = 15
-    MAX_MESSAGES = 20
+    CONTEXT_TOKEN_BUDGET = int(os.getenv('CONTEXT_TOKEN_BUDGET', '16000'))
+    CONTEXT_TARGET_RATIO = float(os.getenv('CONTEXT_TARGET_RATIO', '0.75'))
+    CONTEXT_SUMMARY_TOKENS = int(os.getenv('CONTEXT_SUMMARY_TOKENS', '120'))
     MAX_RESULT_LENGTH = 2000
+    MAX_CONCURRENT_TOOL_CALLS = int(os.getenv('MAX_CONCURRENT_TOOL_CALLS', '4'))
+    # Session memo of tool results (0 disables)
+    TOOL_MEMO_TTL = float(os.getenv('TOOL_MEMO_TTL', '120'))
+    TOOL_MEMO_MAX_ENTRIES = int(os.getenv('TOOL_MEMO_MAX_ENTRIES', '128'))
+    # Prefetch the series a query names (by alias or recent use) while the first LLM call runs
+    PREFETCH_ENABLED = os.getenv('PREFETCH_ENABLED', 'true').lower() == 'true'
+    PREFETCH_MAX_SERIES = int(os.getenv('PREFETCH_MAX_SERIES', '3'))
+    # Answer simple one-series questions (latest value, a date or a date range) with a direct tool
+    # call instead of the agentic loop: latest values from a template, the rest with one LLM call
+    ROUTER_ENABLED = os.getenv('ROUTER_ENABLED', 'true').lower() == 'true'
+    ROUTER_TEMPLATE_ANSWERS = os.getenv('ROUTER_TEMPLATE_ANSWERS', 'true').lower() == 'true'
+    ROUTER_MAX_POINTS = int(os.getenv('ROUTER_MAX_POINTS', '120'))
+
+    # FRED API
+    FRED_API_BASE = os.getenv('FRED_API_BASE', 'https://api.stlouisfed.org/fred')
+    FRED_API_KEY = os.getenv('FRED_API_KEY')
+
+    # FRED HTTP client settings
+    FRED_HTTP2 = os.getenv('FRED_HTTP2', 'true').lower() == 'true'
+    FRED_MAX_CONNECTIONS = int(os.getenv('FRED_MAX_CONNECTIONS', '20'))
+    FRED_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv('FRED_MAX_KEEPALIVE_CONNECTIONS', '10'))
+    FRED_KEEPALIVE_EXPIRY = float(os.getenv('FRED_KEEPALIVE_EXPIRY', '60'))
+    FRED_CONNECT_TIMEOUT = float(os.getenv('FRED_CONNECT_TIMEOUT', '5'))
+    FRED_TIMEOUT = float(os.getenv('FRED_TIMEOUT', '30'))
+    FRED_ENDPOINT_TIMEOUTS = {
+        'series/observations': float(os.getenv('FRED_OBSERVATIONS_TIMEOUT', '60')),
+        'series/search': float(os.getenv('FRED_SEARCH_TIMEOUT', '30')),
+        'series': 10.0,
+    }
+
+    # Local persistence
+    FRED_CACHE_DIR = os.getenv('FRED_CACHE_DIR', '.fred_cache')
+    OBSERVATION_STORE_ENABLED = os.getenv('OBSERVATION_STORE_ENABLED', 'true').lower() == 'true'
+    OBSERVATION_STORE_CHECK_INTERVAL = float(os.getenv('OBSERVATION_STORE_CHECK_INTERVAL', '900'))
+    OBSERVATION_REVISION_LOOKBACK = int(os.getenv('OBSERVATION_REVISION_LOOKBACK', '24'))
+
+    # Local full-text series search index. Filled from searches that reach FRED; with
+    # SEARCH_INDEX_HARVEST (opt-in, for long-running servers: a full harvest takes hours of
+    # FRED quota) also harvested from every release and refreshed from series/updates
+    # every SEARCH_INDEX_REFRESH_INTERVAL seconds
+    SEARCH_INDEX_ENABLED = os.getenv('SEARCH_INDEX_ENABLED', 'true').lower() == 'true'
+    SEARCH_INDEX_HARVEST = os.getenv('SEARCH_INDEX_HARVEST', 'false').lower() == 'true'
+    SEARCH_INDEX_REFRESH_INTERVAL = float(os.getenv('SEARCH_INDEX_REFRESH_INTERVAL', '3600'))
+    SEARCH_INDEX_CONCURRENCY = int(os.getenv('SEARCH_INDEX_CONCURRENCY', '2'))
+
+    # Release calendar: cached series data stays current until the series' next scheduled release
+    # (at most RELEASE_CALENDAR_MAX_TTL seconds), and popular series are re-checked every
+    # RELEASE_REFRESH_INTERVAL seconds once their release day has begun
+    RELEASE_CALENDAR_ENABLED = os.getenv('RELEASE_CALENDAR_ENABLED', 'true').lower() == 'true'
+    RELEASE_CALENDAR_MAX_TTL = float(os.getenv('RELEASE_CALENDAR_MAX_TTL', '86400'))
+    RELEASE_CALENDAR_LOOKBACK_DAYS = int(os.getenv('RELEASE_CALENDAR_LOOKBACK_DAYS', '100'))
+    RELEASE_REFRESH_INTERVAL = float(os.getenv('RELEASE_REFRESH_INTERVAL', '300'))
+    RELEASE_REFRESH_TOP_SERIES = int(os.getenv('RELEASE_REFRESH_TOP_SERIES', '20'))
+
+    # Category tree cache: filled as categories are browsed; with CATEGORY_CRAWL_ENABLED (opt-in,
+    # for long-running servers) also crawled breadth-first in the background every
+    # CATEGORY_CRAWL_INTERVAL seconds, revisiting only categories older than CATEGORY_TREE_MAX_AGE
+    CATEGORY_CRAWL_ENABLED = os.getenv('CATEGORY_CRAWL_ENABLED', 'false').lower() == 'true'
+    CATEGORY_CRAWL_INTERVAL = float(os.getenv('CATEGORY_CRAWL_INTERVAL', '86400'))
+    CATEGORY_TREE_MAX_AGE = float(os.getenv('CATEGORY_TREE_MAX_AGE', '604800'))
+    CATEGORY_CRAWL_CONCURRENCY = int(os.getenv('CATEGORY_CRAWL_CONCURRENCY', '4'))
+
+    # MCP server
+    MCP_SERVER_NAME = os.getenv('MCP_SERVER_NAME', 'weather-transfer-server')
+    MCP_TRANSPORT = os.getenv('MCP_TRANSPORT', 'stdio').lower()
+    MCP_HOST = os.getenv('MCP_HOST', '0.0.0.0')
+    MCP_PORT = int(os.getenv('MCP_PORT', '8000'))
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+
+    # Attach the client to a running server (streamable-http URL, or SSE for URLs ending in /sse)
+    # instead of spawning mcp_server.py over stdio; dropped connections are re-opened
+    MCP_SERVER_URL = os.getenv('MCP_SERVER_URL', '')
+    MCP_RECONNECT_ATTEMPTS = int(os.getenv('MCP_RECONNECT_ATTEMPTS', '3'))
+    MCP_RECONNECT_BACKOFF = float(os.getenv('MCP_RECONNECT_BACKOFF', '0.5'))
+    MCP_REQUEST_TIMEOUT = float(os.getenv('MCP_REQUEST_TIMEOUT', '120'))
+
+    # Multi-process serving: with MCP_WORKERS > 1 the streamable-http server runs that many
+    # stateless workers, which share the response cache and FRED quota through SQLite
+    MCP_WORKERS = int(os.getenv('MCP_WORKERS', '1'))
+    SHARED_STATE_ENABLED = os.getenv('SHARED_STATE_ENABLED', str(MCP_WORKERS > 1)).lower() == 'true'
+
+    # Series loaded in the background when the server starts (comma-separated, empty to disable)
+    WARMUP_SERIES = [
+        sid.strip() for sid in os.getenv('WARMUP_SERIES', 'UNRATE,CPIAUCSL,GDP,FEDFUNDS,DGS10,PAYEMS').split(',')
+        if sid.strip()
+    ]
+
+    # In-process metadata cache (TTLs in seconds; endpoints not listed are not cached)
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', '2048'))
+    CACHE_TTLS = {
+        'series': float(os.getenv('CACHE_TTL_SERIES', '300')),
+        'category/children': float(os.getenv('CACHE_TTL_CATEGORIES', '86400')),
+        'releases': float(os.getenv('CACHE_TTL_RELEASES', '21600')),
+        'sources': float(os.getenv('CACHE_TTL_SOURCES', '86400')),
+        'tags': float(os.getenv('CACHE_TTL_TAGS', '86400')),
+    }
+
+    # FRED rate limiting and retries (FRED allows about 120 requests per minute per key)
+    FRED_RATE_LIMIT_PER_MINUTE = float(os.getenv('FRED_RATE_LIMIT_PER_MINUTE', '110'))
+    FRED_RATE_LIMIT_BURST = int(os.getenv('FRED_RATE_LIMIT_BURST', '10'))
+    FRED_MAX_RETRIES = int(os.getenv('FRED_MAX_RETRIES', '4'))
+    FRED_BACKOFF_BASE = float(os.getenv('FRED_BACKOFF_BASE', '0.5'))
+    FRED_BACKOFF_MAX = float(os.getenv('FRED_BACKOFF_MAX', '30'))
+
+    # Batch observation requests
+    BATCH_MAX_SERIES = int(os.getenv('BATCH_MAX_SERIES', '20'))
+    BATCH_MAX_CONCURRENCY = int(os.getenv('BATCH_MAX_CONCURRENCY', '4'))
+
+    # Paged list endpoints (FRED returns at most 1000 results per page)
+    FRED_PAGE_SIZE = int(os.getenv('FRED_PAGE_SIZE', '1000'))
+    PAGINATION_MAX_RESULTS = int(os.getenv('PAGINATION_MAX_RESULTS', '5000'))
+    PAGINATION_MAX_CONCURRENCY = int(os.getenv('PAGINATION_MAX_CONCURRENCY', '4'))
+
+    # Observability: /metrics is always served on the HTTP transports; spans need OpenTelemetry installed
+    TRACING_ENABLED = os.getenv('TRACING_ENABLED', 'false').lower() == 'true'
+
+    # Server-side analytics
+    ANALYTICS_MAX_OBSERVATIONS = int(os.getenv('ANALYTICS_MAX_OBSERVATIONS', '100000'))
+    # Upper bound on points returned by a downsampled get_series_observations call
+    OBSERVATIONS_MAX_POINTS = int(os.getenv('OBSERVATIONS_MAX_POINTS', '500'))
@@ -0,0 +1,136 @@
+import json
+from functools import lru_cache
+
+try:
+    import tiktoken
+except ImportError:  # Optional: fall back to a character-based estimate
+    tiktoken = None
+
+# Per-message overhead of the chat format (role, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+CHARS_PER_TOKEN = 4
+COMPACTED_MARKER = "[Earlier result compacted:"
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model: str | None):
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model or "")
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception:  # Encoding files are downloaded on first use and may be unavailable offline
+        return None
+
+
+@lru_cache(maxsize=4096)
+def count_tokens(text: str, model: str | None = None) -> int:
+    """Count tokens with tiktoken when available, otherwise estimate from length."""
+    if not text:
+        return 0
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _tool_call_text(tool_call) -> str:
+    if isinstance(tool_call, dict):
+        function = tool_call.get("function", {})
+        return f"{function.get('name', '')}{function.get('arguments', '')}"
+    return f"{tool_call.function.name}{tool_call.function.arguments}"
+
+
+def count_message_tokens(message: dict, model: str | None = None) -> int:
+    tokens = MESSAGE_OVERHEAD_TOKENS + count_tokens(message.get("content") or "", model)
+    for tool_call in message.get("tool_calls") or []:
+        tokens += count_tokens(_tool_call_text(tool_call), model)
+    return tokens
+
+
+def summarize_tool_result(content: str, max_tokens: int, model: str | None = None) -> str:
+    """Shrink a tool result to its leading lines plus a note of what was cut.
+
+    Deterministic, so a compacted message keeps the same bytes on every later request.
+    """
+    lines = content.splitlines()
+    kept = []
+    used = 0
+    for line in lines:
+        line_tokens = count_tokens(line, model) + 1
+        if used + line_tokens > max_tokens:
+            break
+        kept.append(line)
+        used += line_tokens
+    if not kept and lines:
+        kept.append(lines[0][:max_tokens * CHARS_PER_TOKEN])
+    return "\n".join(kept) + f"\n{COMPACTED_MARKER} showing {len(kept)} of {len(lines)} lines]"
+
+
+class ContextWindow:
+    """Keep the prompt within a token budget instead of a message count.
+
+    When the history goes over `budget` it is brought down to `budget * target_ratio`,
+    so several following requests fit without another change:
+    1. tool results before the latest assistant message are compacted, oldest first;
+    2. whole turns (a user message and everything up to the next one) are dropped,
+       oldest first, never the current turn.
+    The system message is never touched, and unchanged history is returned as is, so
+    the prompt prefix stays byte-stable for provider-side prompt caching. Tool results
+    are only ever shrunk, never separated from the assistant message that called them.
+    """
+
+    def __init__(self, budget: int, target_ratio: float = 0.75, summary_tokens: int = 120,
+                 reserved_tokens: int = 0, model: str | None = None):
+        self.budget = budget
+        self.target_ratio = target_ratio
+        self.summary_tokens = summary_tokens
+        self.reserved_tokens = reserved_tokens
+        self.model = model
+
+    def reserve_for_tools(self, tools: list[dict]) -> None:
+        """Account for the tool schemas sent alongside every request."""
+        self.reserved_tokens = count_tokens(json.dumps(tools, sort_keys=True), self.model) if tools else 0
+
+    def total_tokens(self, messages: list) -> int:
+        return self.reserved_tokens + sum(count_message_tokens(message, self.model) for message in messages)
+
+    def fit(self, messages: list) -> list:
+        """Return `messages` unchanged if they fit the budget, otherwise a compacted copy."""
+        total = self.total_tokens(messages)
+        if total <= self.budget:
+            return messages
+
+        target = int(self.budget * self.target_ratio)
+        has_system = bool(messages) and messages[0].get("role") == "system"
+        prefix = messages[:1] if has_system else []
+        history = [dict(message) for message in messages[len(prefix):]]
+
+        latest_assistant = max(
+            (i for i, message in enumerate(history) if message.get("role") == "assistant"), default=len(history)
+        )
+        for i in range(latest_assistant):
+            if total <= target:
+                break
+            message = history[i]
+            content = message.get("content") or ""
+            if message.get("role") != "tool" or COMPACTED_MARKER in content:
+                continue
+            before = count_message_tokens(message, self.model)
+            summary = summarize_tool_result(content, self.summary_tokens, self.model)
+            if count_tokens(summary, self.model) + MESSAGE_OVERHEAD_TOKENS >= before:
+                continue
+            message["content"] = summary
+            total -= before - count_message_tokens(message, self.model)
+
+        turn_starts = [i for i, message in enumerate(history) if message.get("role") == "user"]
+        drop_until = 0
+        for start in (i for i in turn_starts if i > 0):
+            if total <= target:
+                break
+            total -= sum(count_message_tokens(message, self.model) for message in history[drop_until:start])
+            drop_until = start
+
+        return prefix + history[drop_until:]
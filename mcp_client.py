@@ -1,38 +1,119 @@
 import asyncio
 import json
+import os
 import sys
+import time
+from collections.abc import Callable
 from contextlib import AsyncExitStack
-
-from openai import AzureOpenAI
-from mcp import StdioServerParameters
-from mcp.client.stdio import stdio_client
-from mcp.client.session import ClientSession
+from typing import TYPE_CHECKING
 
 from config import Config
-from prompts import get_system_message, enhance_temporal_query
-from message_utils import truncate_messages, is_incomplete_response, format_tool_result
+from prompts import get_system_message, get_routed_answer_message, enhance_temporal_query
+from context_window import ContextWindow, count_tokens
+from message_utils import is_incomplete_response, format_tool_result, format_structured_result
+from tool_memo import ToolResultMemo
+from prefetch import resolve_series
+from router import format_latest, route_query
+from server_connection import ServerConnection
+
+if TYPE_CHECKING:
+    from openai import AsyncAzureOpenAI
+    from openai.types.chat import ChatCompletionMessage, ChatCompletionMessageToolCall
+
+RECENT_SERIES_LIMIT = 10
+
+
+def create_llm_client() -> "AsyncAzureOpenAI":
+    """Build the Azure OpenAI client. Importing openai is most of the client's startup time,
+    so it is done here rather than at module import."""
+    from openai import AsyncAzureOpenAI
+
+    return AsyncAzureOpenAI(
+        api_key=Config.OPENAI_API_KEY,
+        api_version=Config.OPENAI_API_VERSION,
+        azure_endpoint=Config.OPENAI_API_BASE,
+        organization=Config.OPENAI_ORG
+    )
 
 
 class AgenticMCPClient:
-    def __init__(self):
-        self.openai_client = AzureOpenAI(
-            api_key=Config.OPENAI_API_KEY,
-            api_version=Config.OPENAI_API_VERSION,
-            azure_endpoint=Config.OPENAI_API_BASE,
-            organization=Config.OPENAI_ORG
-        )
+    def __init__(self, openai_client: "AsyncAzureOpenAI | None" = None, verbose: bool = True):
+        # Created by load_llm_client(), which can overlap with connecting to the server
+        self.openai_client = openai_client
+        # Progress output (streamed answers, tool calls, timings); off for batch runs
+        self.verbose = verbose
         self.exit_stack = AsyncExitStack()
         self.session = None
+        # Set when attached to a running server by URL
+        self.connection: ServerConnection | None = None
         self.available_tools = []
+        self.context_window = ContextWindow(
+            Config.CONTEXT_TOKEN_BUDGET,
+            target_ratio=Config.CONTEXT_TARGET_RATIO,
+            summary_tokens=Config.CONTEXT_SUMMARY_TOKENS,
+            model=Config.OPENAI_MODEL
+        )
+        self.tool_memo = ToolResultMemo(Config.TOOL_MEMO_TTL, Config.TOOL_MEMO_MAX_ENTRIES)
+        self.prefetch_tasks: dict[str, asyncio.Task] = {}
+        # Series used by recent tool calls, most recent last
+        self.recent_series: list[str] = []
+        # Latency and token usage of the most recent LLM call, and of each iteration of the last run
+        self.last_llm_stats: dict = {}
+        self.iteration_stats: list[dict] = []
+
+    def log(self, *args, **kwargs) -> None:
+        if self.verbose:
+            print(*args, **kwargs)
+
+    def new_conversation(self) -> "AgenticMCPClient":
+        """A quiet client for an independent conversation over this client's MCP session.
+
+        It shares the session, tool list and LLM client, and has its own memo,
+        prefetches and statistics, so many can run concurrently.
+        """
+        client = AgenticMCPClient(self.openai_client, verbose=False)
+        client.session = self.session
+        client.connection = self.connection
+        client.available_tools = self.available_tools
+        client.context_window.reserve_for_tools(client._convert_tools_to_openai_format())
+        return client
+
+    async def load_llm_client(self) -> None:
+        """Create the LLM client off the event loop, if it has not been created yet."""
+        if self.openai_client is None:
+            self.openai_client = await asyncio.to_thread(create_llm_client)
+
+    async def connect(self, target: str) -> None:
+        """Attach to a running server when `target` is a URL, otherwise start `python <target>` over stdio.
+
+        The LLM client is created while the server starts or the connection opens.
+        """
+        loading = asyncio.create_task(self.load_llm_client())
+        if target.startswith(("http://", "https://")):
+            await self.connect_to_mcp_url(target)
+        else:
+            await self.connect_to_mcp_server(f"python {target}")
+        await loading
+
+    async def connect_to_mcp_url(self, url: str):
+        """Attach to a running MCP server over streamable HTTP (or SSE), reconnecting if it drops."""
+        self.log(f"Connecting to MCP server at {url}")
+        self.connection = ServerConnection(url)
+        self.session = await self.connection.connect()
+        self.log("MCP session initialized successfully")
 
     async def connect_to_mcp_server(self, command: str):
         """Connect to an MCP server using stdio with the given command."""
-        print(f"Connecting to MCP server via stdio: {command}")
+        from mcp import ClientSession, StdioServerParameters
+        from mcp.client.stdio import stdio_client
+
+        self.log(f"Connecting to MCP server via stdio: {command}")
         args = command.split()
         server_params = StdioServerParameters(
             command=args[0],
             args=args[1:],
-            env=None
+            # The server sees the client's settings, including any already loaded from .env
+            env=dict(os.environ)
         )
 
         stdio_context = stdio_client(server_params)
@@ -41,13 +122,20 @@ class AgenticMCPClient:
         session_context = ClientSession(read_stream, write_stream)
         self.session = await self.exit_stack.enter_async_context(session_context)
         await self.session.initialize()
-        print("MCP session initialized successfully")
+        self.log("MCP session initialized successfully")
 
     async def list_available_tools(self):
         """Fetch and cache available tools from the MCP server."""
-        response = await self.session.list_tools()
+        response = await self.request("list_tools")
         self.available_tools = response.tools
-        print(f"Available tools: {[tool.name for tool in self.available_tools]}")
+        self.context_window.reserve_for_tools(self._convert_tools_to_openai_format())
+        self.log(f"Available tools: {[tool.name for tool in self.available_tools]}")
+
+    async def request(self, method: str, *args):
+        """Call a ClientSession method, through the reconnecting connection when attached by URL."""
+        if self.connection is not None:
+            return await self.connection.request(method, *args)
+        return await getattr(self.session, method)(*args)
 
     def _convert_tools_to_openai_format(self) -> list[dict]:
         """Convert MCP tools to OpenAI function format."""
@@ -60,62 +148,281 @@ class AgenticMCPClient:
             }
         } for tool in self.available_tools]
 
-    def call_llm(self, messages: list) -> object:
-        """Call the LLM with the current message history."""
-        tools = self._convert_tools_to_openai_format()
+    async def call_llm(self, messages: list,
+                       on_tool_call: Callable[["ChatCompletionMessageToolCall"], None] | None = None,
+                       tool_choice: str = "auto") -> "ChatCompletionMessage":
+        """Call the LLM with the current message history.
+
+        With Config.LLM_STREAM enabled, answer tokens are printed as they arrive and
+        `on_tool_call` is invoked for each tool call as soon as its arguments are complete,
+        so it can start executing while the rest of the response is still streaming.
+        Latency and token usage are recorded in `self.last_llm_stats`. `tool_choice="none"`
+        asks for a plain answer while still sending the tools, so the prompt prefix (and
+        the provider's prompt cache) is the same as in the loop.
+        """
+        await self.load_llm_client()
+        from openai.types.chat import ChatCompletionMessage, ChatCompletionMessageToolCall
 
-        response = self.openai_client.chat.completions.create(
+        tools = self._convert_tools_to_openai_format()
+        started = time.perf_counter()
+
+        if not Config.LLM_STREAM:
+            response = await self.openai_client.chat.completions.create(
+                model=Config.OPENAI_MODEL,
+                messages=messages,
+                tools=tools if tools else None,
+                tool_choice=tool_choice
+            )
+            message = response.choices[0].message
+            self.record_llm_stats(messages, message, response.usage, started)
+            if on_tool_call and message.tool_calls:
+                for tool_call in message.tool_calls:
+                    on_tool_call(tool_call)
+            return message
+
+        usage_options = {"stream_options": {"include_usage": True}} if Config.LLM_STREAM_USAGE else {}
+        stream = await self.openai_client.chat.completions.create(
             model=Config.OPENAI_MODEL,
             messages=messages,
             tools=tools if tools else None,
-            tool_choice="auto"
+            tool_choice=tool_choice,
+            stream=True,
+            **usage_options
         )
 
-        return response.choices[0].message
-
-    async def execute_tool_call(self, tool_name: str, tool_input: dict) -> str:
-        """Execute a tool call via the MCP server and return formatted result."""
-        result = await self.session.call_tool(tool_name, tool_input)
-
+        usage = None
+        first_token = None
+        content_parts = []
+        partial_calls: dict[int, dict] = {}
+        tool_calls = []
+
+        def finish_call(index: int) -> None:
+            call = partial_calls.pop(index)
+            tool_call = ChatCompletionMessageToolCall(
+                id=call["id"],
+                type="function",
+                function={"name": call["name"], "arguments": call["arguments"]}
+            )
+            tool_calls.append(tool_call)
+            if on_tool_call:
+                on_tool_call(tool_call)
+
+        async for chunk in stream:
+            if chunk.usage:
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            if first_token is None:
+                first_token = time.perf_counter() - started
+            delta = chunk.choices[0].delta
+
+            if delta.content:
+                if not content_parts:
+                    self.log("\n=== RESPONSE ===")
+                self.log(delta.content, end="", flush=True)
+                content_parts.append(delta.content)
+
+            for tool_call_delta in delta.tool_calls or []:
+                index = tool_call_delta.index
+                if index not in partial_calls:
+                    # A new call starting means every earlier one has all its arguments
+                    for earlier in sorted(i for i in partial_calls if i < index):
+                        finish_call(earlier)
+                    partial_calls[index] = {"id": "", "name": "", "arguments": ""}
+                call = partial_calls[index]
+                if tool_call_delta.id:
+                    call["id"] = tool_call_delta.id
+                if tool_call_delta.function:
+                    call["name"] += tool_call_delta.function.name or ""
+                    call["arguments"] += tool_call_delta.function.arguments or ""
+
+        for index in sorted(partial_calls):
+            finish_call(index)
+        if content_parts:
+            self.log()
+
+        message = ChatCompletionMessage(
+            role="assistant",
+            content="".join(content_parts) or None,
+            tool_calls=tool_calls or None
+        )
+        self.record_llm_stats(messages, message, usage, started, first_token)
+        return message
+
+    def record_llm_stats(self, messages: list, message: "ChatCompletionMessage", usage, started: float,
+                         first_token: float | None = None) -> None:
+        """Keep latency and token usage of an LLM call, estimating tokens when the API reports none."""
+        stats = {"llm_seconds": round(time.perf_counter() - started, 3)}
+        if first_token is not None:
+            stats["first_token_seconds"] = round(first_token, 3)
+        if usage is not None:
+            stats["prompt_tokens"] = usage.prompt_tokens
+            stats["completion_tokens"] = usage.completion_tokens
+        else:
+            completion = (message.content or "") + "".join(
+                call.function.name + call.function.arguments for call in message.tool_calls or []
+            )
+            stats["prompt_tokens"] = self.context_window.total_tokens(messages)
+            stats["completion_tokens"] = count_tokens(completion, Config.OPENAI_MODEL)
+            stats["estimated"] = True
+        self.last_llm_stats = stats
+
+    async def fetch_tool_payload(self, tool_name: str, tool_input: dict) -> tuple[dict | None, str]:
+        """Return a tool's (structured content, text), from the session memo when possible."""
+        payload = self.tool_memo.get(tool_name, tool_input)
+        if payload is not None:
+            self.log(f"Reusing memoized result for {tool_name}")
+            return payload
+
+        result = await self.request("call_tool", tool_name, tool_input)
+
+        structured = result.structuredContent
+        if not structured or "dates" not in structured:
+            structured = None
         result_text = ""
         if result.content:
             for content_item in result.content:
                 if hasattr(content_item, 'text'):
                     result_text += content_item.text
 
-        return format_tool_result(result_text, tool_input, Config.MAX_RESULT_LENGTH)
+        payload = (structured, result_text)
+        if not result.isError:
+            self.tool_memo.put(tool_name, tool_input, payload)
+        return payload
 
-    async def process_tool_calls(self, message) -> list[dict]:
-        """Process all tool calls from an assistant message."""
-        if not message.tool_calls:
-            return []
+    async def execute_tool_call(self, tool_name: str, tool_input: dict) -> str:
+        """Execute a tool call via the MCP server and return formatted result.
+
+        Results are memoized for the session, so repeating a call (or narrowing an
+        observation window already fetched) does not go back to the server. A call for
+        a series that is still being prefetched waits for the prefetch instead.
+        """
+        series_ids = tool_input.get("series_ids") or [tool_input.get("series_id")]
+        series_ids = [str(sid).strip().upper() for sid in series_ids if sid]
+        pending = [self.prefetch_tasks[sid] for sid in series_ids if sid in self.prefetch_tasks]
+        if pending:
+            await asyncio.wait(pending)
+        self.remember_series(series_ids)
+
+        structured, result_text = await self.fetch_tool_payload(tool_name, tool_input)
+        if structured is not None:
+            return format_structured_result(structured, Config.MAX_RESULT_LENGTH)
+        return format_tool_result(result_text, tool_input, Config.MAX_RESULT_LENGTH)
 
-        tool_results = []
-        for tool_call in message.tool_calls:
-            tool_name = tool_call.function.name
-            tool_input = json.loads(tool_call.function.arguments)
-            print(f"Executing tool: {tool_name} with params: {tool_input}")
+    def remember_series(self, series_ids: list[str]) -> None:
+        """Move series to the end of the recently used list."""
+        for series_id in series_ids:
+            if series_id in self.recent_series:
+                self.recent_series.remove(series_id)
+            self.recent_series.append(series_id)
+        del self.recent_series[:-RECENT_SERIES_LIMIT]
+
+    async def answer_directly(self, messages: list) -> str | None:
+        """Answer a simple one-series question with a direct tool call instead of the agentic loop.
+
+        Latest-value answers are filled into a template (no LLM call) when
+        Config.ROUTER_TEMPLATE_ANSWERS is set; other routed questions get one LLM call
+        to phrase the answer from the fetched data. Returns None, leaving the question
+        to the loop, when the router does not recognize it or the data cannot be fetched.
+        """
+        question = messages[-1].get("content") or ""
+        route = route_query(question, self.recent_series, Config.ROUTER_MAX_POINTS)
+        if route is None:
+            return None
+        series_id, tool_input = route["series_id"], route["tool_input"]
+        template = route["kind"] == "latest" and Config.ROUTER_TEMPLATE_ANSWERS
+        self.log(f"Answering directly with get_series_observations: {tool_input}")
+        self.remember_series([series_id])
+
+        fetches = [self.fetch_tool_payload("get_series_observations", tool_input)]
+        if template:
+            # For the title and units; usually already cached by the server
+            fetches.append(self.fetch_tool_payload("get_series_info", {"series_id": series_id}))
+        try:
+            payloads = await asyncio.gather(*fetches)
+        except Exception as e:
+            self.log(f"Direct answer failed ({e}); falling back to the agentic loop")
+            return None
+        table = payloads[0][0]
+        if not table or not table["dates"]:
+            return None
+
+        if template:
+            answer = format_latest(route, table, payloads[1][1])
+            if answer is not None:
+                if Config.LLM_STREAM:
+                    self.log(f"\n=== RESPONSE ===\n{answer}")
+                return answer
+
+        data = format_structured_result(table, Config.MAX_RESULT_LENGTH)
+        prompt = self.context_window.fit(messages[:-1] + [get_routed_answer_message(question, tool_input, data)])
+        message = await self.call_llm(prompt, tool_choice="none")
+        stats = {"iteration": 1, **self.last_llm_stats, "tool_calls": 0}
+        self.iteration_stats.append(stats)
+        self.log(
+            f"LLM: {stats['llm_seconds']:.2f}s, {stats['prompt_tokens']} prompt + "
+            f"{stats['completion_tokens']} completion tokens{' (estimated)' if stats.get('estimated') else ''}"
+        )
+        return message.content or None
+
+    def start_prefetch(self, query: str) -> None:
+        """Start fetching the series a query most likely needs, to overlap with the first LLM call."""
+        self.prefetch_tasks = {sid: task for sid, task in self.prefetch_tasks.items() if not task.done()}
+        if not Config.PREFETCH_ENABLED:
+            return
+        series_ids = [
+            sid for sid in resolve_series(query, self.recent_series, Config.PREFETCH_MAX_SERIES)
+            if sid not in self.prefetch_tasks
+        ]
+        for series_id in series_ids:
+            self.prefetch_tasks[series_id] = asyncio.create_task(self.prefetch_series(series_id))
+        if series_ids:
+            self.log(f"Prefetching {', '.join(series_ids)}")
+
+    async def prefetch_series(self, series_id: str) -> None:
+        """Load a series' info and latest observations into the session memo, ignoring failures."""
+        await asyncio.gather(
+            self.fetch_tool_payload("get_series_info", {"series_id": series_id}),
+            self.fetch_tool_payload("get_series_observations",
+                                    {"series_id": series_id, "limit": 10, "sort_order": "desc"}),
+            return_exceptions=True
+        )
 
+    async def run_tool_call(self, tool_call, semaphore: asyncio.Semaphore) -> dict:
+        """Execute one tool call, turning any failure into an error result for that call only."""
+        tool_name = tool_call.function.name
+        async with semaphore:
             try:
+                tool_input = json.loads(tool_call.function.arguments or "{}")
+                self.log(f"Executing tool: {tool_name} with params: {tool_input}")
                 result_text = await self.execute_tool_call(tool_name, tool_input)
-
-                tool_results.append({
-                    "role": "tool",
-                    "tool_call_id": tool_call.id,
-                    "name": tool_name,
-                    "content": result_text
-                })
-                print(f"Tool result preview: {result_text[:300]}...")
-
+                self.log(f"Tool result preview: {result_text[:300]}...")
             except Exception as e:
-                tool_results.append({
-                    "role": "tool",
-                    "tool_call_id": tool_call.id,
-                    "name": tool_name,
-                    "content": f"Error: {str(e)}"
-                })
+                result_text = f"Error: {str(e)}"
+
+        return {
+            "role": "tool",
+            "tool_call_id": tool_call.id,
+            "name": tool_name,
+            "content": result_text
+        }
+
+    async def process_tool_calls(self, message, started: dict[str, asyncio.Task] | None = None) -> list[dict]:
+        """Process all tool calls from an assistant message concurrently.
+
+        At most Config.MAX_CONCURRENT_TOOL_CALLS run at once; results come back in the
+        order of the tool calls so each matches its tool_call_id. Calls already started
+        while the response was streaming are passed in `started`, keyed by id.
+        """
+        if not message.tool_calls:
+            return []
 
-        return tool_results
+        started = started or {}
+        semaphore = asyncio.Semaphore(Config.MAX_CONCURRENT_TOOL_CALLS)
+        return list(await asyncio.gather(*(
+            started.get(tool_call.id) or self.run_tool_call(tool_call, semaphore)
+            for tool_call in message.tool_calls
+        )))
 
     async def run_agentic_loop(self, conversation_history: list, max_iterations: int = None) -> str:
         """Run the agentic loop maintaining full conversation history."""
@@ -129,15 +436,35 @@ class AgenticMCPClient:
         if not messages or messages[0].get('role') != 'system':
             messages.insert(0, get_system_message())
 
+        self.iteration_stats = []
+        if messages[-1].get('role') == 'user':
+            if Config.ROUTER_ENABLED:
+                answer = await self.answer_directly(messages)
+                if answer is not None:
+                    return answer
+            self.start_prefetch(messages[-1].get('content') or "")
+
         iteration = 0
         while iteration < max_iterations:
             iteration += 1
-            print(f"\n--- Iteration {iteration} ---")
+            self.log(f"\n--- Iteration {iteration} ---")
+
+            messages = self.context_window.fit(messages)
+
+            self.log("Waiting for LLM response...")
+            semaphore = asyncio.Semaphore(Config.MAX_CONCURRENT_TOOL_CALLS)
+            started = {}
 
-            messages = truncate_messages(messages, Config.MAX_MESSAGES)
+            def start_tool_call(tool_call) -> None:
+                started[tool_call.id] = asyncio.create_task(self.run_tool_call(tool_call, semaphore))
 
-            print("Waiting for LLM response...")
-            message = self.call_llm(messages)
+            message = await self.call_llm(messages, on_tool_call=start_tool_call)
+            stats = {"iteration": iteration, **self.last_llm_stats, "tool_calls": len(message.tool_calls or [])}
+            self.iteration_stats.append(stats)
+            self.log(
+                f"LLM: {stats['llm_seconds']:.2f}s, {stats['prompt_tokens']} prompt + "
+                f"{stats['completion_tokens']} completion tokens{' (estimated)' if stats.get('estimated') else ''}"
+            )
 
             messages.append({
                 "role": "assistant",
@@ -146,11 +473,11 @@ class AgenticMCPClient:
             })
 
             if message.tool_calls:
-                tool_results = await self.process_tool_calls(message)
+                tool_results = await self.process_tool_calls(message, started)
                 messages.extend(tool_results)
             else:
                 if is_incomplete_response(message.content):
-                    print("Response appears incomplete, prompting LLM to continue...")
+                    self.log("Response appears incomplete, prompting LLM to continue...")
                     messages.append({
                         "role": "user",
                         "content": "Please proceed with the action you mentioned and provide the specific data/answer."
@@ -159,22 +486,23 @@ class AgenticMCPClient:
 
                 return message.content if message.content else ""
 
-        print(f"\nReached maximum iterations ({max_iterations})")
+        self.log(f"\nReached maximum iterations ({max_iterations})")
         return "Maximum iterations reached without complete response."
 
     async def close(self):
         """Clean up resources."""
+        if self.connection is not None:
+            await self.connection.close()
         await self.exit_stack.aclose()
 
 
 async def main():
     client = AgenticMCPClient()
 
-    # Get server command from args or use default
-    server_script = sys.argv[1] if len(sys.argv) > 1 else "mcp_server.py"
-    command = f"python {server_script}"
+    # Server URL or script from args, else MCP_SERVER_URL, else spawn mcp_server.py
+    target = sys.argv[1] if len(sys.argv) > 1 else Config.MCP_SERVER_URL or "mcp_server.py"
 
-    await client.connect_to_mcp_server(command)
+    await client.connect(target)
 
     conversation_history = []
     print("\n=== MCP Agentic Client ===")
@@ -182,7 +510,7 @@ async def main():
 
     while True:
         try:
-            user_query = input("\nEnter your query: ").strip()
+            user_query = (await asyncio.to_thread(input, "\nEnter your query: ")).strip()
 
             if not user_query:
                 continue
@@ -197,7 +525,8 @@ async def main():
 
             response = await client.run_agentic_loop(conversation_history)
 
-            print(f"\n=== RESPONSE ===\n{response}")
+            if not Config.LLM_STREAM:
+                print(f"\n=== RESPONSE ===\n{response}")
 
             # Store original query in history (not enhanced version)
             conversation_history[-1] = {"role": "user", "content": user_query}
@@ -1,40 +1,141 @@
-import os
+import asyncio
 import logging
 import sys
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
+import anyio
 from mcp.server.fastmcp import FastMCP
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from config import Config
+from services.fred_service import FREDService
+from services.metrics import REGISTRY
 from tools.fred_tools import register_fred_tools
 
 # Configure logging
-LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
 logging.basicConfig(
-    level=getattr(logging, LOG_LEVEL),
+    level=getattr(logging, Config.LOG_LEVEL),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     stream=sys.stderr
 )
 logger = logging.getLogger(__name__)
 
-server_name = os.getenv('MCP_SERVER_NAME', 'weather-transfer-server')
-host = os.getenv('MCP_HOST', '0.0.0.0')
-port = int(os.getenv('MCP_PORT', '8000'))
-mcp = FastMCP(server_name, host=host, port=port)
+server_name = Config.MCP_SERVER_NAME
+host = Config.MCP_HOST
+port = Config.MCP_PORT
+
+background_tasks: list[asyncio.Task] | None = None
+
+@asynccontextmanager
+async def fred_client_lifespan(_server) -> AsyncIterator[None]:
+    """Keep the shared FRED HTTP client open while the server (or a session) is running.
+
+    The first time it is entered, background work starts: loading the WARMUP_SERIES,
+    harvesting and refreshing the series search index, crawling the category tree and
+    refreshing popular series when they publish.
+    """
+    global background_tasks
+    await FREDService.open_client()
+    if background_tasks is None:
+        background_tasks = []
+        if Config.WARMUP_SERIES:
+            background_tasks.append(asyncio.create_task(fred_service.warm_up(Config.WARMUP_SERIES)))
+        if fred_service.search_index is not None and Config.SEARCH_INDEX_HARVEST:
+            background_tasks.append(asyncio.create_task(fred_service.maintain(
+                fred_service.search_index, Config.SEARCH_INDEX_REFRESH_INTERVAL, fred_service.update_search_index
+            )))
+        if fred_service.release_calendar is not None:
+            background_tasks.append(asyncio.create_task(fred_service.watch_releases()))
+        if Config.CATEGORY_CRAWL_ENABLED:
+            background_tasks.append(asyncio.create_task(fred_service.maintain(
+                fred_service.category_tree, Config.CATEGORY_CRAWL_INTERVAL, fred_service.crawl_categories
+            )))
+    try:
+        yield
+    finally:
+        await FREDService.close_client()
+        if FREDService._client is None:
+            for task in background_tasks:
+                task.cancel()
+
+mcp = FastMCP(server_name, host=host, port=port, lifespan=fred_client_lifespan)
 
 logger.info("Registering weather tools...")
-register_fred_tools(mcp)
+fred_service = register_fred_tools(mcp)
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics(_request: Request) -> PlainTextResponse:
+    """Prometheus scrape endpoint for tool, upstream and cache metrics (HTTP transports only)."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+def with_fred_client(app: Starlette) -> Starlette:
+    """Hold the shared FRED HTTP client for the whole lifetime of an HTTP app.
+
+    FastMCP enters its lifespan once per session on the HTTP transports, so without
+    this the pool would be torn down whenever the last session disconnects.
+    """
+    app_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan(starlette_app: Starlette) -> AsyncIterator[None]:
+        async with fred_client_lifespan(mcp), app_lifespan(starlette_app):
+            yield
+
+    app.router.lifespan_context = lifespan
+    return app
+
+async def serve_http(app: Starlette) -> None:
+    """Serve an HTTP transport app with uvicorn."""
+    import uvicorn
+
+    config = uvicorn.Config(
+        with_fred_client(app),
+        host=mcp.settings.host,
+        port=mcp.settings.port,
+        log_level=mcp.settings.log_level.lower(),
+    )
+    await uvicorn.Server(config).serve()
+
+def create_worker_app() -> Starlette:
+    """Build the streamable-http app in a worker process (uvicorn app factory).
+
+    Workers are stateless, so any of them can serve any request and no sticky
+    routing is needed in front of them.
+    """
+    mcp.settings.stateless_http = True
+    return with_fred_client(mcp.streamable_http_app())
+
+def serve_workers(workers: int) -> None:
+    """Run `workers` streamable-http processes behind one port."""
+    import uvicorn
+
+    uvicorn.run(
+        "mcp_server:create_worker_app",
+        factory=True,
+        workers=workers,
+        host=mcp.settings.host,
+        port=mcp.settings.port,
+        log_level=mcp.settings.log_level.lower(),
+    )
 
 def main():
     """Initialize and run the MCP server."""
     logger.info(f"Starting MCP Server: {server_name}")
-    transport = os.getenv('MCP_TRANSPORT', 'stdio').lower()
+    transport = Config.MCP_TRANSPORT
     logger.info(f"Transport: {transport}")
 
     try:
         if transport == 'sse':
             logger.info(f"Server running in SSE mode on {host}:{port}")
-            mcp.run(transport="sse")
+            anyio.run(serve_http, mcp.sse_app())
+        elif transport == 'streamable-http' and Config.MCP_WORKERS > 1:
+            logger.info(f"Server running in Streamable HTTP mode on {host}:{port} with {Config.MCP_WORKERS} workers")
+            serve_workers(Config.MCP_WORKERS)
         elif transport == 'streamable-http':
             logger.info(f"Server running in Streamable HTTP mode on {host}:{port}")
-            mcp.run(transport="streamable-http")
+            anyio.run(serve_http, mcp.streamable_http_app())
         else:
             logger.info("Server running with stdio transport")
             mcp.run(transport='stdio')
@@ -1,24 +1,5 @@
 import json
-
-def truncate_messages(messages: list, max_messages: int = 20) -> list:
-    """Keep only recent messages while maintaining proper message structure."""
-    if len(messages) <= max_messages:
-        return messages
-
-    truncated = [messages[0]]
-    recent = messages[-(max_messages-1):]
-
-    # Find a safe starting point
-    start_idx = 0
-    for i, msg in enumerate(recent):
-        if msg.get('tool_calls'):
-            start_idx = i
-            break
-        if msg.get('role') == 'tool':
-            start_idx = i + 1
-
-    truncated.extend(recent[start_idx:])
-    return truncated
+from datetime import date
 
 def is_incomplete_response(message_content: str) -> bool:
     """Check if the LLM response indicates it will take more actions."""
@@ -71,3 +52,62 @@ def format_tool_result(result_text: str, tool_input: dict, max_length: int = 200
         if len(result_text) > max_length:
             return result_text[:max_length] + f"... (truncated from {len(result_text)} chars)"
         return result_text
+
+def detect_frequency(dates: list[str]) -> str | None:
+    """Return 'daily', 'weekly', 'monthly', 'quarterly' or 'annual' if ISO dates are evenly spaced."""
+    if len(dates) < 3:
+        return None
+    parsed = [date.fromisoformat(d) for d in dates]
+    steps = {(b - a).days for a, b in zip(parsed, parsed[1:])}
+    if steps == {1} or steps == {-1}:
+        return "daily"
+    if steps == {7} or steps == {-7}:
+        return "weekly"
+    if len({d.day for d in parsed}) != 1:
+        return None
+    month_steps = {(b.year - a.year) * 12 + b.month - a.month for a, b in zip(parsed, parsed[1:])}
+    return {1: "monthly", 3: "quarterly", 12: "annual"}.get(abs(next(iter(month_steps)))) \
+        if len(month_steps) == 1 else None
+
+def format_number(value: float) -> str:
+    text = repr(value)
+    return text[:-2] if text.endswith(".0") else text
+
+def encode_table(columns: list[str], dates: list[str], values: list[list]) -> str:
+    """Encode a date-aligned table compactly for the LLM.
+
+    A single gap-free, evenly spaced series becomes a start date, frequency and one
+    values array; anything else is header-once CSV.
+    """
+    frequency = detect_frequency(dates) if len(columns) == 1 else None
+    if frequency and all(value is not None for value in values[0]):
+        order = "newest first" if dates[0] > dates[-1] else "oldest first"
+        return (
+            f"{columns[0]}: {len(dates)} {frequency} values from {dates[0]} ({order})\n"
+            + ",".join(format_number(value) for value in values[0])
+        )
+
+    lines = [",".join(["date", *columns])]
+    for i, obs_date in enumerate(dates):
+        cells = ("" if column[i] is None else format_number(column[i]) for column in values)
+        lines.append(",".join([obs_date, *cells]))
+    return "\n".join(lines)
+
+def format_structured_result(table: dict, max_length: int = 2000) -> str:
+    """Render a structured observation table, keeping the most recent rows if it is too long."""
+    columns, dates, values = table["columns"], table["dates"], table["values"]
+    lines = [table["note"]] if table.get("note") else []
+
+    if dates:
+        encoded = encode_table(columns, dates, values)
+        if len(encoded) > max_length:
+            keep = max(int(len(dates) * max_length / len(encoded)) - 1, 1)
+            # Keep the most recent observations, whichever way the table is sorted
+            window = slice(0, keep) if dates[0] > dates[-1] else slice(len(dates) - keep, len(dates))
+            encoded = encode_table(columns, dates[window], [column[window] for column in values])
+            lines.append(f"(showing the {keep} most recent of {len(dates)} observations)")
+        lines.append(encoded)
+
+    if table.get("errors"):
+        lines.append("Errors: " + "; ".join(table["errors"]))
+    return "\n".join(lines)
@@ -0,0 +1,84 @@
+import re
+
+# Common ways of asking for a series, checked longest phrase first
+SERIES_ALIASES = {
+    "unemployment rate": "UNRATE",
+    "unemployment": "UNRATE",
+    "jobless rate": "UNRATE",
+    "core inflation": "CPILFESL",
+    "core cpi": "CPILFESL",
+    "inflation": "CPIAUCSL",
+    "consumer price index": "CPIAUCSL",
+    "cpi": "CPIAUCSL",
+    "core pce": "PCEPILFE",
+    "pce": "PCEPI",
+    "real gdp": "GDPC1",
+    "gdp": "GDP",
+    "gross domestic product": "GDP",
+    "federal funds rate": "FEDFUNDS",
+    "fed funds": "FEDFUNDS",
+    "interest rate": "FEDFUNDS",
+    "10-year treasury": "DGS10",
+    "10 year treasury": "DGS10",
+    "2-year treasury": "DGS2",
+    "2 year treasury": "DGS2",
+    "yield curve": "T10Y2Y",
+    "mortgage rate": "MORTGAGE30US",
+    "nonfarm payrolls": "PAYEMS",
+    "payrolls": "PAYEMS",
+    "jobless claims": "ICSA",
+    "initial claims": "ICSA",
+    "housing starts": "HOUST",
+    "retail sales": "RSAFS",
+    "industrial production": "INDPRO",
+    "consumer sentiment": "UMCSENT",
+    "money supply": "M2SL",
+    "m2": "M2SL",
+    "s&p 500": "SP500",
+    "oil price": "DCOILWTICO",
+    "crude oil": "DCOILWTICO",
+}
+
+# Plurals count too ("mortgage rates")
+ALIAS_PATTERNS = [
+    (phrase, re.compile(rf"(?<![\w-]){re.escape(phrase)}s?(?![\w-])"), series_id)
+    for phrase, series_id in sorted(SERIES_ALIASES.items(), key=lambda item: -len(item[0]))
+]
+SERIES_ID_TOKEN = re.compile(r"\b[A-Za-z][A-Za-z0-9]{1,}\b")
+
+
+def strip_aliases(text: str) -> tuple[str, list[tuple[str, str]]]:
+    """Remove alias phrases from lower-case text, longest first.
+
+    Returns the text that is left and the (phrase, series_id) pairs found.
+    """
+    found = []
+    for phrase, pattern, series_id in ALIAS_PATTERNS:
+        text, count = pattern.subn(" ", text)
+        if count:
+            found.append((phrase, series_id))
+    return text, found
+
+
+def resolve_series(query: str, recent: list[str] | None = None, max_series: int = 3,
+                   follow_up: bool = True) -> list[str]:
+    """Guess which series a query is about, most likely first.
+
+    Alias phrases are matched longest first, so "core inflation" is not also read
+    as "inflation". Series IDs named directly are recognized when they are alias
+    targets or were used earlier in the session. With `follow_up`, a query that
+    names nothing (e.g. "and a year ago?") resolves to the last series used.
+    """
+    recent = recent or []
+    text, aliases = strip_aliases(query.lower())
+    found = list(dict.fromkeys(series_id for _, series_id in aliases))
+
+    known = set(SERIES_ALIASES.values()) | set(recent)
+    for token in SERIES_ID_TOKEN.findall(text):
+        series_id = token.upper()
+        if series_id in known and series_id not in found:
+            found.append(series_id)
+
+    if not found and recent and follow_up:
+        found.append(recent[-1])
+    return found[:max_series]
@@ -1,3 +1,4 @@
+import json
 from datetime import datetime
 
 def get_system_message() -> dict:
@@ -11,6 +12,13 @@ def get_system_message() -> dict:
             "3. When using get_series_observations:\n"
             "   - For 'current' data: Set limit=10 and sort_order='desc' to get the 10 most recent values\n"
             "   - For historical data: Use appropriate observation_start/observation_end dates\n"
+            "   - For long-range trends, set frequency (e.g. 'a') or max_points (e.g. 120) instead of raising limit\n"
+            "   - To compare several series, call get_multiple_series_observations once instead of one call per series\n"
+            "   - For growth rates, averages, extremes or correlations, use get_percent_change, get_rolling_mean,\n"
+            "     get_series_summary or get_series_correlation instead of computing them from raw observations\n"
+            "   - For how data looked before revisions (e.g. GDP as first reported), use get_series_vintages\n"
+            "   - To find series by topic, browse_categories shows several levels of the category tree in one call\n"
+            "     and get_category_series lists a category's series\n"
             "4. ALWAYS report the observation date along with the value\n"
             "5. The most recent observation in the tool results IS the current value\n"
             "6. Never answer with information from your training data when asked about current values\n\n"
@@ -19,6 +27,17 @@ def get_system_message() -> dict:
         )
     }
 
+def get_routed_answer_message(question: str, tool_input: dict, data: str) -> dict:
+    """The user turn for a question whose data the client fetched itself, to be answered without tools."""
+    return {
+        "role": "user",
+        "content": (
+            f"{question}\n\n"
+            f"Data fetched with get_series_observations({json.dumps(tool_input)}):\n{data}\n\n"
+            "Answer the question from this data in a few sentences, reporting observation dates with values."
+        )
+    }
+
 def enhance_temporal_query(query: str) -> str:
     """Add temporal context hints to queries about current data."""
     temporal_keywords = ['current', 'latest', 'recent', 'now', 'today']
@@ -0,0 +1,185 @@
+import re
+from calendar import monthrange
+from datetime import date, timedelta
+from typing import TypedDict
+
+from message_utils import format_number
+from prefetch import resolve_series, strip_aliases
+
+# Anything asking for more than values read off one series goes through the agentic loop
+ANALYTIC_WORDS = re.compile(
+    r"\b(compar\w*|vs|versus|against|correlat\w*|relationship|chang\w*|grow\w*|growth|increas\w*|"
+    r"decreas\w*|ris(e|en|ing)|f(a|e)ll\w*|trend\w*|averag\w*|mean|median|why|how come|explain\w*|"
+    r"caus\w*|impact\w*|effect\w*|forecast\w*|predict\w*|expect\w*|project\w*|revis\w*|vintage\w*|"
+    r"reported|percent(age)? change|rolling|highest|lowest|peak\w*|max\w*|min\w*|record|chart|plot|graph|"
+    r"each|every|per capita|adjust\w*|real terms|breakdown|should|will|would|could)\b"
+)
+# Time references the router does not resolve itself
+UNSUPPORTED_TIME = re.compile(
+    r"\b(ago|last (year|month|week|quarter|time)|previous\w*|prior|yesterday|until|before|after|through|thru|"
+    r"up to|by|decade|century|\d{4}s|q[1-4]|quarter\w*|h[12]|fiscal|pandemic|recession|crisis|covid|war)\b"
+)
+LATEST_WORDS = re.compile(r"\b(current(ly)?|latest|most recent|now|today|at present|presently)\b")
+WHAT_IS = re.compile(r"^\s*(what('s| is| was)|whats|how (high|low) is)\b")
+# Most words a latest-value question is expected to have; longer ones usually want more
+MAX_LATEST_WORDS = 14
+
+MONTHS = {"jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6, "jul": 7, "aug": 8, "sep": 9, "sept": 9,
+          "oct": 10, "nov": 11, "dec": 12}
+DATE_PATTERN = re.compile(
+    r"\b(?:(?P<month_name>jan|feb|mar|apr|may|jun|jul|aug|sept?|oct|nov|dec)[a-z]*\.?\s+)?"
+    r"(?P<year>(?:18|19|20)\d{2})(?:-(?P<month>\d{1,2})(?:-(?P<day>\d{1,2}))?)?\b"
+)
+RANGE_START_WORDS = re.compile(r"\b(since|from|starting( in)?)\s*$")
+NUMBER_WORDS = {"two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8, "nine": 9,
+                "ten": 10, "twelve": 12, "twenty": 20}
+RELATIVE_PERIOD = re.compile(
+    rf"\b(last|past)\s+(\d+|{'|'.join(NUMBER_WORDS)})\s+(year|month|week|day)s?\b"
+)
+PERIOD_DAYS = {"year": 365, "month": 31, "week": 7, "day": 1}
+
+# Price indexes whose "inflation" is their percent change from a year earlier
+PRICE_INDEXES = {"CPIAUCSL", "CPILFESL", "PCEPI", "PCEPILFE"}
+INFLATION_WORDS = re.compile(r"\binflation\b")
+HINT = re.compile(r"\s*\[System hint:[^\]]*\]\s*$")
+
+# Aliases that name a family of series rather than one ("interest rate" could be any of dozens)
+BROAD_ALIASES = {"interest rate", "pce"}
+# Words a routed question may have besides its series, dates and latest-value words. Any other
+# word ("in California", "for women", "of China", "for food") asks about a narrower series.
+FILLER_WORDS = {
+    "a", "an", "the", "of", "for", "in", "on", "at", "as", "to", "from", "since", "between", "and", "over",
+    "during", "starting", "what", "what's", "whats", "is", "was", "are", "were", "it", "it's", "its", "s",
+    "show", "give", "tell", "get", "find", "fetch", "pull", "look", "up", "me", "i", "want", "need", "know",
+    "see", "do", "does", "you", "can", "please", "fred", "rate", "rates", "level", "levels", "value", "values",
+    "number", "numbers", "figure", "figures", "reading", "readings", "data", "index", "series", "price",
+    "prices", "yield", "yields", "us", "u.s", "usa", "america", "american", "united", "states", "national",
+}
+WORD = re.compile(r"[a-z0-9]+(?:[.'&-][a-z0-9]+)*")
+
+
+class Route(TypedDict):
+    """A question answerable with one get_series_observations call."""
+    kind: str  # "latest", or "range" for a date or date range
+    series_id: str
+    tool_input: dict
+
+
+def parse_date(match: re.Match) -> tuple[date, date] | None:
+    """First and last day of the period a date expression names (a year, a month or a day)."""
+    year = int(match["year"])
+    month = MONTHS[match["month_name"]] if match["month_name"] else None
+    if match["month"]:
+        if month is not None:
+            return None
+        month = int(match["month"])
+    try:
+        if match["day"]:
+            day = date(year, month, int(match["day"]))
+            return day, day
+        if month is not None:
+            return date(year, month, 1), date(year, month, monthrange(year, month)[1])
+        return date(year, 1, 1), date(year, 12, 31)
+    except ValueError:
+        return None
+
+
+def parse_period(text: str, today: date | None = None) -> tuple[str | None, str | None] | None:
+    """(observation_start, observation_end) named by a question, (None, None) when it names no
+    dates, or None when its dates are not ones the router understands."""
+    today = today or date.today()
+    relative = RELATIVE_PERIOD.search(text)
+    matches = list(DATE_PATTERN.finditer(text))
+    if relative:
+        if matches:
+            return None
+        count = relative[2]
+        count = int(count) if count.isdigit() else NUMBER_WORDS[count]
+        return (today - timedelta(days=count * PERIOD_DAYS[relative[3]])).isoformat(), None
+    if not matches:
+        return None, None
+    periods = [parse_date(match) for match in matches]
+    if None in periods or len(periods) > 2:
+        return None
+    if len(periods) == 2:
+        start, end = periods[0][0], periods[1][1]
+        return (start.isoformat(), end.isoformat()) if start <= end else None
+    start, end = periods[0]
+    if RANGE_START_WORDS.search(text[:matches[0].start()]):
+        return start.isoformat(), None
+    return start.isoformat(), end.isoformat()
+
+
+def leftover_words(text: str, series_id: str) -> list[str]:
+    """Words of a question, with its series aliases already removed, that are not the series ID,
+    a date, a latest-value word or filler."""
+    for pattern in (WHAT_IS, DATE_PATTERN, RELATIVE_PERIOD, LATEST_WORDS):
+        text = pattern.sub(" ", text)
+    return [word for word in WORD.findall(text) if word not in FILLER_WORDS and word.upper() != series_id]
+
+
+def route_query(query: str, recent: list[str] | None = None, max_points: int = 120,
+                today: date | None = None) -> Route | None:
+    """Route a simple question about one series straight to a tool call, or None to use the agentic loop.
+
+    Only questions that name exactly one series (by alias or ID) are routed: its
+    latest value ("what's the current unemployment rate?"), or its values on a
+    date or over a date range ("CPI in March 2020", "10-year treasury since 2019",
+    "payrolls from 2019 to 2021", "mortgage rates over the past 2 years").
+    Comparisons, calculations, relative dates like "a year ago", follow-ups that
+    do not name a series, broad aliases like "interest rate" and questions with
+    any other content word ("unemployment rate in California", "GDP of China")
+    are left to the model.
+    """
+    text = HINT.sub("", query).strip().lower()
+    if ANALYTIC_WORDS.search(text) or UNSUPPORTED_TIME.search(text):
+        return None
+    rest, aliases = strip_aliases(text)
+    if any(phrase in BROAD_ALIASES for phrase, _ in aliases):
+        return None
+    series = resolve_series(text, recent, max_series=2, follow_up=False)
+    if len(series) != 1 or leftover_words(rest, series[0]):
+        return None
+    series_id = series[0]
+    period = parse_period(text, today)
+    if period is None:
+        return None
+
+    tool_input = {"series_id": series_id}
+    if series_id in PRICE_INDEXES and INFLATION_WORDS.search(text):
+        tool_input["units"] = "pc1"
+    start, end = period
+    if start is None:
+        if not (LATEST_WORDS.search(text) or WHAT_IS.search(text)) or len(text.split()) > MAX_LATEST_WORDS:
+            return None
+        tool_input.update(limit=10, sort_order="desc")
+        return {"kind": "latest", "series_id": series_id, "tool_input": tool_input}
+
+    tool_input["observation_start"] = start
+    if end is not None:
+        tool_input["observation_end"] = end
+    tool_input["max_points"] = max_points
+    return {"kind": "range", "series_id": series_id, "tool_input": tool_input}
+
+
+def format_latest(route: Route, table: dict, info_text: str) -> str | None:
+    """Answer a latest-value question from the observations and series info, or None if they are incomplete."""
+    fields = dict(line.split(": ", 1) for line in info_text.splitlines() if ": " in line)
+    title, units = fields.get("Title"), fields.get("Units")
+    points = [(obs_date, value) for obs_date, value in zip(table["dates"], table["values"][0]) if value is not None]
+    if not title or not units or not points:
+        return None
+
+    def describe(value: float) -> str:
+        if route["tool_input"].get("units") == "pc1":
+            return f"{format_number(round(value, 2))}% from a year earlier"
+        if units.lower().startswith("percent"):
+            return f"{format_number(value)}%"
+        return f"{format_number(value)} ({units})"
+
+    (latest_date, latest), *earlier = points
+    answer = f"{title} ({route['series_id']}): {describe(latest)} as of {latest_date}"
+    if earlier:
+        previous_date, previous = earlier[0]
+        answer += f", after {describe(previous)} as of {previous_date}"
+    return answer + "."
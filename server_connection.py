@@ -0,0 +1,144 @@
+import asyncio
+import logging
+from datetime import timedelta
+
+import anyio
+import httpx
+from mcp import ClientSession
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# What a request fails with when the transport under its session has gone away
+TRANSPORT_ERRORS = (httpx.TransportError, anyio.ClosedResourceError, anyio.BrokenResourceError,
+                    anyio.EndOfStream, ConnectionError)
+
+
+def is_connection_lost(error: BaseException) -> bool:
+    if isinstance(error, McpError):
+        return error.error.code == CONNECTION_CLOSED
+    return isinstance(error, TRANSPORT_ERRORS)
+
+
+class ServerConnection:
+    """A client session to an already-running MCP server, re-opened when it drops.
+
+    Uses streamable HTTP, or SSE for URLs ending in /sse. The transport and session
+    live in a task of their own, so one session can be shared by concurrent
+    conversations and any of them can replace it. A request that fails because the
+    connection was lost is sent once more on a fresh session; the FRED tools only
+    read, so repeating one is safe.
+    """
+
+    def __init__(self, url: str, attempts: int = Config.MCP_RECONNECT_ATTEMPTS,
+                 backoff: float = Config.MCP_RECONNECT_BACKOFF, timeout: float = Config.MCP_REQUEST_TIMEOUT):
+        self.url = url
+        self.attempts = attempts
+        self.backoff = backoff
+        self.timeout = timeout
+        self.session: ClientSession | None = None
+        # Sessions opened so far; more than one means the connection was re-established
+        self.connects = 0
+        self._lock = asyncio.Lock()
+        self._holder: asyncio.Task | None = None
+        self._closing: asyncio.Event | None = None
+
+    def _transport(self):
+        if self.url.rstrip("/").endswith("/sse"):
+            from mcp.client.sse import sse_client
+            return sse_client(self.url)
+        from mcp.client.streamable_http import streamablehttp_client
+        return streamablehttp_client(self.url)
+
+    async def _hold(self, ready: asyncio.Future, closing: asyncio.Event) -> None:
+        """Keep a transport and session open until `closing` is set or the transport fails."""
+        session = None
+        try:
+            async with self._transport() as streams:
+                async with ClientSession(streams[0], streams[1],
+                                         read_timeout_seconds=timedelta(seconds=self.timeout)) as session:
+                    await session.initialize()
+                    ready.set_result(session)
+                    await closing.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            elif not closing.is_set():
+                logger.warning("MCP connection to %s lost: %s", self.url, e)
+        finally:
+            if session is not None and self.session is session:
+                self.session = None
+
+    async def _open(self) -> ClientSession:
+        """Open a session, retrying with exponential backoff."""
+        for attempt in range(self.attempts + 1):
+            ready = asyncio.get_running_loop().create_future()
+            closing = asyncio.Event()
+            holder = asyncio.create_task(self._hold(ready, closing))
+            try:
+                session = await ready
+            except Exception as e:
+                await holder
+                if attempt == self.attempts:
+                    raise
+                delay = self.backoff * 2 ** attempt
+                logger.warning("Could not connect to %s (%s); retrying in %.1fs", self.url, e, delay)
+                await asyncio.sleep(delay)
+                continue
+            self.session, self._holder, self._closing = session, holder, closing
+            self.connects += 1
+            return session
+
+    async def _shut(self) -> None:
+        if self._closing is not None:
+            self._closing.set()
+            await asyncio.wait([self._holder], timeout=5)
+        self.session = self._holder = self._closing = None
+
+    async def connect(self) -> ClientSession:
+        """The current session, opening one if there is none."""
+        async with self._lock:
+            if self.session is None:
+                await self._shut()
+                await self._open()
+            return self.session
+
+    async def reconnect(self, stale: ClientSession) -> ClientSession:
+        """Replace `stale` with a new session, unless another caller already has."""
+        async with self._lock:
+            if self.session is None or self.session is stale:
+                await self._shut()
+                await self._open()
+            return self.session
+
+    async def _call(self, session: ClientSession, holder: asyncio.Task, method: str, args: tuple, kwargs: dict):
+        # A transport that fails can take its session down without answering requests in flight
+        call = asyncio.ensure_future(getattr(session, method)(*args, **kwargs))
+        try:
+            await asyncio.wait([call, holder], return_when=asyncio.FIRST_COMPLETED)
+        except BaseException:
+            call.cancel()
+            raise
+        if not call.done():
+            call.cancel()
+            raise ConnectionError(f"MCP connection to {self.url} closed")
+        return call.result()
+
+    async def request(self, method: str, *args, **kwargs):
+        """Call a ClientSession method, re-sending it once on a new session if the connection was lost."""
+        session = await self.connect()
+        try:
+            return await self._call(session, self._holder, method, args, kwargs)
+        except Exception as e:
+            if not is_connection_lost(e):
+                raise
+            logger.warning("MCP connection to %s lost during %s (%s); reconnecting", self.url, method, e)
+        session = await self.reconnect(session)
+        return await self._call(session, self._holder, method, args, kwargs)
+
+    async def close(self) -> None:
+        async with self._lock:
+            await self._shut()
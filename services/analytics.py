@@ -0,0 +1,171 @@
+import math
+from array import array
+from bisect import bisect_right
+from datetime import date
+from typing import Any
+
+from services.series_data import SeriesData
+
+# How far the "one year earlier" observation may fall short of the exact date (weekends, weekly series)
+YOY_TOLERANCE_DAYS = 7
+
+
+def percent_change(data: SeriesData, periods: int = 1) -> SeriesData:
+    """Percent change over `periods` observations of an ascending, NaN-free series."""
+    ordinals = array("l")
+    values = array("d")
+    for i in range(periods, len(data)):
+        previous = data.values[i - periods]
+        if previous == 0:
+            continue
+        ordinals.append(data.ordinals[i])
+        values.append((data.values[i] / previous - 1.0) * 100.0)
+    return SeriesData(data.series_id, ordinals, values)
+
+
+def one_year_earlier(ordinal: int) -> int:
+    day = date.fromordinal(ordinal)
+    try:
+        return day.replace(year=day.year - 1).toordinal()
+    except ValueError:
+        # Feb 29
+        return day.replace(year=day.year - 1, day=28).toordinal()
+
+
+def year_over_year(data: SeriesData) -> SeriesData:
+    """Percent change against the observation one year earlier, for any frequency."""
+    ordinals = array("l")
+    values = array("d")
+    for i in range(len(data)):
+        target = one_year_earlier(data.ordinals[i])
+        j = bisect_right(data.ordinals, target, 0, i) - 1
+        if j < 0 or data.ordinals[j] < target - YOY_TOLERANCE_DAYS or data.values[j] == 0:
+            continue
+        ordinals.append(data.ordinals[i])
+        values.append((data.values[i] / data.values[j] - 1.0) * 100.0)
+    return SeriesData(data.series_id, ordinals, values)
+
+
+def rolling_mean(data: SeriesData, window: int) -> SeriesData:
+    """Trailing mean over `window` observations."""
+    ordinals = array("l")
+    values = array("d")
+    total = 0.0
+    for i, value in enumerate(data.values):
+        total += value
+        if i >= window:
+            total -= data.values[i - window]
+        if i >= window - 1:
+            ordinals.append(data.ordinals[i])
+            values.append(total / window)
+    return SeriesData(data.series_id, ordinals, values)
+
+
+def summarize(data: SeriesData) -> dict[str, Any]:
+    """Count, first/latest, min/max, mean and the largest peak-to-trough decline."""
+    n = len(data)
+    min_i = min(range(n), key=data.values.__getitem__)
+    max_i = max(range(n), key=data.values.__getitem__)
+
+    peak_i = 0
+    drawdown = 0.0
+    drawdown_peak_i = drawdown_trough_i = 0
+    for i in range(n):
+        if data.values[i] > data.values[peak_i]:
+            peak_i = i
+        decline = data.values[peak_i] - data.values[i]
+        if decline > drawdown:
+            drawdown, drawdown_peak_i, drawdown_trough_i = decline, peak_i, i
+
+    peak_value = data.values[drawdown_peak_i]
+    return {
+        "count": n,
+        "first": (data.date_at(0), data.values[0]),
+        "latest": (data.date_at(n - 1), data.values[n - 1]),
+        "min": (data.date_at(min_i), data.values[min_i]),
+        "max": (data.date_at(max_i), data.values[max_i]),
+        "mean": math.fsum(data.values) / n,
+        "max_drawdown": drawdown,
+        "max_drawdown_pct": drawdown / peak_value * 100.0 if peak_value > 0 else None,
+        "max_drawdown_peak": data.date_at(drawdown_peak_i),
+        "max_drawdown_trough": data.date_at(drawdown_trough_i),
+    }
+
+
+def correlation(a: SeriesData, b: SeriesData) -> tuple[float | None, int]:
+    """Pearson correlation of two series over their common dates, with the number of pairs used."""
+    b_index = {ordinal: i for i, ordinal in enumerate(b.ordinals)}
+    xs = array("d")
+    ys = array("d")
+    for i, ordinal in enumerate(a.ordinals):
+        j = b_index.get(ordinal)
+        if j is not None:
+            xs.append(a.values[i])
+            ys.append(b.values[j])
+
+    n = len(xs)
+    if n < 3:
+        return None, n
+    mean_x = math.fsum(xs) / n
+    mean_y = math.fsum(ys) / n
+    cov = math.fsum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    var_x = math.fsum((x - mean_x) ** 2 for x in xs)
+    var_y = math.fsum((y - mean_y) ** 2 for y in ys)
+    if var_x == 0 or var_y == 0:
+        return None, n
+    return cov / math.sqrt(var_x * var_y), n
+
+
+def lttb(data: SeriesData, threshold: int) -> SeriesData:
+    """Largest-Triangle-Three-Buckets downsampling to at most `threshold` points.
+
+    Keeps the first and last points and, from each bucket in between, the point that
+    forms the largest triangle with its neighbours, so peaks and turning points survive.
+    """
+    n = len(data)
+    if threshold >= n or threshold < 3:
+        return data
+    xs, ys = data.ordinals, data.values
+    keep = [0]
+    bucket_size = (n - 2) / (threshold - 2)
+    a = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+        # Average of the next bucket (just the last point for the final bucket)
+        next_start, next_end = end, min(int((bucket + 2) * bucket_size) + 1, n)
+        if next_start >= n - 1:
+            next_start, next_end = n - 1, n
+        count = next_end - next_start
+        avg_x = math.fsum(xs[next_start:next_end]) / count
+        avg_y = math.fsum(ys[next_start:next_end]) / count
+
+        best, best_area = start, -1.0
+        for i in range(start, end):
+            area = abs((xs[a] - avg_x) * (ys[i] - ys[a]) - (xs[a] - xs[i]) * (avg_y - ys[a]))
+            if area > best_area:
+                best, best_area = i, area
+        keep.append(best)
+        a = best
+    keep.append(n - 1)
+    return SeriesData(data.series_id, array("l", (xs[i] for i in keep)), array("d", (ys[i] for i in keep)))
+
+
+def min_max_buckets(data: SeriesData, max_points: int) -> SeriesData:
+    """Downsample to at most `max_points` by keeping each bucket's minimum and maximum, in date order."""
+    n = len(data)
+    if max_points >= n or max_points < 2:
+        return data
+    buckets = max_points // 2
+    keep = []
+    for bucket in range(buckets):
+        start, end = bucket * n // buckets, (bucket + 1) * n // buckets
+        low = min(range(start, end), key=data.values.__getitem__)
+        high = max(range(start, end), key=data.values.__getitem__)
+        keep.extend(sorted({low, high}))
+    return SeriesData(
+        data.series_id, array("l", (data.ordinals[i] for i in keep)), array("d", (data.values[i] for i in keep))
+    )
+
+
+DOWNSAMPLERS = {"lttb": lttb, "minmax": min_max_buckets}
@@ -0,0 +1,90 @@
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+
+class TTLCache:
+    """Bounded in-process cache with per-entry TTLs, LRU eviction and single-flight fetches.
+
+    Concurrent `get_or_fetch` calls for the same key share one in-flight fetch, so
+    N identical requests cost a single upstream call.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return a fresh cached value, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """Store a value for `ttl` seconds, evicting the least recently used entries."""
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    async def get_or_fetch(self, key: Hashable, ttl: float | Callable[[Any], float],
+                           fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for `key`, fetching it once if missing.
+
+        `ttl` may be a function of the fetched value. None results are shared with
+        concurrent callers but never stored.
+        """
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+
+            def _done(finished: asyncio.Task) -> None:
+                self._inflight.pop(key, None)
+                if not finished.cancelled() and finished.exception() is None and finished.result() is not None:
+                    value = finished.result()
+                    self.set(key, value, ttl(value) if callable(ttl) else ttl)
+
+            task.add_done_callback(_done)
+
+        # Shield so one caller being cancelled does not cancel the shared fetch
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters and current size."""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+        }
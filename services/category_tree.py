@@ -0,0 +1,161 @@
+import time
+from typing import Any
+
+from services.sqlite_store import SQLiteStore
+
+ROOT_CATEGORY = 0
+
+
+class CategoryTree(SQLiteStore):
+    """The FRED category hierarchy and each category's series, cached in SQLite.
+
+    Every category records when its children and its series were last crawled, so
+    a crawl can stop at any point and resume, and a refresh only revisits
+    categories older than a cutoff. Its lease lets one process crawl.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS categories (
+            category_id INTEGER PRIMARY KEY,
+            parent_id INTEGER,
+            name TEXT NOT NULL,
+            depth INTEGER NOT NULL,
+            children_at REAL,
+            series_at REAL,
+            series_count INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS categories_parent ON categories (parent_id);
+        CREATE TABLE IF NOT EXISTS category_series (
+            category_id INTEGER NOT NULL,
+            series_id TEXT NOT NULL,
+            title TEXT NOT NULL,
+            frequency TEXT NOT NULL,
+            units TEXT NOT NULL,
+            popularity INTEGER NOT NULL,
+            PRIMARY KEY (category_id, series_id)
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO categories (category_id, parent_id, name, depth) VALUES (?, NULL, 'Categories', 0)",
+                (ROOT_CATEGORY,)
+            )
+
+    def get_category(self, category_id: int) -> dict[str, Any] | None:
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT category_id, parent_id, name, depth, children_at, series_at, series_count "
+                "FROM categories WHERE category_id = ?", (category_id,)
+            )
+            row = cursor.fetchone()
+            columns = [description[0] for description in cursor.description]
+        return dict(zip(columns, row)) if row else None
+
+    def add_category(self, category_id: int, name: str, parent_id: int | None) -> None:
+        """Record a category reached directly rather than through its parent."""
+        with self._lock, self._conn:
+            parent = self._conn.execute(
+                "SELECT depth FROM categories WHERE category_id = ?", (parent_id,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT INTO categories (category_id, parent_id, name, depth) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(category_id) DO UPDATE SET name = excluded.name, parent_id = excluded.parent_id",
+                (category_id, parent_id, name, parent[0] + 1 if parent else 1)
+            )
+
+    def set_children(self, category_id: int, children: list[dict[str, Any]]) -> None:
+        """Replace a category's children; children FRED no longer lists are dropped with their subtrees."""
+        child_ids = [int(child["id"]) for child in children]
+        with self._lock, self._conn:
+            depth = self._conn.execute(
+                "SELECT depth FROM categories WHERE category_id = ?", (category_id,)
+            ).fetchone()[0]
+            removed = [
+                row[0] for row in self._conn.execute(
+                    "WITH RECURSIVE gone(id) AS ("
+                    f" SELECT category_id FROM categories WHERE parent_id = ?"
+                    f" AND category_id NOT IN ({','.join('?' * len(child_ids)) or 'NULL'})"
+                    " UNION SELECT c.category_id FROM categories c JOIN gone ON c.parent_id = gone.id"
+                    ") SELECT id FROM gone",
+                    (category_id, *child_ids)
+                )
+            ]
+            self._conn.executemany("DELETE FROM categories WHERE category_id = ?", ((cid,) for cid in removed))
+            self._conn.executemany("DELETE FROM category_series WHERE category_id = ?", ((cid,) for cid in removed))
+            self._conn.executemany(
+                "INSERT INTO categories (category_id, parent_id, name, depth) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(category_id) DO UPDATE SET name = excluded.name, parent_id = excluded.parent_id, "
+                "depth = excluded.depth",
+                ((int(child["id"]), category_id, child.get("name", ""), depth + 1) for child in children)
+            )
+            self._conn.execute(
+                "UPDATE categories SET children_at = ? WHERE category_id = ?", (time.time(), category_id)
+            )
+
+    def set_series(self, category_id: int, records: list[dict[str, Any]]) -> None:
+        """Replace the series listed under a category with FRED's category/series records."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM category_series WHERE category_id = ?", (category_id,))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO category_series VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (category_id, record["id"], record.get("title", ""), record.get("frequency", ""),
+                     record.get("units", ""), int(record.get("popularity") or 0))
+                    for record in records
+                )
+            )
+            self._conn.execute(
+                "UPDATE categories SET series_at = ?, series_count = ? WHERE category_id = ?",
+                (time.time(), len(records), category_id)
+            )
+
+    def pending(self, stale_before: float, limit: int, exclude: set[int] = frozenset()) -> list[int]:
+        """Categories never crawled or crawled before `stale_before`, shallowest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT category_id FROM categories "
+                "WHERE children_at IS NULL OR children_at < ? OR series_at IS NULL OR series_at < ? "
+                "ORDER BY depth, category_id LIMIT ?",
+                (stale_before, stale_before, limit + len(exclude))
+            ).fetchall()
+        return [row[0] for row in rows if row[0] not in exclude][:limit]
+
+    def subtree(self, category_id: int, depth: int) -> list[dict[str, Any]]:
+        """The category and its descendants down to `depth` levels, in depth-first order."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "WITH RECURSIVE tree(category_id, parent_id, name, level, series_count, children_at, path) AS ("
+                " SELECT category_id, parent_id, name, 0, series_count, children_at, printf('%08d', 0)"
+                " FROM categories WHERE category_id = ?"
+                " UNION ALL SELECT c.category_id, c.parent_id, c.name, tree.level + 1, c.series_count,"
+                " c.children_at, tree.path || '/' || printf('%08d', c.category_id)"
+                " FROM categories c JOIN tree ON c.parent_id = tree.category_id WHERE tree.level < ?"
+                ") SELECT category_id, parent_id, name, level, series_count, children_at FROM tree ORDER BY path",
+                (category_id, depth)
+            )
+            columns = [description[0] for description in cursor.description]
+            rows = cursor.fetchall()
+        return [dict(zip(columns, row)) for row in rows]
+
+    def series(self, category_id: int, limit: int, offset: int = 0) -> list[dict[str, Any]]:
+        """A category's series, most popular first."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT series_id, title, frequency, units, popularity FROM category_series "
+                "WHERE category_id = ? ORDER BY popularity DESC, series_id LIMIT ? OFFSET ?",
+                (category_id, limit, offset)
+            )
+            columns = [description[0] for description in cursor.description]
+            rows = cursor.fetchall()
+        return [dict(zip(columns, row)) for row in rows]
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            categories, crawled = self._conn.execute(
+                "SELECT COUNT(*), COUNT(children_at) FROM categories"
+            ).fetchone()
+            series = self._conn.execute("SELECT COUNT(*) FROM category_series").fetchone()[0]
+        return {"categories": categories, "crawled": crawled, "series": series}
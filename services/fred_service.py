@@ -1,54 +1,933 @@
-from typing import Any
+from typing import Any, TypeVar
+import asyncio
+from collections import Counter
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import aclosing, asynccontextmanager
+from datetime import date, datetime, timedelta
+import importlib.util
+import json
+import logging
+import time
 import httpx
-from dotenv import load_dotenv
 import os
+import socket
 
-load_dotenv()
+from config import Config
+from services import analytics
+from services.cache import TTLCache
+from services.metrics import SEARCH_QUERIES, UPSTREAM_BYTES, UPSTREAM_DURATION, UPSTREAM_REQUESTS, span
+from services.observation_store import ObservationStore
+from services.observation_stream import decode_observations
+from services.category_tree import CategoryTree
+from services.release_calendar import FRED_TIMEZONE, ReleaseCalendar
+from services.search_index import SeriesSearchIndex
+from services.vintage_store import EARLIEST_REALTIME, LATEST_REALTIME, VintageStore
+from services.rate_limiter import RateLimiter, background_priority, backoff_delay, parse_retry_after
+from services.series_data import SeriesData, SeriesTable, build_table, format_value
+from services.shared_state import SharedState
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# series/observations transformations FRED applies server-side
+OBSERVATION_UNITS = {"lin", "chg", "ch1", "pch", "pc1", "pca", "cch", "cca", "log"}
+AGGREGATION_METHODS = {"avg", "sum", "eop"}
+
+# series/updates (in FRED's own time zone) only reaches back two weeks
+SERIES_UPDATES_WINDOW = timedelta(days=14)
+
+# series/observations returns at most this many rows per request
+OBSERVATIONS_PAGE_SIZE = 100000
+# ALFRED output types answered from the vintage store (2, every value of every vintage, is not)
+VINTAGE_OUTPUT_TYPES = {1, 3, 4}
+
+# Most categories shown by one browse_categories call
+MAX_TREE_NODES = 300
+
+# How long one worker may hold a fetch the other workers wait on, and how often they check on it
+FETCH_LEASE_SECONDS = 120.0
+FETCH_LEASE_POLL = 0.1
+
+class FREDAPIError(Exception):
+    """Raised when a FRED request fails after retries or is rejected outright."""
+
+    def __init__(self, message: str, status_code: int | None = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+    @property
+    def retryable(self) -> bool:
+        return self.status_code is None or self.status_code == 429 or self.status_code >= 500
+
+    @classmethod
+    def from_response(cls, endpoint: str, response: httpx.Response) -> "FREDAPIError":
+        """Build an error carrying FRED's own error_message when the body has one."""
+        try:
+            detail = response.json().get("error_message", response.reason_phrase)
+        except ValueError:
+            detail = response.reason_phrase
+        return cls(f"FRED API error {response.status_code} for {endpoint}: {detail}", response.status_code)
 
 class FREDService:
     """Service for interacting with the FRED API."""
 
-    FRED_API_BASE = "https://api.stlouisfed.org/fred"
+    FRED_API_BASE = Config.FRED_API_BASE
     USER_AGENT = "fred-service/1.0"
-    API_KEY = os.getenv("FRED_API_KEY")
+    API_KEY = Config.FRED_API_KEY
+
+    # Shared connection pool, opened and closed with the server lifespan
+    _client: httpx.AsyncClient | None = None
+    _client_users = 0
+
+    # Cache and quota shared with the other worker processes, when there are any
+    shared_state = (
+        SharedState(os.path.join(Config.FRED_CACHE_DIR, "shared_state.sqlite3"))
+        if Config.SHARED_STATE_ENABLED else None
+    )
+
+    # Shared by every request so concurrent tool calls stay within the FRED quota
+    rate_limiter = RateLimiter(Config.FRED_RATE_LIMIT_PER_MINUTE, Config.FRED_RATE_LIMIT_BURST, shared=shared_state)
+
+    def __init__(self, observation_store: ObservationStore | None = None,
+                 search_index: SeriesSearchIndex | None = None, category_tree: CategoryTree | None = None,
+                 vintage_store: VintageStore | None = None):
+        if observation_store is None and Config.OBSERVATION_STORE_ENABLED:
+            observation_store = ObservationStore(os.path.join(Config.FRED_CACHE_DIR, "observations.sqlite3"))
+        if search_index is None and Config.SEARCH_INDEX_ENABLED:
+            search_index = SeriesSearchIndex(os.path.join(Config.FRED_CACHE_DIR, "search_index.sqlite3"))
+        if category_tree is None:
+            category_tree = CategoryTree(os.path.join(Config.FRED_CACHE_DIR, "categories.sqlite3"))
+        if vintage_store is None:
+            vintage_store = VintageStore(os.path.join(Config.FRED_CACHE_DIR, "vintages.sqlite3"))
+        self.observation_store = observation_store
+        self.vintage_store = vintage_store
+        self.search_index = search_index
+        self.category_tree = category_tree
+        # Identifies this process when taking maintenance leases in shared SQLite files
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.cache = TTLCache(Config.CACHE_MAX_ENTRIES)
+        self.release_calendar = ReleaseCalendar() if Config.RELEASE_CALENDAR_ENABLED else None
+        self.calendar_lookups: dict[str, asyncio.Task] = {}
+        # Store refreshes in flight, so concurrent requests for a series share one download
+        self.observation_refreshes: dict[tuple[str, bool], asyncio.Task] = {}
+        # How often each series' observations were asked for, to pick which to refresh on release
+        self.series_requests: Counter[str] = Counter()
+
+    @classmethod
+    async def open_client(cls) -> httpx.AsyncClient:
+        """Open the shared HTTP client, or take another reference to it if already open."""
+        cls._client_users += 1
+        if cls._client is None:
+            http2 = Config.FRED_HTTP2 and importlib.util.find_spec("h2") is not None
+            if Config.FRED_HTTP2 and not http2:
+                logger.warning("FRED_HTTP2 is enabled but the 'h2' package is not installed; using HTTP/1.1")
+            cls._client = httpx.AsyncClient(
+                http2=http2,
+                headers={
+                    "User-Agent": cls.USER_AGENT,
+                    "Accept": "application/json"
+                },
+                limits=httpx.Limits(
+                    max_connections=Config.FRED_MAX_CONNECTIONS,
+                    max_keepalive_connections=Config.FRED_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=Config.FRED_KEEPALIVE_EXPIRY
+                ),
+                timeout=httpx.Timeout(Config.FRED_TIMEOUT, connect=Config.FRED_CONNECT_TIMEOUT)
+            )
+            logger.info(f"Opened shared FRED HTTP client (http2={http2})")
+        return cls._client
+
+    @classmethod
+    async def close_client(cls) -> None:
+        """Release a reference to the shared HTTP client, closing it when the last user is done."""
+        cls._client_users = max(cls._client_users - 1, 0)
+        if cls._client_users == 0 and cls._client is not None:
+            client, cls._client = cls._client, None
+            await client.aclose()
+            logger.info("Closed shared FRED HTTP client")
 
     @staticmethod
-    async def make_request(endpoint: str, params: dict[str, Any]) -> dict[str, Any] | None:
-        """Make a request to the FRED API with proper error handling."""
+    def get_timeout(endpoint: str) -> httpx.Timeout:
+        """Return the timeout configured for an endpoint."""
+        read_timeout = Config.FRED_ENDPOINT_TIMEOUTS.get(endpoint, Config.FRED_TIMEOUT)
+        return httpx.Timeout(read_timeout, connect=Config.FRED_CONNECT_TIMEOUT)
+
+    @staticmethod
+    @asynccontextmanager
+    async def send(endpoint: str, params: dict[str, Any], timeout: httpx.Timeout) -> AsyncIterator[httpx.Response]:
+        """Open a streamed GET, recording latency, status and payload size once the body is done with."""
+        url = f"{FREDService.FRED_API_BASE}/{endpoint}"
+        started = time.perf_counter()
+        status = "error"
+        response = None
+        with span("fred.request", endpoint=endpoint) as current:
+            try:
+                async with FREDService.open_stream(url, params, timeout) as response:
+                    status = response.status_code
+                    yield response
+            finally:
+                UPSTREAM_DURATION.observe(time.perf_counter() - started, endpoint=endpoint)
+                UPSTREAM_REQUESTS.inc(endpoint=endpoint, status=status)
+                if response is not None:
+                    UPSTREAM_BYTES.inc(response.num_bytes_downloaded, endpoint=endpoint)
+                if current is not None:
+                    current.set_attribute("http.status_code", str(status))
+
+    @staticmethod
+    @asynccontextmanager
+    async def open_stream(url: str, params: dict[str, Any], timeout: httpx.Timeout) -> AsyncIterator[httpx.Response]:
+        """Open a streamed GET through the shared client, or a short-lived one outside the server lifespan."""
+        if FREDService._client is not None:
+            async with FREDService._client.stream("GET", url, params=params, timeout=timeout) as response:
+                yield response
+            return
+
         headers = {
             "User-Agent": FREDService.USER_AGENT,
             "Accept": "application/json"
         }
         async with httpx.AsyncClient() as client:
+            async with client.stream("GET", url, headers=headers, params=params, timeout=timeout) as response:
+                yield response
+
+    @staticmethod
+    async def request(endpoint: str, params: dict[str, Any],
+                      read_body: Callable[[httpx.Response], Awaitable[T]]) -> T:
+        """Make a rate-limited request to the FRED API, retrying transient failures.
+
+        429s, 5xx responses and transport errors (including ones while `read_body`
+        consumes the stream) are retried with jittered exponential backoff, honoring
+        Retry-After. Raises FREDAPIError when FRED rejects the request or retries run
+        out, so a failed call is never mistaken for an empty result.
+        """
+        timeout = FREDService.get_timeout(endpoint)
+
+        for attempt in range(Config.FRED_MAX_RETRIES + 1):
+            await FREDService.rate_limiter.acquire()
+            retry_after = None
             try:
-                response = await client.get(f"{FREDService.FRED_API_BASE}/{endpoint}", headers=headers, params=params, timeout=30.0)
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPError:
-                return None
+                async with FREDService.send(endpoint, params, timeout) as response:
+                    if response.is_success:
+                        try:
+                            return await read_body(response)
+                        except ValueError as e:
+                            raise FREDAPIError(f"FRED returned an invalid body for {endpoint}: {e}") from e
+
+                    await response.aread()
+                    error = FREDAPIError.from_response(endpoint, response)
+                    if not error.retryable:
+                        raise error
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    if response.status_code == 429:
+                        await FREDService.rate_limiter.pause(retry_after or Config.FRED_BACKOFF_BASE * 2 ** attempt)
+            except httpx.TransportError as e:
+                error = FREDAPIError(f"FRED request to {endpoint} failed: {e!r}")
+
+            if attempt == Config.FRED_MAX_RETRIES:
+                raise error
+
+            delay = backoff_delay(attempt, Config.FRED_BACKOFF_BASE, Config.FRED_BACKOFF_MAX)
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+            logger.warning(f"{error} (attempt {attempt + 1}), retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    async def read_json(response: httpx.Response) -> dict[str, Any]:
+        await response.aread()
+        return response.json()
+
+    @staticmethod
+    async def make_request(endpoint: str, params: dict[str, Any]) -> dict[str, Any]:
+        """Make a request to the FRED API and decode the JSON body."""
+        return await FREDService.request(endpoint, params, FREDService.read_json)
+
+    @staticmethod
+    async def stream_observations(params: dict[str, Any]) -> list[tuple[str, str]]:
+        """Fetch `series/observations` as (date, value) pairs, decoding the body as it streams in."""
+        async def read_pairs(response: httpx.Response) -> list[tuple[str, str]]:
+            pairs: list[tuple[str, str]] = []
+            await decode_observations(response, lambda obs_date, value: pairs.append((obs_date, value)))
+            return pairs
+
+        return await FREDService.request("series/observations", params, read_pairs)
+
+    async def cached_request(self, endpoint: str, params: dict[str, Any],
+                             ttl: Callable[[dict[str, Any]], float] | None = None,
+                             refresh: bool = False) -> dict[str, Any]:
+        """Make a request through the in-process cache when the endpoint has a TTL configured.
+
+        `ttl` can work out a response's lifetime from its content instead. `refresh`
+        drops any cached copy and goes upstream. With shared state enabled, in-process
+        misses go through the cross-process cache (`fetch_shared`), so N workers do
+        not make N identical requests.
+        """
+        default_ttl = Config.CACHE_TTLS.get(endpoint)
+        if not default_ttl:
+            return await self.make_request(endpoint, params)
+        ttl = ttl or (lambda _data: default_ttl)
 
+        key = (endpoint, tuple(sorted((k, str(v)) for k, v in params.items() if k != "api_key")))
+        if refresh:
+            self.cache.invalidate(key)
+        return await self.cache.get_or_fetch(key, ttl, lambda: self.fetch_shared(
+            json.dumps(key), ttl, lambda: self.make_request(endpoint, params), refresh
+        ))
+
+    async def fetch_shared(self, key: str, ttl: Callable[[Any], float], fetch: Callable[[], Awaitable[T]],
+                           refresh: bool = False) -> T:
+        """Fetch a JSON-serializable value through the cross-process cache, or directly without shared state.
+
+        On a miss one worker takes a lease on the key and fetches it while the others
+        wait for the value to appear, so concurrent misses cost one upstream call
+        however many workers have them. `refresh` skips the cached copy.
+        """
+        shared = FREDService.shared_state
+        if shared is None:
+            return await fetch()
+        if not refresh:
+            data = await asyncio.to_thread(shared.cache_get, key)
+            if data is not None:
+                return data
+
+        lease = f"fetch:{key}"
+        while not await asyncio.to_thread(shared.claim_lease, lease, self.worker_id, FETCH_LEASE_SECONDS):
+            await asyncio.sleep(FETCH_LEASE_POLL)
+            if not refresh:
+                data = await asyncio.to_thread(shared.cache_get, key)
+                if data is not None:
+                    return data
+        try:
+            # Another worker may have stored it between the miss and the lease
+            data = None if refresh else await asyncio.to_thread(shared.cache_get, key)
+            if data is None:
+                data = await fetch()
+                await asyncio.to_thread(shared.cache_set, key, data, ttl(data))
+            return data
+        finally:
+            await asyncio.to_thread(shared.release_lease, lease, self.worker_id)
+
+
+    async def paginate(self, endpoint: str, params: dict[str, Any], result_key: str,
+                       limit: int, offset: int = 0) -> AsyncIterator[dict[str, Any]]:
+        """Yield up to `limit` items of a paged FRED endpoint, starting at `offset`.
+
+        The first page reports the total count; the remaining pages are then fetched
+        concurrently (at most PAGINATION_MAX_CONCURRENCY at a time) and their items
+        are yielded in order as soon as each page arrives.
+        """
+        limit = max(min(limit, Config.PAGINATION_MAX_RESULTS), 0)
+        page_size = min(limit, Config.FRED_PAGE_SIZE)
+        if page_size == 0:
+            return
+
+        first_page = await self.cached_request(endpoint, {**params, "limit": page_size, "offset": offset})
+        items = first_page.get(result_key, [])
+        for item in items[:limit]:
+            yield item
+        if len(items) < page_size:
+            return
+
+        end = min(first_page.get("count", offset + len(items)), offset + limit)
+        semaphore = asyncio.Semaphore(Config.PAGINATION_MAX_CONCURRENCY)
+
+        async def fetch_page(page_offset: int) -> dict[str, Any]:
+            async with semaphore:
+                return await self.cached_request(
+                    endpoint, {**params, "limit": min(page_size, end - page_offset), "offset": page_offset}
+                )
+
+        pages = [asyncio.ensure_future(fetch_page(page_offset))
+                 for page_offset in range(offset + page_size, end, page_size)]
+        try:
+            for page in pages:
+                for item in (await page).get(result_key, []):
+                    yield item
+        finally:
+            for page in pages:
+                page.cancel()
+
+    @staticmethod
+    async def collect_rows(items: AsyncIterator[dict[str, Any]], format_row: Callable[[dict[str, Any]], str],
+                           limit: int, predicate: Callable[[dict[str, Any]], bool] | None = None) -> list[str]:
+        """Format paged items into rows as they stream in, stopping after `limit` matches."""
+        rows = []
+        async with aclosing(items):
+            async for item in items:
+                if predicate is not None and not predicate(item):
+                    continue
+                rows.append(format_row(item))
+                if len(rows) >= limit:
+                    break
+        return rows
 
-    async def search_series(self, search_text: str) -> str:
-        """Search for FRED series by keyword."""
+    async def search_series(self, search_text: str, limit: int = 50, offset: int = 0,
+                            order_by: str | None = None, sort_order: str | None = None,
+                            filter_text: str | None = None) -> str:
+        """Search for FRED series by keyword.
+
+        `filter_text` takes FRED's filter as "variable:value", e.g. "frequency:Monthly".
+        Answered from the local search index when it has results (a full page of them
+        while the index is still being harvested); otherwise FRED's series/search is
+        queried and the series it returns are added to the index.
+        """
         endpoint = "series/search"
         params = {
             "search_text": search_text,
             "api_key": FREDService.API_KEY,
             "file_type": "json"
         }
-        data = await self.make_request(endpoint, params)
+        if order_by:
+            params["order_by"] = order_by
+        if sort_order:
+            params["sort_order"] = sort_order
+        if filter_text:
+            variable, _, value = filter_text.partition(":")
+            params["filter_variable"] = variable.strip()
+            params["filter_value"] = value.strip()
 
-        if not data or "seriess" not in data:
-            return "No series found for the given search text."
+        index = self.search_index
+        if index is not None:
+            matches = await asyncio.to_thread(
+                index.search, search_text, limit, offset, order_by, sort_order,
+                params.get("filter_variable"), params.get("filter_value")
+            )
+            if matches and (len(matches) >= limit or await asyncio.to_thread(index.get_state, "harvested")):
+                SEARCH_QUERIES.inc(source="index")
+                return "\n".join(f"ID: {series['series_id']}, Title: {series['title']}" for series in matches)
 
-        results = data["seriess"]
-        formatted_results = [
-            f"ID: {series['id']}, Title: {series['title']}" for series in results
-        ]
+        found = []
+
+        def format_row(series: dict[str, Any]) -> str:
+            found.append(series)
+            return f"ID: {series['id']}, Title: {series['title']}"
+
+        formatted_results = await self.collect_rows(
+            self.paginate(endpoint, params, "seriess", limit, offset), format_row, limit
+        )
+        SEARCH_QUERIES.inc(source="api")
+        if index is not None and found:
+            await asyncio.to_thread(index.add_series, found)
+        if not formatted_results:
+            return "No series found for the given search text."
         return "\n".join(formatted_results)
 
-    async def get_series_observations(self, series_id: str, limit: int = 100, sort_order: str = 'asc') -> str:
-        """Get observations for a series."""
+    async def fetch_pages(self, endpoint: str, params: dict[str, Any], result_key: str = "seriess",
+                          page_size: int = Config.FRED_PAGE_SIZE) -> AsyncIterator[list[dict[str, Any]]]:
+        """Yield every page of a paged endpoint in order, uncached and one request at a time.
+
+        Unlike `paginate` this is not capped at PAGINATION_MAX_RESULTS; it is meant
+        for background crawls rather than tool results.
+        """
+        offset = 0
+        while True:
+            data = await self.make_request(
+                endpoint, {**params, "api_key": FREDService.API_KEY, "file_type": "json",
+                           "limit": page_size, "offset": offset}
+            )
+            items = data.get(result_key, [])
+            yield items
+            offset += len(items)
+            if len(items) < page_size or offset >= data.get("count", offset):
+                return
+
+    async def index_pages(self, endpoint: str, params: dict[str, Any]) -> int:
+        """Add every series of a paged series-list endpoint to the search index; returns how many."""
+        indexed = 0
+        async for records in self.fetch_pages(endpoint, params):
+            indexed += await asyncio.to_thread(self.search_index.add_series, records)
+        return indexed
+
+    async def harvest_search_index(self) -> None:
+        """Index the series of every FRED release, skipping releases already harvested.
+
+        Progress is recorded per release, so an interrupted harvest resumes where it
+        stopped. series/updates picks up changes from the moment the harvest started.
+        """
+        index = self.search_index
+        if await asyncio.to_thread(index.get_state, "updated_since") is None:
+            await asyncio.to_thread(index.set_state, "updated_since", datetime.now(FRED_TIMEZONE).isoformat())
+
+        started = time.perf_counter()
+        with background_priority():
+            releases = [release async for release in self.paginate(
+                "releases", {"api_key": FREDService.API_KEY, "file_type": "json"}, "releases",
+                Config.PAGINATION_MAX_RESULTS
+            )]
+            semaphore = asyncio.Semaphore(Config.SEARCH_INDEX_CONCURRENCY)
+
+            async def harvest(release_id: str) -> int:
+                if await asyncio.to_thread(index.get_state, f"release:{release_id}") is not None:
+                    return 0
+                async with semaphore:
+                    indexed = await self.index_pages("release/series", {"release_id": release_id})
+                await asyncio.to_thread(index.set_state, f"release:{release_id}", str(time.time()))
+                await asyncio.to_thread(index.claim_lease, "maintenance", self.worker_id,
+                                        Config.SEARCH_INDEX_REFRESH_INTERVAL * 2)
+                return indexed
+
+            release_ids = [str(release["id"]) for release in releases]
+            results = await asyncio.gather(*(harvest(rid) for rid in release_ids), return_exceptions=True)
+
+        failed = [f"{rid} ({result})" for rid, result in zip(release_ids, results) if isinstance(result, Exception)]
+        if failed:
+            logger.warning(f"Search index harvest failed for releases {', '.join(failed)}")
+        else:
+            await asyncio.to_thread(index.set_state, "harvested", str(time.time()))
+        indexed = sum(result for result in results if not isinstance(result, Exception))
+        logger.info(f"Indexed {indexed} series from {len(release_ids) - len(failed)} releases "
+                    f"in {time.perf_counter() - started:.1f}s")
+
+    async def refresh_search_index(self) -> None:
+        """Re-index series whose metadata changed since the last refresh, via series/updates."""
+        index = self.search_index
+        now = datetime.now(FRED_TIMEZONE)
+        since = await asyncio.to_thread(index.get_state, "updated_since")
+        start = datetime.fromisoformat(since) if since else now - SERIES_UPDATES_WINDOW
+        if now - start > SERIES_UPDATES_WINDOW:
+            logger.warning(f"Search index last refreshed {start:%Y-%m-%d}; series/updates only covers two weeks")
+            start = now - SERIES_UPDATES_WINDOW
+
+        with background_priority():
+            # A few minutes of overlap, since FRED's times have minute resolution
+            indexed = await self.index_pages("series/updates", {
+                "filter_value": "all",
+                "start_time": (start - timedelta(minutes=5)).strftime("%Y%m%d%H%M"),
+                "end_time": now.strftime("%Y%m%d%H%M"),
+            })
+        await asyncio.to_thread(index.set_state, "updated_since", now.isoformat())
+        logger.info(f"Refreshed {indexed} series in the search index")
+
+    async def update_search_index(self) -> None:
+        """Harvest the search index if that has not finished yet, then refresh it."""
+        if await asyncio.to_thread(self.search_index.get_state, "harvested") is None:
+            await self.harvest_search_index()
+        await self.refresh_search_index()
+
+    async def holds_lease(self, name: str, seconds: float) -> bool:
+        """Whether this process should do a piece of background work every worker would otherwise repeat.
+
+        Always True without shared state; with it, only for the worker holding the
+        named lease in the shared state file.
+        """
+        shared = FREDService.shared_state
+        if shared is None:
+            return True
+        return await asyncio.to_thread(shared.claim_lease, name, self.worker_id, seconds)
+
+    async def maintain(self, store: SeriesSearchIndex | CategoryTree, interval: float,
+                       work: Callable[[], Awaitable[None]]) -> None:
+        """Run `work` every `interval` seconds while this process holds the store's maintenance lease.
+
+        Several workers can share one SQLite file; the lease lets only one of them
+        talk to FRED for it at a time.
+        """
+        while True:
+            try:
+                if await asyncio.to_thread(store.claim_lease, "maintenance", self.worker_id, interval * 2):
+                    await work()
+            except (FREDAPIError, httpx.HTTPError) as e:
+                logger.warning(f"Background {work.__name__} failed: {e}")
+            await asyncio.sleep(interval)
+
+    async def crawl_children(self, category_id: int) -> None:
+        """Fetch a category's children into the category tree."""
+        params = {"category_id": category_id, "api_key": FREDService.API_KEY, "file_type": "json"}
+        data = await self.make_request("category/children", params)
+        await asyncio.to_thread(self.category_tree.set_children, category_id, data.get("categories", []))
+
+    async def crawl_series(self, category_id: int) -> None:
+        """Fetch every series of a category into the category tree.
+
+        The search index is left to the release harvest, which already covers these series.
+        """
+        records = [record async for page in self.fetch_pages("category/series", {"category_id": category_id})
+                   for record in page]
+        await asyncio.to_thread(self.category_tree.set_series, category_id, records)
+
+    async def crawl_categories(self) -> None:
+        """Breadth-first crawl of the category tree, children and series, from the root down.
+
+        Categories crawled within CATEGORY_TREE_MAX_AGE are skipped, so an interrupted
+        crawl resumes where it stopped and a later one only revisits stale categories.
+        At most CATEGORY_CRAWL_CONCURRENCY categories are fetched at a time.
+        """
+        tree = self.category_tree
+        stale_before = time.time() - Config.CATEGORY_TREE_MAX_AGE
+        semaphore = asyncio.Semaphore(Config.CATEGORY_CRAWL_CONCURRENCY)
+        failed: set[int] = set()
+        crawled = 0
+
+        async def crawl(category_id: int) -> None:
+            async with semaphore:
+                await self.crawl_children(category_id)
+                await self.crawl_series(category_id)
+
+        started = time.perf_counter()
+        with background_priority():
+            while batch := await asyncio.to_thread(
+                tree.pending, stale_before, Config.CATEGORY_CRAWL_CONCURRENCY * 4, failed
+            ):
+                results = await asyncio.gather(*(crawl(cid) for cid in batch), return_exceptions=True)
+                for category_id, result in zip(batch, results):
+                    if isinstance(result, Exception):
+                        logger.warning(f"Crawling category {category_id} failed: {result}")
+                        failed.add(category_id)
+                    else:
+                        crawled += 1
+                await asyncio.to_thread(tree.claim_lease, "maintenance", self.worker_id,
+                                        Config.CATEGORY_CRAWL_INTERVAL * 2)
+        logger.info(f"Crawled {crawled} categories ({len(failed)} failed) in {time.perf_counter() - started:.1f}s")
+
+    async def ensure_category(self, category_id: int) -> dict[str, Any] | None:
+        """The tree's record for a category, looking it up in FRED when the crawl has not reached it."""
+        tree = self.category_tree
+        node = await asyncio.to_thread(tree.get_category, category_id)
+        if node is not None:
+            return node
+        params = {"category_id": category_id, "api_key": FREDService.API_KEY, "file_type": "json"}
+        categories = (await self.cached_request("category", params)).get("categories")
+        if not categories:
+            return None
+        await asyncio.to_thread(tree.add_category, category_id, categories[0].get("name", ""),
+                                categories[0].get("parent_id"))
+        return await asyncio.to_thread(tree.get_category, category_id)
+
+    async def browse_categories(self, category_id: int = 0, depth: int = 2) -> str:
+        """Show a category's subtree down to `depth` levels from the cached tree.
+
+        Levels the crawl has not reached yet are fetched on the spot, each level's
+        categories concurrently.
+        """
+        tree = self.category_tree
+        depth = max(1, min(depth, 4))
+        try:
+            node = await self.ensure_category(category_id)
+        except FREDAPIError as e:
+            if e.status_code == 400:
+                return f"Category {category_id} not found."
+            raise
+        if node is None:
+            return f"Category {category_id} not found."
+
+        semaphore = asyncio.Semaphore(Config.CATEGORY_CRAWL_CONCURRENCY)
+
+        async def crawl(cid: int) -> None:
+            async with semaphore:
+                await self.crawl_children(cid)
+
+        for level in range(depth):
+            rows = await asyncio.to_thread(tree.subtree, category_id, level)
+            missing = [row["category_id"] for row in rows if row["level"] == level and row["children_at"] is None]
+            await asyncio.gather(*(crawl(cid) for cid in missing))
+
+        rows = await asyncio.to_thread(tree.subtree, category_id, depth)
+        lines = []
+        for row in rows[:MAX_TREE_NODES]:
+            line = f"{'  ' * row['level']}ID: {row['category_id']}, Name: {row['name']}"
+            if row["series_count"]:
+                line += f", Series: {row['series_count']}"
+            lines.append(line)
+        if len(rows) > MAX_TREE_NODES:
+            lines.append(f"... {len(rows) - MAX_TREE_NODES} more categories; browse a deeper category_id "
+                         "or a smaller depth")
+        return "\n".join(lines)
+
+    async def get_category_series(self, category_id: int, limit: int = 50, offset: int = 0) -> str:
+        """List a category's series, most popular first, from the cached tree.
+
+        A category whose series have not been crawled, or were crawled longer than
+        CATEGORY_TREE_MAX_AGE ago, is fetched from FRED first.
+        """
+        tree = self.category_tree
+        try:
+            node = await self.ensure_category(category_id)
+        except FREDAPIError as e:
+            if e.status_code == 400:
+                return f"Category {category_id} not found."
+            raise
+        if node is None:
+            return f"Category {category_id} not found."
+        if node["series_at"] is None or node["series_at"] < time.time() - Config.CATEGORY_TREE_MAX_AGE:
+            await self.crawl_series(category_id)
+
+        rows = await asyncio.to_thread(tree.series, category_id, max(limit, 0), offset)
+        if not rows:
+            return f"No series found in category {category_id}."
+        return "\n".join(
+            f"ID: {row['series_id']}, Title: {row['title']}, Frequency: {row['frequency']}, Units: {row['units']}"
+            for row in rows
+        )
+
+    async def learn_release(self, series_id: str) -> None:
+        """Look up a series' release and that release's scheduled dates for the release calendar.
+
+        Lookups are cached in process and across processes, so each series and
+        release is looked up once rather than once per series or per worker.
+        """
+        calendar = self.release_calendar
+        ttl = Config.RELEASE_CALENDAR_MAX_TTL
+
+        async def lookup(key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+            return await self.cache.get_or_fetch(key, ttl, lambda: self.fetch_shared(key, lambda _: ttl, fetch))
+
+        release_id = calendar.release_of(series_id)
+        if release_id is None:
+            params = {"series_id": series_id, "api_key": FREDService.API_KEY, "file_type": "json"}
+            data = await lookup(f"series/release:{series_id}", lambda: self.make_request("series/release", params))
+            releases = data.get("releases", [])
+            if not releases:
+                return
+            release_id = int(releases[0]["id"])
+            calendar.set_series_release(series_id, release_id, releases[0].get("name", ""))
+        # Dates from a while back too, so a publication that has not shown up yet still counts as due
+        params = {
+            "release_id": release_id,
+            "api_key": FREDService.API_KEY,
+            "file_type": "json",
+            "realtime_start": (date.today() - timedelta(days=Config.RELEASE_CALENDAR_LOOKBACK_DAYS)).isoformat(),
+            "realtime_end": "9999-12-31",
+            "include_release_dates_with_no_data": "true",
+            "sort_order": "asc",
+        }
+
+        async def fetch_dates() -> list[str]:
+            return [entry["date"] async for page in self.fetch_pages("release/dates", params, "release_dates")
+                    for entry in page]
+
+        dates = await lookup(f"release/dates:{release_id}:{params['realtime_start']}", fetch_dates)
+        calendar.set_release_dates(release_id, dates)
+
+    def publication_expiry(self, series_id: str, last_updated: str) -> float | None:
+        """When data last updated at `last_updated` goes stale, by the release calendar.
+
+        None when the calendar does not know (a lookup is then started in the
+        background) or the series is due to publish now.
+        """
+        calendar = self.release_calendar
+        if calendar is None:
+            return None
+        series_id = series_id.upper()
+        if calendar.needs_refresh(series_id, Config.RELEASE_CALENDAR_MAX_TTL) and series_id not in self.calendar_lookups:
+            async def lookup() -> None:
+                try:
+                    with background_priority():
+                        await self.learn_release(series_id)
+                except (FREDAPIError, httpx.HTTPError) as e:
+                    logger.warning(f"Release calendar lookup failed for {series_id}: {e}")
+                finally:
+                    self.calendar_lookups.pop(series_id, None)
+
+            self.calendar_lookups[series_id] = asyncio.create_task(lookup())
+        return calendar.expiry(series_id, last_updated)
+
+    def series_ttl(self, series_id: str, data: dict[str, Any]) -> float:
+        """Cache lifetime of a `series` response: until the series' next publication when
+        the release calendar knows it (at most RELEASE_CALENDAR_MAX_TTL), else CACHE_TTL_SERIES."""
+        default = Config.CACHE_TTLS["series"]
+        if not data.get("seriess"):
+            return default
+        expiry = self.publication_expiry(series_id, data["seriess"][0]["last_updated"])
+        if expiry is None:
+            return default
+        return min(expiry - time.time(), Config.RELEASE_CALENDAR_MAX_TTL)
+
+    async def fetch_series_metadata(self, series_id: str, refresh: bool = False) -> dict[str, Any] | None:
+        """Fetch the raw metadata record for a series from the `series` endpoint."""
+        params = {
+            "series_id": series_id,
+            "api_key": FREDService.API_KEY,
+            "file_type": "json"
+        }
+        data = await self.cached_request(
+            "series", params, ttl=lambda response: self.series_ttl(series_id, response), refresh=refresh
+        )
+
+        if not data or not data.get("seriess"):
+            return None
+        return data["seriess"][0]
+
+    async def refresh_observations(self, series_id: str, force: bool = False) -> bool:
+        """Bring the local store up to date for a series.
+
+        The series' `last_updated` stamp is checked at most once per
+        OBSERVATION_STORE_CHECK_INTERVAL, or not until its next scheduled publication
+        when the release calendar knows it. When it has moved, only points from the last
+        OBSERVATION_REVISION_LOOKBACK stored dates onward are refetched, which picks up
+        new observations plus recent revisions. Concurrent calls for the same series
+        share one refresh. Returns True when the store can answer.
+        """
+        key = (series_id.upper(), force)
+        task = self.observation_refreshes.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._refresh_observations(*key))
+            self.observation_refreshes[key] = task
+            task.add_done_callback(lambda _: self.observation_refreshes.pop(key, None))
+        # Shield so one caller being cancelled does not cancel the shared refresh
+        return await asyncio.shield(task)
+
+    async def _refresh_observations(self, series_id: str, force: bool) -> bool:
+        store = self.observation_store
+        state = await asyncio.to_thread(store.get_series_state, series_id)
+        if state and not force:
+            fresh_until = state[1] + Config.OBSERVATION_STORE_CHECK_INTERVAL
+            expiry = self.publication_expiry(series_id, state[0])
+            if expiry is not None:
+                fresh_until = min(expiry, state[1] + Config.RELEASE_CALENDAR_MAX_TTL)
+            if time.time() < fresh_until:
+                return True
+
+        # Workers sharing the store take turns; one that waited uses what the other stored
+        lease = f"refresh:{series_id}"
+        waited = False
+        while not await asyncio.to_thread(store.claim_lease, lease, self.worker_id, FETCH_LEASE_SECONDS):
+            waited = True
+            await asyncio.sleep(FETCH_LEASE_POLL)
+        try:
+            if waited:
+                current = await asyncio.to_thread(store.get_series_state, series_id)
+                if current and (state is None or current[1] > state[1]):
+                    return True
+            return await self._update_observations(series_id, state)
+        finally:
+            await asyncio.to_thread(store.release_lease, lease, self.worker_id)
+
+    async def _update_observations(self, series_id: str, state: tuple[str, float] | None) -> bool:
+        store = self.observation_store
+        try:
+            series_info = await self.fetch_series_metadata(series_id)
+        except FREDAPIError as e:
+            if state is None or not e.retryable:
+                raise
+            # Upstream unavailable: serve what we have rather than nothing
+            logger.warning(f"{e}; serving stored observations for {series_id}")
+            return True
+        if series_info is None:
+            return state is not None
+
+        last_updated = series_info['last_updated']
+        if state and state[0] == last_updated:
+            await asyncio.to_thread(store.mark_checked, series_id)
+            return True
+
+        params = {
+            'series_id': series_id,
+            'api_key': FREDService.API_KEY,
+            'file_type': 'json',
+            'sort_order': 'asc'
+        }
+        refresh_start = None
+        if state:
+            refresh_start = await asyncio.to_thread(
+                store.get_refresh_start, series_id, Config.OBSERVATION_REVISION_LOOKBACK
+            )
+            if refresh_start:
+                params['observation_start'] = refresh_start
+
+        try:
+            observations = await self.stream_observations(params)
+        except FREDAPIError as e:
+            if state is None or not e.retryable:
+                raise
+            logger.warning(f"{e}; serving stored observations for {series_id}")
+            return True
+
+        await asyncio.to_thread(
+            store.save_observations, series_id, last_updated, observations, refresh_start
+        )
+        return True
+
+    async def warm_up(self, series_ids: list[str]) -> None:
+        """Load metadata and stored observations for commonly requested series.
+
+        Runs behind interactive requests in the rate limiter; failures are logged and skipped.
+        With shared state, one worker warms the series for all of them.
+        """
+        if not await self.holds_lease("warm_up", Config.OBSERVATION_STORE_CHECK_INTERVAL):
+            return
+
+        async def warm(series_id: str) -> None:
+            await self.fetch_series_metadata(series_id)
+            if self.observation_store is not None:
+                await self.refresh_observations(series_id)
+
+        started = time.perf_counter()
+        with background_priority():
+            results = await asyncio.gather(*(warm(sid) for sid in series_ids), return_exceptions=True)
+        failed = [f"{sid} ({result})" for sid, result in zip(series_ids, results) if isinstance(result, Exception)]
+        if failed:
+            logger.warning(f"Warm-up failed for {', '.join(failed)}")
+        logger.info(f"Warmed {len(series_ids) - len(failed)} series in {time.perf_counter() - started:.2f}s")
+
+    def popular_series(self) -> list[str]:
+        """The WARMUP_SERIES plus the RELEASE_REFRESH_TOP_SERIES most requested ones."""
+        series_ids = [sid.upper() for sid in Config.WARMUP_SERIES]
+        for series_id, _ in self.series_requests.most_common(Config.RELEASE_REFRESH_TOP_SERIES):
+            if series_id not in series_ids:
+                series_ids.append(series_id)
+        return series_ids
+
+    async def refresh_if_published(self, series_id: str) -> bool:
+        """If a series is due to publish, re-check it upstream; returns True when it has published
+        and its cached metadata and stored observations were refreshed."""
+        calendar = self.release_calendar
+        series_info = await self.fetch_series_metadata(series_id)
+        if series_info is None:
+            return False
+        self.publication_expiry(series_id, series_info["last_updated"])
+        if not calendar.is_due(series_id, series_info["last_updated"]):
+            return False
+        series_info = await self.fetch_series_metadata(series_id, refresh=True)
+        if series_info is None or calendar.is_due(series_id, series_info["last_updated"]):
+            return False
+        if self.observation_store is not None:
+            await self.refresh_observations(series_id, force=True)
+        return True
+
+    async def watch_releases(self) -> None:
+        """Every RELEASE_REFRESH_INTERVAL seconds, refresh popular series that have just published.
+
+        Only series the release calendar says are due are checked upstream, so this
+        costs nothing between release days. With shared state, one worker at a time
+        does the checking, and the other workers pick its refreshes up from the
+        shared cache and store.
+        """
+        while True:
+            await asyncio.sleep(Config.RELEASE_REFRESH_INTERVAL)
+            if not await self.holds_lease("release_watch", Config.RELEASE_REFRESH_INTERVAL * 2):
+                continue
+            series_ids = self.popular_series()
+            with background_priority():
+                results = await asyncio.gather(
+                    *(self.refresh_if_published(sid) for sid in series_ids), return_exceptions=True
+                )
+            for series_id, result in zip(series_ids, results):
+                if isinstance(result, Exception):
+                    logger.warning(f"Release check failed for {series_id}: {result}")
+            published = [sid for sid, result in zip(series_ids, results) if result is True]
+            if published:
+                logger.info(f"Refreshed newly published series: {', '.join(published)}")
+
+    async def fetch_series_data(self, series_id: str, limit: int = 100, sort_order: str = 'asc',
+                                observation_start: str | None = None,
+                                observation_end: str | None = None, frequency: str | None = None,
+                                aggregation_method: str | None = None, units: str | None = None) -> SeriesData:
+        """Return observations for a series in compact columnar form.
+
+        Served from the local store when enabled and no frequency or units transformation
+        is requested; otherwise the response is streamed straight into the columnar arrays.
+        """
+        series_id = series_id.upper()
+        self.series_requests[series_id] += 1
+        transformed = bool(frequency or units not in (None, 'lin'))
+        if self.observation_store is not None and not transformed and await self.refresh_observations(series_id):
+            observations = await asyncio.to_thread(
+                self.observation_store.get_observations, series_id, limit, sort_order,
+                observation_start, observation_end
+            )
+            return SeriesData.from_observations(series_id, observations)
+
         params = {
             'series_id': series_id,
             'api_key': FREDService.API_KEY,
@@ -56,45 +935,118 @@ class FREDService:
             'sort_order': sort_order,
             'limit': limit
         }
+        if observation_start:
+            params['observation_start'] = observation_start
+        if observation_end:
+            params['observation_end'] = observation_end
+        if frequency:
+            params['frequency'] = frequency
+            if aggregation_method:
+                params['aggregation_method'] = aggregation_method
+        if units:
+            params['units'] = units
 
-        endpoint = "series/observations"
-        data = await self.make_request(endpoint, params)
+        async def read_series(response: httpx.Response) -> SeriesData:
+            data = SeriesData(series_id)
+            await decode_observations(response, data.append)
+            return data
 
-        if not data or 'observations' not in data:
-            return "No observations found for the given series."
+        return await self.request("series/observations", params, read_series)
 
-        observations = data['observations']
+    async def get_series_observations(self, series_id: str, limit: int = 100, sort_order: str = 'asc',
+                                      observation_start: str | None = None,
+                                      observation_end: str | None = None, frequency: str | None = None,
+                                      aggregation_method: str | None = None, units: str | None = None,
+                                      max_points: int | None = None, downsample: str = 'lttb') -> SeriesTable:
+        """Get observations for a series as a one-column table.
+
+        `frequency`, `aggregation_method` and `units` are applied by FRED. With `max_points`
+        the whole date range is fetched and reduced locally to at most that many points
+        (capped at OBSERVATIONS_MAX_POINTS), instead of cutting it off at `limit`.
+        """
+        if units and units not in OBSERVATION_UNITS:
+            return build_table([], note=f"Unknown units '{units}'; use one of {', '.join(sorted(OBSERVATION_UNITS))}.")
+        if aggregation_method and aggregation_method not in AGGREGATION_METHODS:
+            return build_table(
+                [], note=f"Unknown aggregation_method '{aggregation_method}'; use one of avg, sum, eop."
+            )
+        if max_points is not None and downsample not in analytics.DOWNSAMPLERS:
+            return build_table([], note=f"Unknown downsample mode '{downsample}'; use 'lttb' or 'minmax'.")
+
+        if max_points is not None:
+            limit = Config.ANALYTICS_MAX_OBSERVATIONS
+        data = await self.fetch_series_data(
+            series_id, limit, 'asc' if max_points is not None else sort_order, observation_start,
+            observation_end, frequency, aggregation_method, units
+        )
 
         # Filter out missing values
-        valid_obs = [
-            obs for obs in observations
-            if obs['value'] != '.'
-        ]
+        valid_obs = data.dropna()
 
-        if not valid_obs:
-            return f"No valid observations found for series {series_id}"
+        if not len(valid_obs):
+            return build_table([], note=f"No valid observations found for series {series_id}")
 
-        # Format as string
-        formatted_obs = [
-            f"Date: {obs['date']}, Value: {obs['value']}"
-            for obs in valid_obs
-        ]
-        return "\n".join(formatted_obs)
+        note = ""
+        if max_points is not None:
+            max_points = min(max(max_points, 3), Config.OBSERVATIONS_MAX_POINTS)
+            sampled = analytics.DOWNSAMPLERS[downsample](valid_obs, max_points)
+            if len(sampled) < len(valid_obs):
+                note = f"Downsampled from {len(valid_obs)} to {len(sampled)} points ({downsample})."
+                valid_obs = sampled
+        limited = max_points is None and len(data) >= limit
+        return build_table([valid_obs], descending=sort_order == 'desc', note=note, limited=limited)
+
+    async def get_multiple_series_observations(self, series_ids: list[str], limit: int = 100,
+                                               sort_order: str = 'asc',
+                                               observation_start: str | None = None,
+                                               observation_end: str | None = None) -> SeriesTable:
+        """Get observations for several series over a shared date range as one date-aligned table.
+
+        Series are fetched concurrently, at most BATCH_MAX_CONCURRENCY at a time. A series
+        that fails is reported in the table's errors without failing the others.
+        """
+        series_ids = list(dict.fromkeys(sid.strip() for sid in series_ids if sid.strip()))
+        if not series_ids:
+            return build_table([], note="No series IDs given.")
+        if len(series_ids) > Config.BATCH_MAX_SERIES:
+            return build_table(
+                [], note=f"Too many series requested ({len(series_ids)}); the maximum is {Config.BATCH_MAX_SERIES}."
+            )
+
+        semaphore = asyncio.Semaphore(Config.BATCH_MAX_CONCURRENCY)
+
+        async def fetch_one(series_id: str) -> SeriesData:
+            async with semaphore:
+                return await self.fetch_series_data(
+                    series_id, limit, sort_order, observation_start, observation_end
+                )
+
+        results = await asyncio.gather(*(fetch_one(sid) for sid in series_ids), return_exceptions=True)
+
+        columns = []
+        errors = []
+        limited = False
+        for series_id, result in zip(series_ids, results):
+            if isinstance(result, Exception):
+                errors.append(f"{series_id}: {result}")
+                continue
+            limited = limited or len(result) >= limit
+            valid_obs = result.dropna()
+            if not len(valid_obs):
+                errors.append(f"{series_id}: no valid observations")
+                continue
+            columns.append(valid_obs)
+
+        note = "" if columns else "No observations found for the given series."
+        return build_table(columns, descending=sort_order == 'desc', note=note, errors=errors, limited=limited)
 
     async def get_series_info(self, series_id: str) -> str:
         """Get information about a specific FRED series."""
-        endpoint = "series"
-        params = {
-            "series_id": series_id,
-            "api_key": FREDService.API_KEY,
-            "file_type": "json"
-        }
-        data = await self.make_request(endpoint, params)
+        series_info = await self.fetch_series_metadata(series_id)
 
-        if not data or "seriess" not in data:
+        if series_info is None:
             return "Unable to fetch series info or no data found."
 
-        series_info = data["seriess"][0]
         formatted_info = (
             f"Title: {series_info['title']}\n"
             f"ID: {series_info['id']}\n"
@@ -106,6 +1058,199 @@ class FREDService:
         )
         return formatted_info
 
+    async def sync_vintages(self, series_id: str) -> bool:
+        """Bring the vintage store up to date for a series; returns False if FRED has no such series.
+
+        The first sync fetches the whole revision history (output_type=1 over every
+        real-time period). Later ones run only when `last_updated` has moved and fetch
+        the real-time period since the previous sync, which holds just the new vintages.
+        """
+        store = self.vintage_store
+        series_info = await self.fetch_series_metadata(series_id)
+        if series_info is None:
+            return False
+        state = await asyncio.to_thread(store.get_series_state, series_id)
+        if state and state[0] == series_info["last_updated"]:
+            return True
+
+        since = state[1] if state else None
+        synced_through = datetime.now(FRED_TIMEZONE).date().isoformat()
+        params = {
+            "series_id": series_id,
+            "realtime_start": since or EARLIEST_REALTIME,
+            "realtime_end": LATEST_REALTIME,
+            "output_type": 1,
+            "sort_order": "asc",
+        }
+        periods = [
+            (obs["date"], obs["realtime_start"], obs["realtime_end"], obs["value"])
+            async for page in self.fetch_pages("series/observations", params, "observations", OBSERVATIONS_PAGE_SIZE)
+            for obs in page
+        ]
+        await asyncio.to_thread(
+            store.save_periods, series_id, periods, since, series_info["last_updated"], synced_through
+        )
+        return True
+
+    async def get_series_vintages(self, series_id: str, as_of: str | None = None,
+                                  realtime_start: str | None = None, realtime_end: str | None = None,
+                                  output_type: int = 1, observation_start: str | None = None,
+                                  observation_end: str | None = None, limit: int = 100,
+                                  sort_order: str = 'asc') -> str:
+        """Get past vintages (ALFRED) of a series from the local vintage store.
+
+        `as_of` gives the values as published on that date. Otherwise `output_type`
+        follows FRED: 1 lists each value with the real-time period it was current,
+        3 lists only values that were new or revised in each vintage within the
+        real-time period, and 4 gives each observation's initial release.
+        """
+        series_id = series_id.upper()
+        for name, value in (("as_of", as_of), ("realtime_start", realtime_start), ("realtime_end", realtime_end)):
+            if value is not None:
+                try:
+                    date.fromisoformat(value)
+                except ValueError:
+                    return f"Invalid {name} '{value}'; use YYYY-MM-DD"
+        if as_of is None and output_type not in VINTAGE_OUTPUT_TYPES:
+            return (f"Unsupported output_type {output_type}; use 1, 3 or 4, "
+                    "or as_of to see a whole vintage")
+        if not await self.sync_vintages(series_id):
+            return f"Unable to fetch vintages for {series_id} or no data found."
+
+        store = self.vintage_store
+        window = (max(limit, 0), sort_order, observation_start, observation_end)
+        period = (realtime_start or EARLIEST_REALTIME, realtime_end or LATEST_REALTIME)
+        if as_of is not None:
+            rows = await asyncio.to_thread(store.as_of, series_id, as_of, *window)
+            heading = f"{series_id} as of {as_of}:"
+            lines = [f"{obs_date}: {value}" for obs_date, value in rows]
+        elif output_type == 1:
+            rows = await asyncio.to_thread(store.periods, series_id, *period, *window)
+            heading = f"{series_id} values by real-time period:"
+            lines = [f"{obs_date}: {value} (published {start} to {end})" for obs_date, start, end, value in rows]
+        elif output_type == 3:
+            rows = await asyncio.to_thread(store.revisions, series_id, *period, *window)
+            heading = f"{series_id} new and revised values by vintage:"
+            lines = [f"Vintage {vintage}: {obs_date} = {value}" for vintage, obs_date, value in rows]
+        else:
+            rows = await asyncio.to_thread(store.first_releases, series_id, *window)
+            heading = f"{series_id} initial releases:"
+            lines = [f"{obs_date}: {value} (released {start})" for obs_date, value, start in rows]
+
+        if not lines:
+            return f"No vintage data for {series_id} in the requested range."
+        return "\n".join([heading, *lines])
+
+    async def load_analysis_series(self, series_id: str, observation_start: str | None = None,
+                                   observation_end: str | None = None) -> SeriesData | None:
+        """Load every valid observation in a date range, oldest first, for server-side analytics."""
+        data = await self.fetch_series_data(
+            series_id, Config.ANALYTICS_MAX_OBSERVATIONS, 'asc', observation_start, observation_end
+        )
+        data = data.dropna()
+        return data if len(data) else None
+
+    async def get_percent_change(self, series_id: str, periods: int = 1, year_over_year: bool = False,
+                                 limit: int = 12, observation_start: str | None = None,
+                                 observation_end: str | None = None) -> SeriesTable:
+        """Percent change over `periods` observations, or year-over-year, computed server-side.
+
+        Returns the most recent `limit` results, oldest first.
+        """
+        fetch_start = observation_start
+        if year_over_year and observation_start:
+            # Reach back far enough that the first requested point has a year-earlier match
+            year_earlier = analytics.one_year_earlier(date.fromisoformat(observation_start).toordinal())
+            fetch_start = date.fromordinal(year_earlier - analytics.YOY_TOLERANCE_DAYS).isoformat()
+
+        data = await self.load_analysis_series(series_id, fetch_start, observation_end)
+        if data is None:
+            return build_table([], note=f"No valid observations found for series {series_id}")
+
+        if year_over_year:
+            result = analytics.year_over_year(data)
+            label = "YoY % change"
+        else:
+            result = analytics.percent_change(data, max(periods, 1))
+            label = f"% change over {max(periods, 1)} period(s)"
+        if observation_start:
+            result = result.since(observation_start)
+        if not len(result):
+            return build_table([], note=f"Not enough observations to compute {label} for series {series_id}")
+
+        return build_table([result.tail(limit)], columns=[f"{series_id} {label}"], decimals=4,
+                           limited=0 < limit < len(result))
+
+    async def get_rolling_mean(self, series_id: str, window: int = 12, limit: int = 12,
+                               observation_start: str | None = None,
+                               observation_end: str | None = None) -> SeriesTable:
+        """Trailing rolling mean over `window` observations, computed server-side.
+
+        Returns the most recent `limit` results, oldest first.
+        """
+        data = await self.load_analysis_series(series_id, observation_start, observation_end)
+        if data is None:
+            return build_table([], note=f"No valid observations found for series {series_id}")
+
+        window = max(window, 1)
+        result = analytics.rolling_mean(data, window)
+        if not len(result):
+            return build_table([], note=f"Not enough observations for a {window}-period rolling mean of {series_id}")
+
+        return build_table([result.tail(limit)], columns=[f"{series_id} {window}-period mean"], decimals=4,
+                           limited=0 < limit < len(result))
+
+    async def get_series_summary(self, series_id: str, observation_start: str | None = None,
+                                 observation_end: str | None = None) -> str:
+        """Summary statistics (min/max, mean, latest, max drawdown) computed server-side."""
+        data = await self.load_analysis_series(series_id, observation_start, observation_end)
+        if data is None:
+            return f"No valid observations found for series {series_id}"
+
+        summary = analytics.summarize(data)
+        lines = [
+            f"Series: {series_id}",
+            f"Observations: {summary['count']}",
+            f"First: {summary['first'][0]}, Value: {format_value(summary['first'][1])}",
+            f"Latest: {summary['latest'][0]}, Value: {format_value(summary['latest'][1])}",
+            f"Min: {summary['min'][0]}, Value: {format_value(summary['min'][1])}",
+            f"Max: {summary['max'][0]}, Value: {format_value(summary['max'][1])}",
+            f"Mean: {format_value(round(summary['mean'], 4))}",
+            f"Max Drawdown: {format_value(round(summary['max_drawdown'], 4))}"
+            + (f" ({format_value(round(summary['max_drawdown_pct'], 2))}%)"
+               if summary['max_drawdown_pct'] is not None else "")
+            + f" from {summary['max_drawdown_peak']} to {summary['max_drawdown_trough']}",
+        ]
+        return "\n".join(lines)
+
+    async def get_series_correlation(self, series_id_a: str, series_id_b: str, transform: str = 'level',
+                                     observation_start: str | None = None,
+                                     observation_end: str | None = None) -> str:
+        """Pearson correlation of two series over their common dates.
+
+        `transform` is 'level', 'pct_change' or 'yoy' and is applied to both series first.
+        """
+        series_a, series_b = await asyncio.gather(
+            self.load_analysis_series(series_id_a, observation_start, observation_end),
+            self.load_analysis_series(series_id_b, observation_start, observation_end)
+        )
+        if series_a is None or series_b is None:
+            missing = series_id_a if series_a is None else series_id_b
+            return f"No valid observations found for series {missing}"
+
+        if transform == 'pct_change':
+            series_a, series_b = analytics.percent_change(series_a), analytics.percent_change(series_b)
+        elif transform == 'yoy':
+            series_a, series_b = analytics.year_over_year(series_a), analytics.year_over_year(series_b)
+
+        r, pairs = analytics.correlation(series_a, series_b)
+        if r is None:
+            return f"Not enough overlapping observations to correlate {series_id_a} and {series_id_b} ({pairs} common dates)"
+        return (
+            f"Correlation ({transform}) between {series_id_a} and {series_id_b}: "
+            f"{format_value(round(r, 4))} over {pairs} common dates"
+        )
+
     async def get_categories(self) -> str:
         """Get a list of FRED categories."""
         endpoint = "category/children"
@@ -114,7 +1259,7 @@ class FREDService:
             "api_key": FREDService.API_KEY,
             "file_type": "json"
         }
-        data = await self.make_request(endpoint, params)
+        data = await self.cached_request(endpoint, params)
 
         if not data or "categories" not in data:
             return "Unable to fetch categories or no data found."
@@ -125,56 +1270,80 @@ class FREDService:
         ]
         return "\n".join(formatted_categories)
 
-    async def get_releases(self) -> str:
-        """Get a list of FRED releases."""
+    async def get_releases(self, limit: int = 50, offset: int = 0, order_by: str | None = None,
+                           sort_order: str | None = None, filter_text: str | None = None) -> str:
+        """Get a list of FRED releases, optionally only those whose name contains `filter_text`."""
         endpoint = "releases"
         params = {
             "api_key": FREDService.API_KEY,
             "file_type": "json"
         }
-        data = await self.make_request(endpoint, params)
+        if order_by:
+            params["order_by"] = order_by
+        if sort_order:
+            params["sort_order"] = sort_order
 
-        if not data or "releases" not in data:
+        formatted_releases = await self.collect_rows(
+            self.paginate(endpoint, params, "releases", Config.PAGINATION_MAX_RESULTS if filter_text else limit, offset),
+            lambda rel: f"ID: {rel['id']}, Name: {rel['name']}",
+            limit,
+            self.name_filter(filter_text)
+        )
+        if not formatted_releases:
             return "Unable to fetch releases or no data found."
-
-        releases = data["releases"]
-        formatted_releases = [
-            f"ID: {rel['id']}, Name: {rel['name']}, Release Date: {rel['release_date']}" for rel in releases
-        ]
         return "\n".join(formatted_releases)
 
-    async def get_sources(self) -> str:
-        """Get a list of FRED sources."""
+    async def get_sources(self, limit: int = 50, offset: int = 0, order_by: str | None = None,
+                          sort_order: str | None = None, filter_text: str | None = None) -> str:
+        """Get a list of FRED sources, optionally only those whose name contains `filter_text`."""
         endpoint = "sources"
         params = {
             "api_key": FREDService.API_KEY,
             "file_type": "json"
         }
-        data = await self.make_request(endpoint, params)
+        if order_by:
+            params["order_by"] = order_by
+        if sort_order:
+            params["sort_order"] = sort_order
 
-        if not data or "sources" not in data:
+        formatted_sources = await self.collect_rows(
+            self.paginate(endpoint, params, "sources", Config.PAGINATION_MAX_RESULTS if filter_text else limit, offset),
+            lambda src: f"ID: {src['id']}, Name: {src['name']}",
+            limit,
+            self.name_filter(filter_text)
+        )
+        if not formatted_sources:
             return "Unable to fetch sources or no data found."
-
-        sources = data["sources"]
-        formatted_sources = [
-            f"ID: {src['id']}, Name: {src['name']}" for src in sources
-        ]
         return "\n".join(formatted_sources)
 
-    async def get_tags(self) -> str:
-        """Get a list of FRED tags."""
+    async def get_tags(self, limit: int = 50, offset: int = 0, order_by: str | None = None,
+                       sort_order: str | None = None, filter_text: str | None = None) -> str:
+        """Get a list of FRED tags, optionally only those matching `filter_text`."""
         endpoint = "tags"
         params = {
             "api_key": FREDService.API_KEY,
             "file_type": "json"
         }
-        data = await self.make_request(endpoint, params)
+        if order_by:
+            params["order_by"] = order_by
+        if sort_order:
+            params["sort_order"] = sort_order
+        if filter_text:
+            params["search_text"] = filter_text
 
-        if not data or "tags" not in data:
+        formatted_tags = await self.collect_rows(
+            self.paginate(endpoint, params, "tags", limit, offset),
+            lambda tag: f"Name: {tag['name']}, Group: {tag.get('group_id', '')}, Series Count: {tag.get('series_count', '')}",
+            limit
+        )
+        if not formatted_tags:
             return "Unable to fetch tags or no data found."
-
-        tags = data["tags"]
-        formatted_tags = [
-            f"ID: {tag['id']}, Name: {tag['name']}" for tag in tags
-        ]
         return "\n".join(formatted_tags)
+
+    @staticmethod
+    def name_filter(filter_text: str | None) -> Callable[[dict[str, Any]], bool] | None:
+        """Build a case-insensitive name-contains predicate for endpoints without a FRED-side filter."""
+        if not filter_text:
+            return None
+        needle = filter_text.lower()
+        return lambda item: needle in item.get("name", "").lower()
@@ -0,0 +1,198 @@
+import functools
+import math
+import threading
+import time
+from collections.abc import Callable, Iterable
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from config import Config
+
+# Only imported when tracing is on, to keep it out of server start-up otherwise
+trace = None
+if Config.TRACING_ENABLED:
+    try:
+        from opentelemetry import trace
+    except ImportError:  # Optional: spans are only recorded when OpenTelemetry is installed
+        pass
+
+# Latency buckets in seconds, from cache hits to slow paged fetches
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _label_text(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """A monotonically increasing count per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = tuple(str(labels[name]) for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_label_text(self.labels, key)} {_number(value)}"
+
+
+class Histogram:
+    """Cumulative bucket counts, sum and count per label set."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._values: dict[tuple[str, ...], list[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = tuple(str(labels[name]) for name in self.labels)
+        with self._lock:
+            # One count per bucket, then sum and total count
+            state = self._values.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            items = sorted((key, list(state)) for key, state in self._values.items())
+        for key, state in items:
+            for bound, count in zip(self.buckets, state):
+                le = f'le="{_number(bound)}"'
+                yield f"{self.name}_bucket{_label_text(self.labels, key, le)} {_number(count)}"
+            yield f"{self.name}_sum{_label_text(self.labels, key)} {_number(state[-2])}"
+            yield f"{self.name}_count{_label_text(self.labels, key)} {_number(state[-1])}"
+
+
+class CallbackMetric:
+    """A value read at scrape time, for state that already lives elsewhere (e.g. cache counters)."""
+
+    def __init__(self, name: str, help_text: str, read: Callable[[], float], kind: str = "gauge"):
+        self.name = name
+        self.help = help_text
+        self.read = read
+        self.kind = kind
+
+    def samples(self) -> Iterable[str]:
+        yield f"{self.name} {_number(self.read())}"
+
+
+class MetricsRegistry:
+    """Holds the process's metrics and renders them in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: dict[str, Counter | Histogram | CallbackMetric] = {}
+
+    def _register(self, metric):
+        # Re-registering a name (e.g. a second FREDService) replaces the earlier metric
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labels))
+
+    def histogram(self, name: str, help_text: str, labels: tuple[str, ...] = (),
+                  buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, labels, buckets))
+
+    def callback(self, name: str, help_text: str, read: Callable[[], float], kind: str = "gauge") -> CallbackMetric:
+        return self._register(CallbackMetric(name, help_text, read, kind))
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+TOOL_CALLS = REGISTRY.counter("fred_tool_calls_total", "MCP tool calls by outcome.", ("tool", "status"))
+TOOL_DURATION = REGISTRY.histogram("fred_tool_duration_seconds", "MCP tool call latency.", ("tool",))
+TOOL_RESULT_BYTES = REGISTRY.counter("fred_tool_result_bytes_total", "Text bytes returned by MCP tools.", ("tool",))
+UPSTREAM_REQUESTS = REGISTRY.counter(
+    "fred_upstream_requests_total", "FRED API responses by HTTP status ('error' for transport failures).",
+    ("endpoint", "status")
+)
+UPSTREAM_DURATION = REGISTRY.histogram(
+    "fred_upstream_duration_seconds", "FRED API request latency per attempt, including the body.", ("endpoint",)
+)
+UPSTREAM_BYTES = REGISTRY.counter(
+    "fred_upstream_response_bytes_total", "Response bytes downloaded from the FRED API.", ("endpoint",)
+)
+SEARCH_QUERIES = REGISTRY.counter(
+    "fred_search_queries_total", "Series searches by where they were answered ('index' or 'api').", ("source",)
+)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Any]:
+    """Record a trace span when tracing is enabled and OpenTelemetry is installed, else do nothing."""
+    if trace is None or not Config.TRACING_ENABLED:
+        yield None
+        return
+    with trace.get_tracer("fred-agent").start_as_current_span(name, attributes=attributes) as current:
+        yield current
+
+
+def result_bytes(result: Any) -> int:
+    """Size of a tool result's text, whether returned as a string or a CallToolResult."""
+    if isinstance(result, str):
+        return len(result.encode())
+    return sum(len(getattr(item, "text", "").encode()) for item in getattr(result, "content", []))
+
+
+def instrument_tool(func: Callable) -> Callable:
+    """Count, time and trace an async MCP tool; apply it beneath @mcp.tool()."""
+    name = func.__name__
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        status = "error"
+        with span(f"tool {name}", tool=name):
+            try:
+                result = await func(*args, **kwargs)
+                status = "ok"
+                TOOL_RESULT_BYTES.inc(result_bytes(result), tool=name)
+                return result
+            finally:
+                TOOL_DURATION.observe(time.perf_counter() - started, tool=name)
+                TOOL_CALLS.inc(tool=name, status=status)
+
+    return wrapper
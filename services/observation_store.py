@@ -0,0 +1,91 @@
+import time
+
+from services.sqlite_store import SQLiteStore
+
+
+class ObservationStore(SQLiteStore):
+    """Persistent SQLite store of FRED observations, keyed by series_id."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS series (
+            series_id TEXT PRIMARY KEY,
+            last_updated TEXT NOT NULL,
+            checked_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS observations (
+            series_id TEXT NOT NULL,
+            date TEXT NOT NULL,
+            value TEXT NOT NULL,
+            PRIMARY KEY (series_id, date)
+        ) WITHOUT ROWID;
+    """
+
+    def get_series_state(self, series_id: str) -> tuple[str, float] | None:
+        """Return (last_updated, checked_at) for a stored series, or None if unknown."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_updated, checked_at FROM series WHERE series_id = ?",
+                (series_id,)
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def mark_checked(self, series_id: str) -> None:
+        """Record that the series was confirmed up to date just now."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE series SET checked_at = ? WHERE series_id = ?",
+                (time.time(), series_id)
+            )
+
+    def get_refresh_start(self, series_id: str, lookback: int) -> str | None:
+        """Return the date to refetch from so the last `lookback` points pick up revisions."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT date FROM observations WHERE series_id = ? "
+                "ORDER BY date DESC LIMIT 1 OFFSET ?",
+                (series_id, max(lookback - 1, 0))
+            ).fetchone()
+            if row is None:
+                row = self._conn.execute(
+                    "SELECT MIN(date) FROM observations WHERE series_id = ?",
+                    (series_id,)
+                ).fetchone()
+        return row[0] if row else None
+
+    def save_observations(self, series_id: str, last_updated: str, observations: list[tuple[str, str]],
+                          replace_from: str | None = None) -> None:
+        """Store observations and the series' last_updated stamp in one transaction.
+
+        When `replace_from` is given, stored points on or after that date are dropped
+        first, so observations removed upstream do not linger.
+        """
+        rows = [(series_id, obs_date, value) for obs_date, value in observations]
+        with self._lock, self._conn:
+            if replace_from is None:
+                self._conn.execute("DELETE FROM observations WHERE series_id = ?", (series_id,))
+            else:
+                self._conn.execute(
+                    "DELETE FROM observations WHERE series_id = ? AND date >= ?",
+                    (series_id, replace_from)
+                )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO observations (series_id, date, value) VALUES (?, ?, ?)",
+                rows
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO series (series_id, last_updated, checked_at) VALUES (?, ?, ?)",
+                (series_id, last_updated, time.time())
+            )
+
+    def get_observations(self, series_id: str, limit: int, sort_order: str = 'asc',
+                         observation_start: str | None = None,
+                         observation_end: str | None = None) -> list[tuple[str, str]]:
+        """Return up to `limit` stored observations as (date, value) pairs."""
+        direction = "DESC" if sort_order == 'desc' else "ASC"
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT date, value FROM observations WHERE series_id = ? AND date >= ? AND date <= ? "
+                f"ORDER BY date {direction} LIMIT ?",
+                (series_id, observation_start or "0000-00-00", observation_end or "9999-12-31", limit)
+            ).fetchall()
+        return rows
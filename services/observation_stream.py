@@ -0,0 +1,72 @@
+import json
+import re
+from collections.abc import Callable
+
+import httpx
+
+OBSERVATIONS_KEY = re.compile(r'"observations"\s*:\s*\[')
+SEPARATORS = " \t\r\n,"
+
+
+class ObservationStreamDecoder:
+    """Incrementally pull (date, value) pairs out of a `series/observations` JSON body.
+
+    FRED observation records are flat objects of plain strings, so once inside the
+    "observations" array every '}' ends a record and the first ']' ends the array.
+    Each chunk's complete records are decoded in one json.loads call and reduced to
+    (date, value) pairs, so only one chunk's worth of dicts ever exists at a time.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._in_array = False
+        self.done = False
+
+    def feed(self, text: str) -> list[tuple[str, str]]:
+        """Consume the next chunk of the body and return the records it completed."""
+        if self.done:
+            return []
+        self._buffer += text
+
+        if not self._in_array:
+            match = OBSERVATIONS_KEY.search(self._buffer)
+            if match is None:
+                # Keep only enough tail to match the key across a chunk boundary
+                self._buffer = self._buffer[-64:]
+                return []
+            self._in_array = True
+            self._buffer = self._buffer[match.end():]
+
+        array_end = self._buffer.find("]")
+        if array_end >= 0:
+            self.done = True
+            end = array_end
+        else:
+            end = self._buffer.rfind("}") + 1
+            if end == 0:
+                return []
+
+        records = self._buffer[:end].strip(SEPARATORS)
+        self._buffer = "" if self.done else self._buffer[end:]
+        if not records:
+            return []
+        return [(obs["date"], obs["value"]) for obs in json.loads(f"[{records}]")]
+
+    def close(self) -> None:
+        """Check that the body held a complete observations array."""
+        if not self.done:
+            raise ValueError("response ended before the observations array was complete")
+
+
+async def decode_observations(response: httpx.Response, sink: Callable[[str, str], None]) -> int:
+    """Stream a response body into `sink(date, value)`, returning the number of records."""
+    decoder = ObservationStreamDecoder()
+    count = 0
+    async for chunk in response.aiter_text():
+        for date, value in decoder.feed(chunk):
+            sink(date, value)
+            count += 1
+        if decoder.done:
+            break
+    decoder.close()
+    return count
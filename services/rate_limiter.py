@@ -0,0 +1,138 @@
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+
+from services.shared_state import SharedState
+
+# Lower values are served first
+INTERACTIVE = 0
+BACKGROUND = 10
+
+request_priority: ContextVar[int] = ContextVar('request_priority', default=INTERACTIVE)
+
+
+@contextmanager
+def background_priority() -> Iterator[None]:
+    """Run FRED requests made in this context behind interactive tool calls."""
+    token = request_priority.set(BACKGROUND)
+    try:
+        yield
+    finally:
+        request_priority.reset(token)
+
+
+class RateLimiter:
+    """Async token bucket shared by every FRED request, served in priority order.
+
+    `rate_per_minute` tokens are added continuously up to `burst`. Waiters are queued
+    by (priority, arrival) so interactive calls overtake queued background refreshes.
+    With `shared`, tokens come from a bucket in SharedState instead, so several
+    processes stay within one quota; priority still orders each process's own waiters.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int, shared: SharedState | None = None,
+                 name: str = "fred"):
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self.shared = shared
+        self.name = name
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._dispatcher: asyncio.Task | None = None
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self, priority: int | None = None) -> None:
+        """Wait for a request slot. Defaults to the priority of the current context."""
+        if priority is None:
+            priority = request_priority.get()
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), waiter))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        await waiter
+
+    async def pause(self, seconds: float) -> None:
+        """Hold every waiter for `seconds`, e.g. after FRED answers 429."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        # Start refilling from empty once the pause is over
+        self._tokens = 0.0
+        self._updated_at = self._paused_until
+        if self.shared is not None:
+            await asyncio.to_thread(self.shared.pause, self.name, seconds)
+
+    async def _dispatch(self) -> None:
+        while self._waiters:
+            waiter = self._waiters[0][2]
+            if waiter.done():
+                # Cancelled while queued
+                heapq.heappop(self._waiters)
+                continue
+
+            now = time.monotonic()
+            if self._paused_until > now:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+
+            if self.shared is not None:
+                wait = await asyncio.to_thread(self.shared.take_token, self.name, self.rate, self.burst)
+                if wait == 0:
+                    # The queue may have changed while waiting on the database, and waiters may have been
+                    # cancelled; the token goes to the first one still waiting, or back to the bucket
+                    while self._waiters:
+                        first = heapq.heappop(self._waiters)[2]
+                        if not first.done():
+                            first.set_result(None)
+                            break
+                    else:
+                        await asyncio.to_thread(self.shared.return_token, self.name, self.burst)
+                else:
+                    await asyncio.sleep(wait)
+                continue
+
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                heapq.heappop(self._waiters)
+                waiter.set_result(None)
+            else:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def stats(self) -> dict[str, float]:
+        self._refill()
+        return {
+            "tokens": round(max(self._tokens, 0.0), 2),
+            "queued": sum(1 for _, _, waiter in self._waiters if not waiter.done()),
+            "paused_for": round(max(self._paused_until - time.monotonic(), 0.0), 2),
+        }
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff for the given (zero-based) retry attempt."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header given either as seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
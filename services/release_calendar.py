@@ -0,0 +1,63 @@
+import time
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+# FRED publishes dates, not times, in US Central time; a release day is treated as starting at midnight
+FRED_TIMEZONE = ZoneInfo("America/Chicago")
+
+
+class ReleaseCalendar:
+    """When each series next publishes, from its release (series/release) and that release's dates.
+
+    A series is considered current until the first scheduled release date after the
+    day it was last updated. From midnight (FRED time) of that date it is due: it
+    may publish at any moment, until its `last_updated` moves past the date.
+    """
+
+    def __init__(self):
+        self.series_release: dict[str, int] = {}
+        self.release_names: dict[int, str] = {}
+        self.release_dates: dict[int, list[date]] = {}
+        self.dates_fetched_at: dict[int, float] = {}
+
+    def set_series_release(self, series_id: str, release_id: int, name: str) -> None:
+        self.series_release[series_id.upper()] = release_id
+        self.release_names[release_id] = name
+
+    def set_release_dates(self, release_id: int, dates: list[str]) -> None:
+        self.release_dates[release_id] = sorted(date.fromisoformat(day) for day in dates)
+        self.dates_fetched_at[release_id] = time.time()
+
+    def release_of(self, series_id: str) -> int | None:
+        return self.series_release.get(series_id.upper())
+
+    def needs_refresh(self, series_id: str, max_age: float) -> bool:
+        """True when the series' release is unknown or its dates were fetched over `max_age` seconds ago."""
+        release_id = self.release_of(series_id)
+        if release_id is None:
+            return True
+        return time.time() - self.dates_fetched_at.get(release_id, 0.0) > max_age
+
+    def next_publication(self, series_id: str, last_updated: str) -> datetime | None:
+        """Start of the first scheduled release day after `last_updated` (FRED's "YYYY-MM-DD hh:mm:ss-05")."""
+        release_id = self.release_of(series_id)
+        if release_id is None or release_id not in self.release_dates:
+            return None
+        updated_on = date.fromisoformat(last_updated[:10])
+        for release_day in self.release_dates[release_id]:
+            if release_day > updated_on:
+                return datetime(release_day.year, release_day.month, release_day.day, tzinfo=FRED_TIMEZONE)
+        return None
+
+    def expiry(self, series_id: str, last_updated: str) -> float | None:
+        """Epoch time until which data last updated at `last_updated` stays current, or None when
+        that is unknown or already passed (the series is due)."""
+        publication = self.next_publication(series_id, last_updated)
+        if publication is None or publication.timestamp() <= time.time():
+            return None
+        return publication.timestamp()
+
+    def is_due(self, series_id: str, last_updated: str) -> bool:
+        """True when a scheduled release day has begun that `last_updated` does not reflect yet."""
+        publication = self.next_publication(series_id, last_updated)
+        return publication is not None and publication.timestamp() <= time.time()
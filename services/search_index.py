@@ -0,0 +1,147 @@
+import re
+from typing import Any
+
+from services.sqlite_store import SQLiteStore
+
+# Columns FRED's series/search can order by that the index can order by too
+ORDER_COLUMNS = {
+    "popularity": "m.popularity",
+    "title": "m.title",
+    "last_updated": "m.last_updated",
+    "observation_end": "m.observation_end",
+    "series_id": "m.series_id",
+}
+FILTER_COLUMNS = {"frequency", "units", "seasonal_adjustment"}
+WORD = re.compile(r"[A-Za-z0-9]+")
+
+
+def match_query(search_text: str) -> str | None:
+    """Turn free text into an FTS5 query: every word must match, the last one as a prefix."""
+    words = WORD.findall(search_text)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words[:-1]] + [f'"{words[-1]}"*']
+    return " ".join(terms)
+
+
+class SeriesSearchIndex(SQLiteStore):
+    """Local SQLite FTS5 index of FRED series metadata for fast keyword search.
+
+    Ranked by BM25 over id, title, units, frequency and notes, boosted by FRED's
+    popularity score. The FTS table indexes series_meta as external content, kept in
+    step by triggers, so an upsert touches only its own rows. Also keeps small key/value state for the harvester (what has
+    been crawled, when series/updates last ran); its lease lets one process harvest.
+    """
+
+    SCHEMA_VERSION = 1
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS series_meta (
+            id INTEGER PRIMARY KEY,
+            series_id TEXT NOT NULL UNIQUE,
+            title TEXT NOT NULL,
+            units TEXT NOT NULL,
+            frequency TEXT NOT NULL,
+            seasonal_adjustment TEXT NOT NULL,
+            popularity INTEGER NOT NULL,
+            notes TEXT NOT NULL,
+            observation_end TEXT NOT NULL,
+            last_updated TEXT NOT NULL
+        );
+        CREATE VIRTUAL TABLE IF NOT EXISTS series_fts USING fts5(
+            series_id, title, units, frequency, notes,
+            content = 'series_meta', content_rowid = 'id', tokenize = 'porter unicode61'
+        );
+        CREATE TRIGGER IF NOT EXISTS series_meta_insert AFTER INSERT ON series_meta BEGIN
+            INSERT INTO series_fts (rowid, series_id, title, units, frequency, notes)
+            VALUES (new.id, new.series_id, new.title, new.units, new.frequency, new.notes);
+        END;
+        CREATE TRIGGER IF NOT EXISTS series_meta_delete AFTER DELETE ON series_meta BEGIN
+            INSERT INTO series_fts (series_fts, rowid, series_id, title, units, frequency, notes)
+            VALUES ('delete', old.id, old.series_id, old.title, old.units, old.frequency, old.notes);
+        END;
+        CREATE TRIGGER IF NOT EXISTS series_meta_update AFTER UPDATE ON series_meta BEGIN
+            INSERT INTO series_fts (series_fts, rowid, series_id, title, units, frequency, notes)
+            VALUES ('delete', old.id, old.series_id, old.title, old.units, old.frequency, old.notes);
+            INSERT INTO series_fts (rowid, series_id, title, units, frequency, notes)
+            VALUES (new.id, new.series_id, new.title, new.units, new.frequency, new.notes);
+        END;
+        CREATE TABLE IF NOT EXISTS index_state (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
+
+    def add_series(self, records: list[dict[str, Any]]) -> int:
+        """Insert or update series records as FRED returns them; returns how many were stored."""
+        rows = [
+            (
+                record["id"], record.get("title", ""), record.get("units", ""), record.get("frequency", ""),
+                record.get("seasonal_adjustment", ""), int(record.get("popularity") or 0),
+                record.get("notes", ""), record.get("observation_end", ""), record.get("last_updated", ""),
+            )
+            for record in records if record.get("id")
+        ]
+        if not rows:
+            return 0
+        # An upsert keeps the row's id, and the triggers swap its FTS entry by that rowid
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO series_meta (series_id, title, units, frequency, seasonal_adjustment, popularity, "
+                "notes, observation_end, last_updated) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(series_id) DO UPDATE SET title = excluded.title, units = excluded.units, "
+                "frequency = excluded.frequency, seasonal_adjustment = excluded.seasonal_adjustment, "
+                "popularity = excluded.popularity, notes = excluded.notes, "
+                "observation_end = excluded.observation_end, last_updated = excluded.last_updated",
+                rows
+            )
+        return len(rows)
+
+    def search(self, search_text: str, limit: int = 50, offset: int = 0, order_by: str | None = None,
+               sort_order: str | None = None, filter_variable: str | None = None,
+               filter_value: str | None = None) -> list[dict[str, Any]] | None:
+        """Return matching series, or None when the query cannot be answered locally."""
+        query = match_query(search_text)
+        if query is None:
+            return None
+        if order_by in (None, "search_rank"):
+            # bm25 is negative, lower is better; popular series are pulled further ahead
+            rank = "bm25(series_fts, 20.0, 10.0, 2.0, 1.0, 0.5) * (1.0 + m.popularity / 50.0)"
+            order = f"{rank} {'DESC' if sort_order == 'asc' else 'ASC'}"
+        elif order_by in ORDER_COLUMNS:
+            default = "desc" if order_by == "popularity" else "asc"
+            order = f"{ORDER_COLUMNS[order_by]} {(sort_order or default).upper()}"
+        else:
+            return None
+
+        where = "series_fts MATCH ?"
+        params: list[Any] = [query]
+        if filter_variable:
+            if filter_variable not in FILTER_COLUMNS:
+                return None
+            where += f" AND m.{filter_variable} = ? COLLATE NOCASE"
+            params.append(filter_value or "")
+
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT m.series_id, m.title, m.units, m.frequency, m.seasonal_adjustment, m.popularity, "
+                "m.observation_end, m.last_updated FROM series_fts "
+                "JOIN series_meta m ON m.id = series_fts.rowid "
+                f"WHERE {where} ORDER BY {order} LIMIT ? OFFSET ?",
+                (*params, limit, offset)
+            )
+            columns = [description[0] for description in cursor.description]
+            rows = cursor.fetchall()
+        return [dict(zip(columns, row)) for row in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM series_meta").fetchone()[0]
+
+    def get_state(self, key: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM index_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_state(self, key: str, value: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO index_state (key, value) VALUES (?, ?)", (key, value))
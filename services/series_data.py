@@ -0,0 +1,123 @@
+import math
+from array import array
+from bisect import bisect_left
+from datetime import date
+from typing import Iterable, TypedDict
+
+
+class SeriesData:
+    """Compact columnar observations: date ordinals and float64 values, NaN for missing."""
+
+    __slots__ = ("series_id", "ordinals", "values")
+
+    def __init__(self, series_id: str, ordinals: array | None = None, values: array | None = None):
+        self.series_id = series_id
+        self.ordinals = ordinals if ordinals is not None else array("l")
+        self.values = values if values is not None else array("d")
+
+    @classmethod
+    def from_observations(cls, series_id: str, observations: Iterable[tuple[str, str]]) -> "SeriesData":
+        """Parse (date, value) pairs as FRED reports them; the '.' placeholder becomes NaN."""
+        data = cls(series_id)
+        for obs_date, value in observations:
+            data.append(obs_date, value)
+        return data
+
+    def append(self, date_text: str, value_text: str) -> None:
+        self.ordinals.append(date.fromisoformat(date_text).toordinal())
+        self.values.append(math.nan if value_text == "." else float(value_text))
+
+    def __len__(self) -> int:
+        return len(self.ordinals)
+
+    def date_at(self, index: int) -> str:
+        return date.fromordinal(self.ordinals[index]).isoformat()
+
+    def dropna(self) -> "SeriesData":
+        """Return a copy without missing values."""
+        keep = [i for i, value in enumerate(self.values) if not math.isnan(value)]
+        if len(keep) == len(self.values):
+            return self
+        return SeriesData(
+            self.series_id,
+            array("l", (self.ordinals[i] for i in keep)),
+            array("d", (self.values[i] for i in keep))
+        )
+
+    def since(self, start: str) -> "SeriesData":
+        """Return the observations dated on or after `start` (ascending series only)."""
+        first = bisect_left(self.ordinals, date.fromisoformat(start).toordinal())
+        return SeriesData(self.series_id, self.ordinals[first:], self.values[first:])
+
+    def tail(self, count: int) -> "SeriesData":
+        """Return the last `count` observations (all of them when `count` is not positive)."""
+        if count <= 0 or count >= len(self):
+            return self
+        return SeriesData(self.series_id, self.ordinals[-count:], self.values[-count:])
+
+    def rows(self) -> Iterable[tuple[str, float]]:
+        """Yield (ISO date, value) pairs."""
+        for ordinal, value in zip(self.ordinals, self.values):
+            yield date.fromordinal(ordinal).isoformat(), value
+
+    @property
+    def nbytes(self) -> int:
+        return self.ordinals.itemsize * len(self.ordinals) + self.values.itemsize * len(self.values)
+
+
+def format_value(value: float) -> str:
+    """Format a float with the shortest repr that round-trips (e.g. 3.5, 21433.226)."""
+    if math.isnan(value):
+        return "."
+    return repr(value)
+
+
+class SeriesTable(TypedDict):
+    """Structured tool output: date-aligned observations with one values list per column.
+
+    `limited` is set when the request's `limit` may have cut the observations short,
+    i.e. the table is not necessarily everything in the requested date range.
+    """
+    columns: list[str]
+    dates: list[str]
+    values: list[list[float | None]]
+    note: str
+    errors: list[str]
+    limited: bool
+
+
+def build_table(series: list[SeriesData], columns: list[str] | None = None, descending: bool = False,
+                note: str = "", errors: list[str] | None = None, decimals: int | None = None,
+                limited: bool = False) -> SeriesTable:
+    """Align series on the union of their dates; missing points become None."""
+    ordinals = sorted({ordinal for data in series for ordinal in data.ordinals}, reverse=descending)
+    position = {ordinal: i for i, ordinal in enumerate(ordinals)}
+    values = []
+    for data in series:
+        column: list[float | None] = [None] * len(ordinals)
+        for ordinal, value in zip(data.ordinals, data.values):
+            if not math.isnan(value):
+                column[position[ordinal]] = round(value, decimals) if decimals is not None else value
+        values.append(column)
+    return {
+        "columns": columns or [data.series_id for data in series],
+        "dates": [date.fromordinal(ordinal).isoformat() for ordinal in ordinals],
+        "values": values,
+        "note": note,
+        "errors": errors or [],
+        "limited": limited,
+    }
+
+
+def table_to_csv(table: SeriesTable) -> str:
+    """Render a table as header-once CSV, the text fallback for clients without structured content."""
+    lines = [table["note"]] if table["note"] else []
+    if table["dates"]:
+        lines.append(",".join(["date", *table["columns"]]))
+        for i, obs_date in enumerate(table["dates"]):
+            cells = (column[i] for column in table["values"])
+            lines.append(",".join([obs_date, *("" if value is None else format_value(value) for value in cells)]))
+    if table["errors"]:
+        lines.append("Errors:")
+        lines.extend(table["errors"])
+    return "\n".join(lines)
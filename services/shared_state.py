@@ -0,0 +1,108 @@
+import json
+import time
+from typing import Any
+
+from services.sqlite_store import SQLiteStore
+
+# Expired cache rows are purged once every this many writes
+PURGE_EVERY = 256
+
+
+class SharedState(SQLiteStore):
+    """Cross-process state in one SQLite file: a response cache and token buckets.
+
+    Lets several server workers on one machine share cached FRED responses and a
+    single FRED quota. Every operation is one short transaction; token buckets use
+    wall-clock time since monotonic clocks are not comparable across processes.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS cache (
+            key TEXT PRIMARY KEY,
+            expires_at REAL NOT NULL,
+            value TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS token_buckets (
+            name TEXT PRIMARY KEY,
+            tokens REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            paused_until REAL NOT NULL
+        );
+    """
+
+    def __init__(self, path: str):
+        # Autocommit mode, so the bucket can take a write lock up front with BEGIN IMMEDIATE
+        super().__init__(path, isolation_level=None)
+        self._writes = 0
+
+    def cache_get(self, key: str) -> Any | None:
+        """Return an unexpired cached value, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM cache WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def cache_set(self, key: str, value: Any, ttl: float) -> None:
+        """Store a JSON-serializable value for `ttl` seconds."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, expires_at, value) VALUES (?, ?, ?)",
+                (key, now + ttl, json.dumps(value))
+            )
+            self._writes += 1
+            if self._writes % PURGE_EVERY == 0:
+                self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+
+    def take_token(self, name: str, rate: float, burst: int) -> float:
+        """Take a token from the named bucket, refilled at `rate` per second up to `burst`.
+
+        Returns 0 when a token was taken, otherwise how long to wait before trying again.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = self._conn.execute(
+                    "SELECT tokens, updated_at, paused_until FROM token_buckets WHERE name = ?", (name,)
+                ).fetchone()
+                tokens, updated_at, paused_until = row if row else (float(burst), now, 0.0)
+                if paused_until > now:
+                    wait = paused_until - now
+                else:
+                    tokens = min(burst, tokens + max(now - updated_at, 0.0) * rate)
+                    if tokens >= 1:
+                        tokens -= 1
+                        wait = 0.0
+                    else:
+                        wait = (1 - tokens) / rate
+                    updated_at = now
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO token_buckets (name, tokens, updated_at, paused_until) "
+                    "VALUES (?, ?, ?, ?)",
+                    (name, tokens, updated_at, paused_until)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return wait
+
+    def return_token(self, name: str, burst: int) -> None:
+        """Put back a token taken for a request that was cancelled before it could use it."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE token_buckets SET tokens = MIN(tokens + 1, ?) WHERE name = ?", (burst, name)
+            )
+
+    def pause(self, name: str, seconds: float) -> None:
+        """Empty the named bucket and hold it for `seconds`, for every process."""
+        until = time.time() + seconds
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO token_buckets (name, tokens, updated_at, paused_until) VALUES (?, 0, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET tokens = 0, updated_at = MAX(updated_at, excluded.updated_at), "
+                "paused_until = MAX(paused_until, excluded.paused_until)",
+                (name, until, until)
+            )
@@ -0,0 +1,67 @@
+import os
+import sqlite3
+import threading
+import time
+
+
+class SQLiteStore:
+    """Base for the SQLite-backed stores: one WAL connection shared across threads.
+
+    Subclasses give their tables in SCHEMA and hold `_lock` around every use of
+    `_conn`. Every store also has named leases, so processes sharing the file can
+    agree on which of them does a piece of work.
+    """
+
+    SCHEMA = ""
+    # Bumped by a store whose tables change shape; a file written with another version is cleared
+    SCHEMA_VERSION = 0
+    LEASE_SCHEMA = """
+        CREATE TABLE IF NOT EXISTS leases (
+            name TEXT PRIMARY KEY,
+            owner TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        );
+    """
+
+    def __init__(self, path: str, **connect_args):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10, **connect_args)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA_VERSION:
+            self._drop_tables()
+            self._conn.execute(f"PRAGMA user_version = {int(self.SCHEMA_VERSION)}")
+        self._conn.executescript(self.SCHEMA + self.LEASE_SCHEMA)
+
+    def _drop_tables(self) -> None:
+        # Virtual tables first, which also drops their shadow tables
+        tables = self._conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' "
+            "ORDER BY sql NOT LIKE 'CREATE VIRTUAL TABLE%'"
+        ).fetchall()
+        for (name,) in tables:
+            self._conn.execute(f'DROP TABLE IF EXISTS "{name}"')
+        self._conn.commit()
+
+    def claim_lease(self, name: str, owner: str, seconds: float) -> bool:
+        """Take or renew a named lease; False while another owner holds an unexpired one."""
+        now = time.time()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE leases.owner = excluded.owner OR leases.expires_at <= ?",
+                (name, owner, now + seconds, now)
+            )
+        return cursor.rowcount > 0
+
+    def release_lease(self, name: str, owner: str) -> None:
+        """Give up a lease this owner holds, so others need not wait for it to expire."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM leases WHERE name = ? AND owner = ?", (name, owner))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
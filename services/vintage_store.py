@@ -0,0 +1,138 @@
+from datetime import date, timedelta
+
+from services.sqlite_store import SQLiteStore
+
+# FRED's bounds for real-time periods
+EARLIEST_REALTIME = "1776-07-04"
+LATEST_REALTIME = "9999-12-31"
+
+
+class VintageStore(SQLiteStore):
+    """Persistent SQLite store of ALFRED vintage histories, as deltas between vintages.
+
+    Each row is one value of one observation together with the real-time period in
+    which it was the published value (FRED's output_type=1 rows). A new vintage adds
+    rows only for the observations it adds or revises and closes the rows it
+    replaces, so unchanged values are stored once however many vintages repeat them.
+    The value as of any date is a single indexed lookup of the rows whose period
+    covers it; no vintage is ever replayed.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS vintage_series (
+            series_id TEXT PRIMARY KEY,
+            last_updated TEXT NOT NULL,
+            synced_through TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS vintage_observations (
+            series_id TEXT NOT NULL,
+            date TEXT NOT NULL,
+            realtime_start TEXT NOT NULL,
+            realtime_end TEXT NOT NULL,
+            value TEXT NOT NULL,
+            PRIMARY KEY (series_id, date, realtime_start)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS vintage_periods
+            ON vintage_observations (series_id, realtime_start, realtime_end);
+    """
+
+    def get_series_state(self, series_id: str) -> tuple[str, str] | None:
+        """Return (last_updated, synced_through) for a stored series, or None if unknown."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_updated, synced_through FROM vintage_series WHERE series_id = ?", (series_id,)
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def save_periods(self, series_id: str, periods: list[tuple[str, str, str, str]], since: str | None,
+                     last_updated: str, synced_through: str) -> None:
+        """Merge (date, realtime_start, realtime_end, value) rows fetched for the real-time period
+        from `since` onward into the store, in one transaction.
+
+        Without `since` the rows are the full history and replace what is stored. With
+        it, FRED reports rows that began earlier as starting on `since`; those extend
+        the stored row carrying the same value instead of being added again. A row
+        that is added closes the stored row it replaces, which FRED may not report
+        again when that row's period ended just before `since`.
+        """
+        with self._lock, self._conn:
+            if since is None:
+                self._conn.execute("DELETE FROM vintage_observations WHERE series_id = ?", (series_id,))
+            for obs_date, realtime_start, realtime_end, value in periods:
+                if since is not None and realtime_start <= since:
+                    extended = self._conn.execute(
+                        "UPDATE vintage_observations SET realtime_end = ? WHERE series_id = ? AND date = ? "
+                        "AND value = ? AND realtime_start <= ? AND realtime_end >= ?",
+                        (realtime_end, series_id, obs_date, value, since, since)
+                    ).rowcount
+                    if extended:
+                        continue
+                if since is not None:
+                    self._conn.execute(
+                        "UPDATE vintage_observations SET realtime_end = ? WHERE series_id = ? AND date = ? "
+                        "AND realtime_start < ? AND realtime_end >= ?",
+                        ((date.fromisoformat(realtime_start) - timedelta(days=1)).isoformat(), series_id, obs_date,
+                         realtime_start, realtime_start)
+                    )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO vintage_observations VALUES (?, ?, ?, ?, ?)",
+                    (series_id, obs_date, realtime_start, realtime_end, value)
+                )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO vintage_series (series_id, last_updated, synced_through) VALUES (?, ?, ?)",
+                (series_id, last_updated, synced_through)
+            )
+
+    def _select(self, columns: str, where: str, params: tuple, observation_start: str | None,
+                observation_end: str | None, order: str, limit: int) -> list[tuple]:
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT {columns} FROM vintage_observations WHERE series_id = ? AND {where} "
+                f"AND date >= ? AND date <= ? ORDER BY {order} LIMIT ?",
+                (*params, observation_start or "0000-00-00", observation_end or "9999-12-31", limit)
+            ).fetchall()
+
+    def as_of(self, series_id: str, as_of: str, limit: int, sort_order: str = "asc",
+              observation_start: str | None = None, observation_end: str | None = None) -> list[tuple[str, str]]:
+        """(date, value) pairs as published on `as_of`."""
+        direction = "DESC" if sort_order == "desc" else "ASC"
+        return self._select(
+            "date, value", "realtime_start <= ? AND realtime_end >= ?", (series_id, as_of, as_of),
+            observation_start, observation_end, f"date {direction}", limit
+        )
+
+    def periods(self, series_id: str, realtime_start: str, realtime_end: str, limit: int,
+                sort_order: str = "asc", observation_start: str | None = None,
+                observation_end: str | None = None) -> list[tuple[str, str, str, str]]:
+        """(date, realtime_start, realtime_end, value) rows whose period overlaps the given one."""
+        direction = "DESC" if sort_order == "desc" else "ASC"
+        return self._select(
+            "date, realtime_start, realtime_end, value", "realtime_start <= ? AND realtime_end >= ?",
+            (series_id, realtime_end, realtime_start), observation_start, observation_end,
+            f"date {direction}, realtime_start", limit
+        )
+
+    def revisions(self, series_id: str, realtime_start: str, realtime_end: str, limit: int,
+                  sort_order: str = "asc", observation_start: str | None = None,
+                  observation_end: str | None = None) -> list[tuple[str, str, str]]:
+        """(vintage date, date, value) for every value first published within the given period."""
+        direction = "DESC" if sort_order == "desc" else "ASC"
+        return self._select(
+            "realtime_start, date, value", "realtime_start >= ? AND realtime_start <= ?",
+            (series_id, realtime_start, realtime_end), observation_start, observation_end,
+            f"realtime_start {direction}, date", limit
+        )
+
+    def first_releases(self, series_id: str, limit: int, sort_order: str = "asc",
+                       observation_start: str | None = None,
+                       observation_end: str | None = None) -> list[tuple[str, str, str]]:
+        """(date, value, realtime_start) of each observation's initial release."""
+        direction = "DESC" if sort_order == "desc" else "ASC"
+        with self._lock:
+            # SQLite returns the other columns from the row that supplies MIN()
+            return self._conn.execute(
+                "SELECT date, value, MIN(realtime_start) FROM vintage_observations "
+                "WHERE series_id = ? AND date >= ? AND date <= ? "
+                f"GROUP BY date ORDER BY date {direction} LIMIT ?",
+                (series_id, observation_start or "0000-00-00", observation_end or "9999-12-31", limit)
+            ).fetchall()
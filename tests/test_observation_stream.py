@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from services.observation_stream import ObservationStreamDecoder
+
+RECORDS = [{"realtime_start": "2026-10-16", "realtime_end": "2026-10-16", "date": f"20{year:02d}-01-01",
+            "value": "." if year == 3 else f"{year}.5"} for year in range(12)]
+
+
+def body(records=RECORDS, **fields) -> str:
+    payload = {"realtime_start": "2026-10-16", "units": "lin", "count": len(records), **fields,
+               "observations": records}
+    return json.dumps(payload, indent=1)
+
+
+def decode(text: str, size: int) -> list[tuple[str, str]]:
+    decoder = ObservationStreamDecoder()
+    pairs = []
+    for offset in range(0, len(text), size):
+        pairs += decoder.feed(text[offset:offset + size])
+    decoder.close()
+    return pairs
+
+
+EXPECTED = [(record["date"], record["value"]) for record in RECORDS]
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 15, 64, 100_000])
+def test_any_chunking_yields_every_record(size):
+    # Size 1 and 7 split the key and each record across chunks; 100_000 is the whole body at once
+    assert decode(body(), size) == EXPECTED
+
+
+def test_compact_body():
+    text = json.dumps({"count": 2, "observations": RECORDS[:2], "offset": 0}, separators=(",", ":"))
+    assert decode(text, 5) == EXPECTED[:2]
+
+
+def test_long_header_before_key():
+    text = body(notes="x" * 500)
+    assert decode(text, 3) == EXPECTED
+
+
+def test_empty_array():
+    assert decode(body([]), 4) == []
+
+
+def test_array_ending_mid_chunk_stops_decoding():
+    decoder = ObservationStreamDecoder()
+    text = body(RECORDS[:3])
+    assert decoder.feed(text + '{"ignored": [{"date": "x"}]}') == EXPECTED[:3]
+    assert decoder.done
+    assert decoder.feed('{"date": "2030-01-01", "value": "1"}') == []
+    decoder.close()
+
+
+@pytest.mark.parametrize("cut", ["before key", "mid record", "before closing bracket"])
+def test_truncated_body_raises_on_close(cut):
+    text = body()
+    end = {"before key": text.index('"observations"') + 5,
+           "mid record": text.rindex('"value"'),
+           "before closing bracket": text.rindex("]")}[cut]
+    decoder = ObservationStreamDecoder()
+    decoder.feed(text[:end])
+    with pytest.raises(ValueError):
+        decoder.close()
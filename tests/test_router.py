@@ -0,0 +1,73 @@
+from datetime import date
+
+import pytest
+
+from router import route_query
+
+TODAY = date(2026, 10, 16)
+
+
+@pytest.mark.parametrize("question", [
+    # A narrower series than the alias names
+    "What is the current unemployment rate in California?",
+    "what is the current youth unemployment rate",
+    "current unemployment rate for women",
+    "current GDP of China",
+    "current UK inflation rate",
+    "what is the current consumer price index for food",
+    "15-year mortgage rate now",
+    # Broad aliases
+    "current mortgage interest rate",
+    "what is the current interest rate",
+    "current pce",
+    # More than reading values off one series
+    "compare the unemployment rate and inflation",
+    "how has cpi changed since 2020",
+    "what was the unemployment rate a year ago",
+    "cpi in march",
+    # No series named
+    "what is it now",
+])
+def test_rejects_questions_it_cannot_answer_confidently(question):
+    assert route_query(question, today=TODAY) is None
+
+
+def test_does_not_follow_up_on_recent_series():
+    assert route_query("and now?", recent=["UNRATE"], today=TODAY) is None
+
+
+@pytest.mark.parametrize("question, series_id", [
+    ("What's the current unemployment rate?", "UNRATE"),
+    ("What is the current US unemployment rate?", "UNRATE"),
+    ("real gdp now", "GDPC1"),
+    ("latest 10-year treasury yield", "DGS10"),
+    ("what is the fed funds rate", "FEDFUNDS"),
+    ("current core pce", "PCEPILFE"),
+    ("S&P 500 today", "SP500"),
+    ("what is UNRATE now [System hint: use tools]", "UNRATE"),
+])
+def test_routes_latest_values(question, series_id):
+    route = route_query(question, today=TODAY)
+    assert route is not None
+    assert route["kind"] == "latest"
+    assert route["series_id"] == series_id
+
+
+def test_inflation_reads_price_index_as_percent_change():
+    route = route_query("current inflation", today=TODAY)
+    assert route["tool_input"]["series_id"] == "CPIAUCSL"
+    assert route["tool_input"]["units"] == "pc1"
+
+
+@pytest.mark.parametrize("question, start, end", [
+    ("CPI in March 2020", "2020-03-01", "2020-03-31"),
+    ("10-year treasury since 2019", "2019-01-01", None),
+    ("payrolls from 2019 to 2021", "2019-01-01", "2021-12-31"),
+    ("mortgage rates over the past 2 years", "2024-10-16", None),
+])
+def test_routes_date_ranges(question, start, end):
+    route = route_query(question, today=TODAY)
+    assert route is not None
+    assert route["kind"] == "range"
+    assert route["tool_input"]["observation_start"] == start
+    assert route["tool_input"].get("observation_end") == end
@@ -0,0 +1,42 @@
+import time
+
+import pytest
+
+from services.search_index import SeriesSearchIndex
+
+
+def record(number: int, title: str = "Monthly series") -> dict:
+    return {"id": f"S{number}", "title": f"{title} {number}", "units": "Percent", "frequency": "Monthly",
+            "popularity": number % 100, "notes": "Source: synthetic"}
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = SeriesSearchIndex(str(tmp_path / "search_index.sqlite3"))
+    yield index
+    index.close()
+
+
+def test_upsert_into_populated_index(index):
+    index.add_series([record(n) for n in range(20000)])
+
+    started = time.perf_counter()
+    stored = index.add_series([record(n, "Revised quarterly") for n in range(19500, 20500)])
+    elapsed = time.perf_counter() - started
+
+    assert stored == 1000
+    assert index.count() == 20500
+    # Each replaced row's FTS entry is swapped by rowid; a scan per row took seconds here
+    assert elapsed < 2.0
+    assert len(index.search("revised quarterly", limit=2000)) == 1000
+    assert [row["title"] for row in index.search("S19999 quarterly")] == ["Revised quarterly 19999"]
+    assert [row["title"] for row in index.search("S100 series")] == ["Monthly series 100"]
+
+
+def test_replaced_text_is_no_longer_matched(index):
+    index.add_series([{"id": "UNRATE", "title": "Unemployment Rate", "notes": "old notes"}])
+    index.add_series([{"id": "UNRATE", "title": "Civilian Unemployment Rate", "notes": "new notes"}])
+
+    assert index.count() == 1
+    assert [row["series_id"] for row in index.search("civilian")] == ["UNRATE"]
+    assert index.search("old notes") == []
@@ -0,0 +1,95 @@
+import pytest
+
+from tool_memo import ToolResultMemo, slice_window
+
+DATES = ["2020-01-01", "2020-02-01", "2020-03-01", "2020-04-01", "2020-05-01", "2020-06-01"]
+
+
+def table(dates=DATES, limited=False, **extra) -> dict:
+    return {"columns": ["UNRATE"], "dates": list(dates), "values": [[float(i) for i in range(len(dates))]],
+            "note": "", "errors": [], "limited": limited, **extra}
+
+
+FULL_ARGS = {"series_id": "UNRATE", "observation_start": "2020-01-01", "observation_end": "2020-06-30"}
+
+
+def test_narrower_window_is_sliced():
+    result = slice_window(FULL_ARGS, table(), {"observation_start": "2020-02-01", "observation_end": "2020-04-15"})
+    assert result["dates"] == ["2020-02-01", "2020-03-01", "2020-04-01"]
+    assert result["values"] == [[1.0, 2.0, 3.0]]
+    assert result["limited"] is False
+
+
+def test_descending_request_takes_latest_rows():
+    args = {"observation_start": "2020-01-01", "observation_end": "2020-06-30", "limit": 2, "sort_order": "desc"}
+    result = slice_window(FULL_ARGS, table(), args)
+    assert result["dates"] == ["2020-06-01", "2020-05-01"]
+    assert result["values"] == [[5.0, 4.0]]
+    assert result["limited"] is True
+
+
+def test_ascending_limit_cuts_from_start():
+    result = slice_window(FULL_ARGS, table(), {"limit": 2, "observation_start": "2020-03-01"})
+    assert result["dates"] == ["2020-03-01", "2020-04-01"]
+
+
+@pytest.mark.parametrize("args", [
+    {"observation_start": "2019-06-01"},  # starts before the cached window
+    {"observation_start": "2020-01-01", "observation_end": "2021-01-01"},  # ends after it, with room to spare
+    {"observation_end": "2020-03-01", "sort_order": "desc"},  # no start: reaches back past the window
+    {"limit": 2, "sort_order": "desc"},  # latest rows may postdate the window
+])
+def test_window_outside_cached_span_is_a_miss(args):
+    assert slice_window(FULL_ARGS, table(), args) is None
+
+
+def test_window_past_end_is_answered_when_limit_is_reached_first():
+    result = slice_window(FULL_ARGS, table(), {"observation_start": "2020-02-01", "observation_end": "2021-01-01",
+                                               "limit": 3})
+    assert result["dates"] == ["2020-02-01", "2020-03-01", "2020-04-01"]
+
+
+def test_limited_ascending_table_is_complete_only_up_to_its_last_date():
+    cached = table(DATES[:4], limited=True)
+    args = {"observation_start": "2020-01-01", "observation_end": "2020-12-31", "limit": 4}
+    assert slice_window(args, cached, {"observation_start": "2020-02-01", "observation_end": "2020-04-01"})["dates"] \
+        == ["2020-02-01", "2020-03-01", "2020-04-01"]
+    # May have stopped short of later observations
+    assert slice_window(args, cached, {"observation_start": "2020-03-01", "observation_end": "2020-06-01"}) is None
+
+
+def test_limited_descending_table_is_complete_only_down_to_its_first_date():
+    cached = table(DATES[2:], limited=True)
+    args = {"limit": 4, "sort_order": "desc"}
+    assert slice_window(args, cached, {"limit": 2, "sort_order": "desc"})["dates"] == ["2020-06-01", "2020-05-01"]
+    assert slice_window(args, cached, {"limit": 10, "sort_order": "desc"}) is None
+    assert slice_window(args, cached, {"observation_start": "2020-01-01", "limit": 10}) is None
+
+
+def test_table_without_limited_flag_is_treated_as_limited():
+    cached = table()
+    del cached["limited"]
+    assert slice_window({}, cached, {"observation_start": "2020-01-01", "observation_end": "2020-12-31"}) is None
+
+
+@pytest.mark.parametrize("cached", [
+    table(note="Downsampled from 600 to 6 points (lttb)."),
+    table(errors=["GDP: not found"]),
+    table(dates=[]),
+    {**table(), "columns": ["UNRATE", "GDP"], "values": [[1.0] * 6, [2.0] * 6]},
+])
+def test_tables_that_cannot_be_sliced(cached):
+    assert slice_window(FULL_ARGS, cached, {"observation_start": "2020-02-01"}) is None
+
+
+def test_memo_answers_narrower_window_for_same_series_only():
+    memo = ToolResultMemo(ttl=60)
+    memo.put("get_series_observations", FULL_ARGS, (table(), "text"))
+
+    hit = memo.get("get_series_observations", {"series_id": "unrate", "observation_start": "2020-05-01",
+                                                "observation_end": "2020-06-30"})
+    assert hit[0]["dates"] == ["2020-05-01", "2020-06-01"]
+    assert memo.get("get_series_observations", {"series_id": "GDP", "observation_start": "2020-05-01"}) is None
+    assert memo.get("get_series_observations", {**FULL_ARGS, "units": "pc1", "observation_start": "2020-05-01"}) \
+        is None
+    assert memo.stats()["window_hits"] == 1
@@ -0,0 +1,55 @@
+import pytest
+
+from services.vintage_store import EARLIEST_REALTIME, LATEST_REALTIME, VintageStore
+
+
+@pytest.fixture
+def store():
+    store = VintageStore(":memory:")
+    yield store
+    store.close()
+
+
+def all_periods(store: VintageStore) -> list[tuple[str, str, str, str]]:
+    return store.periods("GDP", EARLIEST_REALTIME, LATEST_REALTIME, 100)
+
+
+def test_revision_starting_on_last_sync_date_closes_open_row(store):
+    # Synced on a release morning, before the release
+    store.save_periods("GDP", [("2026-04-01", "2026-07-30", LATEST_REALTIME, "100")], None,
+                       "2026-07-30 07:31:00-05", "2026-10-16")
+    # Synced again after it: FRED returns only the new row, starting on the previous sync date
+    store.save_periods("GDP", [("2026-04-01", "2026-10-16", LATEST_REALTIME, "101")], "2026-10-16",
+                       "2026-10-16 07:31:00-05", "2026-10-16")
+
+    assert all_periods(store) == [
+        ("2026-04-01", "2026-07-30", "2026-10-15", "100"),
+        ("2026-04-01", "2026-10-16", LATEST_REALTIME, "101"),
+    ]
+    assert store.as_of("GDP", "2026-10-15", 10) == [("2026-04-01", "100")]
+    assert store.as_of("GDP", "2026-10-16", 10) == [("2026-04-01", "101")]
+    assert store.get_series_state("GDP") == ("2026-10-16 07:31:00-05", "2026-10-16")
+
+
+def test_unchanged_value_extends_stored_row(store):
+    store.save_periods("GDP", [("2026-04-01", "2026-07-30", LATEST_REALTIME, "100")], None, "a", "2026-08-01")
+    store.save_periods("GDP", [("2026-04-01", "2026-08-01", LATEST_REALTIME, "100"),
+                               ("2026-07-01", "2026-10-16", LATEST_REALTIME, "105")], "2026-08-01", "b", "2026-10-16")
+
+    assert all_periods(store) == [
+        ("2026-04-01", "2026-07-30", LATEST_REALTIME, "100"),
+        ("2026-07-01", "2026-10-16", LATEST_REALTIME, "105"),
+    ]
+
+
+def test_revision_after_last_sync_date_keeps_reported_end(store):
+    store.save_periods("GDP", [("2026-04-01", "2026-07-30", LATEST_REALTIME, "100")], None, "a", "2026-08-01")
+    # FRED reports the old row closed the day before the revision, plus the revision
+    store.save_periods("GDP", [("2026-04-01", "2026-08-01", "2026-08-27", "100"),
+                               ("2026-04-01", "2026-08-28", LATEST_REALTIME, "99")], "2026-08-01", "b", "2026-10-16")
+
+    assert all_periods(store) == [
+        ("2026-04-01", "2026-07-30", "2026-08-27", "100"),
+        ("2026-04-01", "2026-08-28", LATEST_REALTIME, "99"),
+    ]
+    assert store.first_releases("GDP", 10) == [("2026-04-01", "100", "2026-07-30")]
@@ -0,0 +1,143 @@
+import json
+import time
+from collections import OrderedDict
+from typing import Any
+
+# Tool results are (structured content or None, text content)
+ToolPayload = tuple[dict | None, str]
+
+# Observation tools whose results can be cut down to a narrower date window
+WINDOW_TOOLS = {"get_series_observations"}
+WINDOW_ARGS = ("limit", "sort_order", "observation_start", "observation_end")
+WINDOW_DEFAULTS = {"limit": 100, "sort_order": "asc"}
+EARLIEST = "0000-00-00"
+LATEST = "9999-99-99"
+
+
+def normalize_args(tool_input: dict) -> dict:
+    """Drop unset arguments and upper-case series IDs, which FRED treats case-insensitively."""
+    normalized = {}
+    for name, value in tool_input.items():
+        if value is None:
+            continue
+        if name == "series_id" and isinstance(value, str):
+            value = value.strip().upper()
+        elif name == "series_ids" and isinstance(value, list):
+            value = [str(sid).strip().upper() for sid in value]
+        normalized[name] = value
+    return normalized
+
+
+def memo_key(tool_name: str, args: dict) -> str:
+    return tool_name + json.dumps(args, sort_keys=True, default=str)
+
+
+def window_of(args: dict) -> tuple[str, str, int, str]:
+    """(start, end, limit, sort_order) of an observation request, with FRED's defaults filled in."""
+    args = {**WINDOW_DEFAULTS, **args}
+    return (args.get("observation_start") or EARLIEST, args.get("observation_end") or LATEST,
+            int(args["limit"]), args["sort_order"])
+
+
+def slice_window(cached_args: dict, table: dict, args: dict) -> dict | None:
+    """Answer an observation request from a cached table covering its window, or return None.
+
+    A table holds every valid observation between its request's start and end, except
+    that a `limited` one stops at its last returned date (first, for descending order).
+    The request can be answered when its rows all fall inside that complete span.
+    """
+    if len(table["columns"]) != 1 or table["note"] or table["errors"] or not table["dates"]:
+        return None
+    low, high, _, cached_order = window_of(cached_args)
+    if table.get("limited", True):
+        if cached_order == "desc":
+            low = min(table["dates"])
+        else:
+            high = max(table["dates"])
+
+    start, end, limit, order = window_of(args)
+    rows = sorted(zip(table["dates"], table["values"][0]), reverse=order == "desc")
+    if order == "desc":
+        if end > high:
+            return None
+        rows = [row for row in rows if max(start, low) <= row[0] <= end]
+        if start < low and len(rows) < limit:
+            return None
+    else:
+        if start < low:
+            return None
+        rows = [row for row in rows if start <= row[0] <= min(end, high)]
+        if end > high and len(rows) < limit:
+            return None
+
+    rows = rows[:limit] if limit > 0 else rows
+    return {
+        "columns": table["columns"],
+        "dates": [row[0] for row in rows],
+        "values": [[row[1] for row in rows]],
+        "note": "",
+        "errors": [],
+        "limited": len(rows) == limit,
+    }
+
+
+class ToolResultMemo:
+    """Short-lived, bounded memo of tool results for one client session.
+
+    Keyed by tool name plus normalized arguments. An observation request whose date
+    window sits inside an earlier, wider result is answered by slicing that result.
+    """
+
+    def __init__(self, ttl: float = 120.0, max_entries: int = 128):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, str, dict, ToolPayload]] = OrderedDict()
+        self.hits = 0
+        self.window_hits = 0
+        self.misses = 0
+
+    def _purge(self) -> None:
+        now = time.monotonic()
+        for key in [key for key, entry in self._entries.items() if entry[0] <= now]:
+            del self._entries[key]
+
+    def get(self, tool_name: str, tool_input: dict) -> ToolPayload | None:
+        if self.ttl <= 0:
+            return None
+        self._purge()
+        args = normalize_args(tool_input)
+        key = memo_key(tool_name, args)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[3]
+
+        if tool_name in WINDOW_TOOLS:
+            identity = {name: value for name, value in args.items() if name not in WINDOW_ARGS}
+            for cached_key, (_, cached_tool, cached_args, payload) in reversed(self._entries.items()):
+                cached_identity = {name: value for name, value in cached_args.items() if name not in WINDOW_ARGS}
+                if cached_tool != tool_name or cached_identity != identity or payload[0] is None:
+                    continue
+                table = slice_window(cached_args, payload[0], args)
+                if table is not None:
+                    self._entries.move_to_end(cached_key)
+                    self.window_hits += 1
+                    return table, ""
+
+        self.misses += 1
+        return None
+
+    def put(self, tool_name: str, tool_input: dict, payload: ToolPayload) -> None:
+        if self.ttl <= 0:
+            return
+        args = normalize_args(tool_input)
+        key = memo_key(tool_name, args)
+        self._entries[key] = (time.monotonic() + self.ttl, tool_name, args, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, Any]:
+        return {"entries": len(self._entries), "hits": self.hits, "window_hits": self.window_hits,
+                "misses": self.misses}
@@ -1,31 +1,209 @@
+import json
+from typing import Annotated
+
 from mcp.server.fastmcp import FastMCP
+from mcp.types import CallToolResult, TextContent
 from services.fred_service import FREDService
+from services.metrics import REGISTRY, instrument_tool
+from services.series_data import SeriesTable, table_to_csv
+
+
+def table_result(table: SeriesTable) -> CallToolResult:
+    """Return a table as structured content, with compact CSV text for clients that ignore it."""
+    return CallToolResult(
+        content=[TextContent(type="text", text=table_to_csv(table))],
+        structuredContent=table
+    )
+
 
-def register_fred_tools(mcp: FastMCP):
-    """Register FRED-related tools."""
+def register_cache_metrics(fred_service: FREDService) -> None:
+    """Expose the service's cache and rate limiter counters on /metrics."""
+    cache = fred_service.cache
+    REGISTRY.callback("fred_cache_hits_total", "Metadata cache hits.", lambda: cache.hits, "counter")
+    REGISTRY.callback("fred_cache_misses_total", "Metadata cache misses.", lambda: cache.misses, "counter")
+    REGISTRY.callback("fred_cache_coalesced_total", "Lookups that joined an in-flight fetch.",
+                      lambda: cache.coalesced, "counter")
+    REGISTRY.callback("fred_cache_evictions_total", "Metadata cache LRU evictions.", lambda: cache.evictions, "counter")
+    REGISTRY.callback("fred_cache_entries", "Metadata cache entries.", lambda: cache.stats()["entries"])
+    REGISTRY.callback("fred_cache_hit_ratio", "Share of cache lookups served without a new fetch.",
+                      lambda: cache.stats()["hit_ratio"])
+    REGISTRY.callback("fred_rate_limiter_queued", "Requests waiting for a rate limit token.",
+                      lambda: FREDService.rate_limiter.stats()["queued"])
+
+
+def register_fred_tools(mcp: FastMCP) -> FREDService:
+    """Register FRED-related tools and return the service they share."""
     fred_service = FREDService()
+    register_cache_metrics(fred_service)
 
     @mcp.tool()
-    async def search_series(search_text: str) -> str:
+    @instrument_tool
+    async def search_series(search_text: str, limit: int = 50, offset: int = 0, order_by: str | None = None,
+                            sort_order: str | None = None, filter: str | None = None) -> str:
         """Search for FRED series by keyword.
 
         Args:
             search_text: Keyword to search for in FRED series
+            limit: Maximum number of results to return (default: 50)
+            offset: Number of results to skip, for paging (default: 0)
+            order_by: Ordering, e.g. 'search_rank', 'popularity', 'title', 'last_updated', 'observation_end' (optional)
+            sort_order: 'asc' or 'desc' (optional)
+            filter: Restrict results as 'variable:value' where variable is frequency, units or seasonal_adjustment,
+                e.g. 'frequency:Monthly' (optional)
         """
-        return await fred_service.search_series(search_text)
+        return await fred_service.search_series(search_text, limit, offset, order_by, sort_order, filter)
 
     @mcp.tool()
-    async def get_series_observations(series_id: str, limit: int = 100, sort_order: str = 'asc') -> str:
+    @instrument_tool
+    async def get_series_observations(
+        series_id: str, limit: int = 100, sort_order: str = 'asc',
+        observation_start: str | None = None, observation_end: str | None = None,
+        frequency: str | None = None, aggregation_method: str | None = None, units: str | None = None,
+        max_points: int | None = None, downsample: str = 'lttb'
+    ) -> Annotated[CallToolResult, SeriesTable]:
         """Get observations for a specific FRED series.
 
+        For long-range trends, use frequency to aggregate (e.g. 'a' for annual) or max_points
+        to get a bounded, shape-preserving sample of the whole range.
+
         Args:
             series_id: The ID of the FRED series (e.g., "GDP", "UNRATE")
-            limit: Maximum number of observations to return (default: 100)
+            limit: Maximum number of observations to return (default: 100; ignored with max_points)
             sort_order: Sort order for observations - 'asc' for oldest first, 'desc' for newest first (default: 'asc')
+            observation_start: Earliest observation date, YYYY-MM-DD (optional)
+            observation_end: Latest observation date, YYYY-MM-DD (optional)
+            frequency: Aggregate to a lower frequency: 'w', 'bw', 'm', 'q', 'sa' or 'a' (optional)
+            aggregation_method: How to aggregate with frequency: 'avg', 'sum' or 'eop' (default: 'avg')
+            units: Transformation: 'lin', 'chg', 'ch1', 'pch', 'pc1', 'pca', 'cch', 'cca' or 'log' (default: 'lin')
+            max_points: Downsample the whole date range to at most this many points (optional)
+            downsample: 'lttb' to keep the visual shape, or 'minmax' to keep each bucket's extremes (default: 'lttb')
+        """
+        return table_result(await fred_service.get_series_observations(
+            series_id, limit, sort_order, observation_start, observation_end,
+            frequency, aggregation_method, units, max_points, downsample
+        ))
+
+    @mcp.tool()
+    @instrument_tool
+    async def get_series_vintages(
+        series_id: str, as_of: str | None = None, realtime_start: str | None = None,
+        realtime_end: str | None = None, output_type: int = 1, observation_start: str | None = None,
+        observation_end: str | None = None, limit: int = 100, sort_order: str = 'asc'
+    ) -> str:
+        """Get past vintages of a FRED series (ALFRED), to see how its data looked before revisions.
+
+        Use as_of to see the values as they were published on a date, e.g. GDP as known on 2020-06-01.
+
+        Args:
+            series_id: The ID of the FRED series (e.g., "GDP", "PAYEMS")
+            as_of: Show the vintage that was current on this date, YYYY-MM-DD (optional)
+            realtime_start: Start of the real-time period for output_type 1 or 3, YYYY-MM-DD (optional)
+            realtime_end: End of the real-time period for output_type 1 or 3, YYYY-MM-DD (optional)
+            output_type: 1 for each value with the period it was published, 3 for only new and revised
+                values per vintage, 4 for initial releases only (default: 1; ignored with as_of)
+            observation_start: Earliest observation date, YYYY-MM-DD (optional)
+            observation_end: Latest observation date, YYYY-MM-DD (optional)
+            limit: Maximum number of rows to return (default: 100)
+            sort_order: 'asc' or 'desc' by observation date, or by vintage for output_type 3 (default: 'asc')
+        """
+        return await fred_service.get_series_vintages(
+            series_id, as_of, realtime_start, realtime_end, output_type,
+            observation_start, observation_end, limit, sort_order
+        )
+
+    @mcp.tool()
+    @instrument_tool
+    async def get_multiple_series_observations(
+        series_ids: list[str], limit: int = 100, sort_order: str = 'asc',
+        observation_start: str | None = None, observation_end: str | None = None
+    ) -> Annotated[CallToolResult, SeriesTable]:
+        """Get observations for several FRED series at once, aligned by date in one table.
+
+        Prefer this over repeated get_series_observations calls when comparing series.
+
+        Args:
+            series_ids: The IDs of the FRED series (e.g., ["CPIAUCSL", "PCEPI", "CPILFESL"])
+            limit: Maximum number of observations per series (default: 100)
+            sort_order: Sort order for observations - 'asc' for oldest first, 'desc' for newest first (default: 'asc')
+            observation_start: Earliest observation date, YYYY-MM-DD (optional)
+            observation_end: Latest observation date, YYYY-MM-DD (optional)
+        """
+        return table_result(await fred_service.get_multiple_series_observations(
+            series_ids, limit, sort_order, observation_start, observation_end
+        ))
+
+    @mcp.tool()
+    @instrument_tool
+    async def get_percent_change(
+        series_id: str, periods: int = 1, year_over_year: bool = False, limit: int = 12,
+        observation_start: str | None = None, observation_end: str | None = None
+    ) -> Annotated[CallToolResult, SeriesTable]:
+        """Compute percent changes for a FRED series on the server and return only the results.
+
+        Args:
+            series_id: The ID of the FRED series (e.g., "CPIAUCSL")
+            periods: Number of observations to compare across, e.g. 1 for month-over-month on monthly data (default: 1)
+            year_over_year: Compare each observation with the one a year earlier instead of using periods (default: False)
+            limit: Number of most recent results to return (default: 12)
+            observation_start: Earliest observation date, YYYY-MM-DD (optional)
+            observation_end: Latest observation date, YYYY-MM-DD (optional)
+        """
+        return table_result(await fred_service.get_percent_change(
+            series_id, periods, year_over_year, limit, observation_start, observation_end
+        ))
+
+    @mcp.tool()
+    @instrument_tool
+    async def get_rolling_mean(
+        series_id: str, window: int = 12, limit: int = 12,
+        observation_start: str | None = None, observation_end: str | None = None
+    ) -> Annotated[CallToolResult, SeriesTable]:
+        """Compute a trailing rolling mean for a FRED series on the server.
+
+        Args:
+            series_id: The ID of the FRED series (e.g., "DGS10")
+            window: Number of observations in each average (default: 12)
+            limit: Number of most recent results to return (default: 12)
+            observation_start: Earliest observation date, YYYY-MM-DD (optional)
+            observation_end: Latest observation date, YYYY-MM-DD (optional)
+        """
+        return table_result(
+            await fred_service.get_rolling_mean(series_id, window, limit, observation_start, observation_end)
+        )
+
+    @mcp.tool()
+    @instrument_tool
+    async def get_series_summary(series_id: str, observation_start: str | None = None,
+                                 observation_end: str | None = None) -> str:
+        """Get summary statistics for a FRED series: first/latest, min/max with dates, mean and max drawdown.
+
+        Args:
+            series_id: The ID of the FRED series (e.g., "UNRATE")
+            observation_start: Earliest observation date, YYYY-MM-DD (optional)
+            observation_end: Latest observation date, YYYY-MM-DD (optional)
         """
-        return await fred_service.get_series_observations(series_id, limit, sort_order)
+        return await fred_service.get_series_summary(series_id, observation_start, observation_end)
 
     @mcp.tool()
+    @instrument_tool
+    async def get_series_correlation(series_id_a: str, series_id_b: str, transform: str = 'level',
+                                     observation_start: str | None = None,
+                                     observation_end: str | None = None) -> str:
+        """Compute the correlation between two FRED series over their common dates.
+
+        Args:
+            series_id_a: The ID of the first FRED series
+            series_id_b: The ID of the second FRED series
+            transform: 'level', 'pct_change' or 'yoy', applied to both series before correlating (default: 'level')
+            observation_start: Earliest observation date, YYYY-MM-DD (optional)
+            observation_end: Latest observation date, YYYY-MM-DD (optional)
+        """
+        return await fred_service.get_series_correlation(
+            series_id_a, series_id_b, transform, observation_start, observation_end
+        )
+
+    @mcp.tool()
+    @instrument_tool
     async def get_series_info(series_id: str) -> str:
         """Get information about a specific FRED series.
 
@@ -35,6 +213,7 @@ def register_fred_tools(mcp: FastMCP):
         return await fred_service.get_series_info(series_id)
 
     @mcp.tool()
+    @instrument_tool
     async def get_categories() -> str:
         """Get a list of FRED categories.
 
@@ -43,25 +222,76 @@ def register_fred_tools(mcp: FastMCP):
         return await fred_service.get_categories()
 
     @mcp.tool()
-    async def get_releases() -> str:
+    @instrument_tool
+    async def browse_categories(category_id: int = 0, depth: int = 2) -> str:
+        """Show the FRED category tree below a category, several levels at once.
+
+        Args:
+            category_id: Category to start from (default: 0, the root)
+            depth: Levels of subcategories to include, 1-4 (default: 2)
+        """
+        return await fred_service.browse_categories(category_id, depth)
+
+    @mcp.tool()
+    @instrument_tool
+    async def get_category_series(category_id: int, limit: int = 50, offset: int = 0) -> str:
+        """List the series in a FRED category, most popular first.
+
+        Args:
+            category_id: The category ID, e.g. from browse_categories
+            limit: Maximum number of series to return (default: 50)
+            offset: Number of series to skip, for paging (default: 0)
+        """
+        return await fred_service.get_category_series(category_id, limit, offset)
+
+    @mcp.tool()
+    @instrument_tool
+    async def get_releases(limit: int = 50, offset: int = 0, order_by: str | None = None,
+                           sort_order: str | None = None, filter: str | None = None) -> str:
         """Get a list of FRED releases.
 
-        Args: None
+        Args:
+            limit: Maximum number of releases to return (default: 50)
+            offset: Number of releases to skip, for paging (default: 0)
+            order_by: Ordering, e.g. 'release_id', 'name', 'realtime_start' (optional)
+            sort_order: 'asc' or 'desc' (optional)
+            filter: Only return releases whose name contains this text (optional)
         """
-        return await fred_service.get_releases()
+        return await fred_service.get_releases(limit, offset, order_by, sort_order, filter)
 
     @mcp.tool()
-    async def get_sources() -> str:
+    @instrument_tool
+    async def get_sources(limit: int = 50, offset: int = 0, order_by: str | None = None,
+                          sort_order: str | None = None, filter: str | None = None) -> str:
         """Get a list of FRED sources.
 
-        Args: None
+        Args:
+            limit: Maximum number of sources to return (default: 50)
+            offset: Number of sources to skip, for paging (default: 0)
+            order_by: Ordering, e.g. 'source_id', 'name', 'realtime_start' (optional)
+            sort_order: 'asc' or 'desc' (optional)
+            filter: Only return sources whose name contains this text (optional)
         """
-        return await fred_service.get_sources()
+        return await fred_service.get_sources(limit, offset, order_by, sort_order, filter)
 
     @mcp.tool()
-    async def get_tags() -> str:
+    @instrument_tool
+    async def get_tags(limit: int = 50, offset: int = 0, order_by: str | None = None,
+                       sort_order: str | None = None, filter: str | None = None) -> str:
         """Get a list of FRED tags.
 
-        Args: None
+        Args:
+            limit: Maximum number of tags to return (default: 50)
+            offset: Number of tags to skip, for paging (default: 0)
+            order_by: Ordering, e.g. 'series_count', 'popularity', 'name', 'group_id' (optional)
+            sort_order: 'asc' or 'desc' (optional)
+            filter: Only return tags matching these words (optional)
         """
-        return await fred_service.get_tags()
\ No newline at end of file
+        return await fred_service.get_tags(limit, offset, order_by, sort_order, filter)
+
+    @mcp.resource("fred://cache/stats", mime_type="application/json")
+    def cache_stats() -> str:
+        """Hit/miss counters for the in-process FRED metadata cache."""
+        return json.dumps(fred_service.cache.stats())
+
+    return fred_service